@@ -0,0 +1,130 @@
+"""
+Endpoints de Análises
+"""
+from typing import Dict, Any, List, Optional
+from uuid import UUID
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, status
+import logging
+
+from schemas.requests.requests import BulkAnalysisRequest, CursorPaginationRequest
+from schemas.responses.responses import AnalysisResponse, CursorPaginatedResponse, DetailedAnalysisResponse
+from services.analysis_service import AnalysisService
+from core.dependencies import get_current_user, get_analysis_service
+from core.responses import render_model, etag_matches, not_modified, with_etag
+from utils.pagination import InvalidCursorError
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/analyses", tags=["Análises"])
+
+
+@router.get("", response_model=CursorPaginatedResponse[AnalysisResponse])
+async def list_analyses(
+    request: CursorPaginationRequest = Depends(),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """Listar análises do usuário autenticado (paginação por cursor)"""
+    try:
+        return render_model(await analysis_service.get_user_analyses_page(current_user["user_id"], request))
+        
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error in list_analyses: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.post("/bulk", response_model=List[AnalysisResponse], status_code=status.HTTP_202_ACCEPTED)
+async def create_bulk_analyses(
+    request: BulkAnalysisRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """Criar análises de vários currículos para a mesma vaga (ficam pendentes na fila)"""
+    try:
+        analyses = await analysis_service.create_bulk_analyses(current_user["user_id"], request)
+        return render_model(analyses, status_code=status.HTTP_202_ACCEPTED, response_type=List[AnalysisResponse])
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error in create_bulk_analyses: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/statistics")
+async def get_analysis_statistics(
+    include_analytics: bool = Query(False, description="Incluir percentis, distribuição e tendência"),
+    since: Optional[datetime] = Query(None),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """Obter estatísticas de análises do usuário autenticado"""
+    try:
+        return await analysis_service.get_analysis_statistics(
+            current_user["user_id"], include_analytics=include_analytics, since=since
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in get_analysis_statistics: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/{analysis_id}", response_model=DetailedAnalysisResponse)
+async def get_analysis(
+    analysis_id: UUID,
+    full_report: bool = Query(False, description="Incluir as análises completas do currículo e da vaga"),
+    if_none_match: Optional[str] = Header(None),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """Obter análise detalhada (suporta If-None-Match)"""
+    try:
+        
+        found = await analysis_service.get_analysis_etag(analysis_id, current_user["user_id"], full_report)
+        if not found:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Analysis not found"
+            )
+        etag, analysis_data = found
+        
+        # Versão em cache do cliente ainda válida: nenhum acesso ao MongoDB
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        
+        analysis = await analysis_service.get_analysis(
+            analysis_id, current_user["user_id"], analysis_data=analysis_data, full_report=full_report
+        )
+        if not analysis:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Analysis not found"
+            )
+        
+        return with_etag(analysis, etag)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in get_analysis: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
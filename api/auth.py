@@ -6,10 +6,12 @@ from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import logging
 
-from schemas.requests.requests import UserRegisterRequest, UserLoginRequest, PasswordChangeRequest
+from schemas.requests.requests import (
+    UserRegisterRequest, UserLoginRequest, PasswordChangeRequest, BulkUserSkillsUpdateRequest
+)
 from schemas.responses.responses import BaseResponse, TokenResponse, UserProfileResponse, ErrorResponse
 from services.user_service import UserService
-from core.dependencies import get_current_user
+from core.dependencies import get_current_user, get_user_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -17,10 +19,12 @@ security = HTTPBearer()
 
 
 @router.post("/register", response_model=UserProfileResponse)
-async def register_user(request: UserRegisterRequest):
+async def register_user(
+    request: UserRegisterRequest,
+    user_service: UserService = Depends(get_user_service)
+):
     """Registrar novo usuário"""
     try:
-        user_service = UserService()
         user_profile = await user_service.register_user(request)
         return user_profile
         
@@ -38,10 +42,12 @@ async def register_user(request: UserRegisterRequest):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login_user(request: UserLoginRequest):
+async def login_user(
+    request: UserLoginRequest,
+    user_service: UserService = Depends(get_user_service)
+):
     """Autenticar usuário"""
     try:
-        user_service = UserService()
         token_response = await user_service.authenticate_user(request)
         return token_response
         
@@ -60,10 +66,12 @@ async def login_user(request: UserLoginRequest):
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def refresh_token(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_service: UserService = Depends(get_user_service)
+):
     """Renovar token de acesso"""
     try:
-        user_service = UserService()
         token_response = await user_service.refresh_token(credentials.credentials)
         
         if not token_response:
@@ -86,10 +94,12 @@ async def refresh_token(credentials: HTTPAuthorizationCredentials = Depends(secu
 
 
 @router.get("/profile", response_model=UserProfileResponse)
-async def get_user_profile(current_user: Dict[str, Any] = Depends(get_current_user)):
+async def get_user_profile(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+):
     """Obter perfil do usuário autenticado"""
     try:
-        user_service = UserService()
         user_profile = await user_service.get_user_profile(current_user["user_id"])
         
         if not user_profile:
@@ -110,14 +120,37 @@ async def get_user_profile(current_user: Dict[str, Any] = Depends(get_current_us
         )
 
 
+@router.put("/profile/skills", response_model=BaseResponse)
+async def update_user_skills(
+    request: BulkUserSkillsUpdateRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Inserir ou atualizar habilidades do usuário autenticado em lote"""
+    try:
+        affected = await user_service.update_user_skills(current_user["user_id"], request)
+        
+        return BaseResponse(
+            success=True,
+            message=f"{affected} skills updated"
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in update_user_skills: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
 @router.post("/change-password", response_model=BaseResponse)
 async def change_password(
     request: PasswordChangeRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service)
 ):
     """Alterar senha do usuário"""
     try:
-        user_service = UserService()
         success = await user_service.change_password(
             current_user["user_id"],
             request.current_password,
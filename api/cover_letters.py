@@ -0,0 +1,55 @@
+"""
+Endpoints de Cartas de Apresentação
+"""
+from typing import Dict, Any, Optional
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, Depends, Header, status
+import logging
+
+from schemas.responses.responses import CoverLetterContentResponse
+from services.cover_letter_service import CoverLetterService
+from core.dependencies import get_current_user, get_cover_letter_service
+from core.responses import etag_matches, not_modified, with_etag
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/cover-letters", tags=["Cartas de Apresentação"])
+
+
+@router.get("/{cover_letter_id}/content", response_model=CoverLetterContentResponse)
+async def get_cover_letter_content(
+    cover_letter_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    cover_letter_service: CoverLetterService = Depends(get_cover_letter_service)
+):
+    """Obter conteúdo da carta de apresentação (suporta If-None-Match)"""
+    try:
+        
+        etag = await cover_letter_service.get_cover_letter_etag(cover_letter_id, current_user["user_id"])
+        if not etag:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cover letter not found"
+            )
+        
+        # Só a projeção {userId, updatedAt} foi lida; o documento completo não é carregado
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        
+        content = await cover_letter_service.get_cover_letter_content(cover_letter_id, current_user["user_id"])
+        if not content:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Cover letter not found"
+            )
+        
+        return with_etag(content, etag)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in get_cover_letter_content: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
@@ -0,0 +1,83 @@
+"""
+Endpoints do Dashboard
+"""
+from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, status
+import logging
+
+from schemas.requests.requests import DashboardStatsRequest, CursorPaginationRequest, BulkNotificationUpdateRequest
+from schemas.responses.responses import (
+    BaseResponse, DashboardResponse, CursorPaginatedResponse, RecentActivityResponse
+)
+from services.dashboard_service import DashboardService
+from core.dependencies import get_current_user, get_dashboard_service
+from core.responses import render_model
+from utils.pagination import InvalidCursorError
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    request: DashboardStatsRequest = Depends(),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Obter dashboard do usuário autenticado"""
+    try:
+        return render_model(await dashboard_service.get_dashboard(current_user["user_id"], request))
+        
+    except Exception as e:
+        logger.error(f"Error in get_dashboard: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+
+@router.get("/activities", response_model=CursorPaginatedResponse[RecentActivityResponse])
+async def get_activities(
+    request: CursorPaginationRequest = Depends(),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Listar atividades do usuário autenticado (paginação por cursor)"""
+    try:
+        return render_model(await dashboard_service.get_activities_page(current_user["user_id"], request))
+        
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error in get_activities: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.patch("/notifications", response_model=BaseResponse)
+async def update_notifications(
+    request: BulkNotificationUpdateRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Marcar notificações do usuário autenticado como lidas/não lidas"""
+    try:
+        updated = await dashboard_service.update_notifications(current_user["user_id"], request)
+        
+        return BaseResponse(
+            success=True,
+            message=f"{updated} notifications updated"
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in update_notifications: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
@@ -0,0 +1,125 @@
+"""
+Endpoints de Exportação de Dados
+"""
+from typing import Dict, Any
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, Depends, Response, status
+from fastapi.responses import StreamingResponse, FileResponse
+import logging
+
+from schemas.requests.requests import DataExportRequest
+from schemas.responses.responses import ExportResponse
+from services.export_service import ExportService
+from services.export_job_service import export_jobs, JOB_COMPLETED
+from core.dependencies import get_current_user, get_export_service
+from core.responses import render_model
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.post("")
+async def export_data(
+    request: DataExportRequest,
+    response: Response,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    export_service: ExportService = Depends(get_export_service)
+):
+    """Exportar dados do usuário autenticado (NDJSON/CSV, opcionalmente gzip) por streaming.
+    
+    Exportações grandes (include_files ou export_type="all") viram job em segundo plano (202).
+    """
+    try:
+        if export_jobs.requires_job(request):
+            job = await export_jobs.submit(current_user["user_id"], request)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return render_model(export_jobs.to_response(job), status_code=status.HTTP_202_ACCEPTED)
+        
+        # Validar antes de iniciar o stream: depois dos cabeçalhos não há como responder 400
+        export_service.validate_request(request)
+        
+        return StreamingResponse(
+            export_service.stream_export(current_user["user_id"], request),
+            media_type=export_service.get_media_type(request),
+            headers={
+                "Content-Disposition": f'attachment; filename="{export_service.get_filename(request)}"'
+            }
+        )
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error in export_data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.post("/jobs", response_model=ExportResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    request: DataExportRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Criar job de exportação (ZIP gerado em segundo plano)"""
+    try:
+        job = await export_jobs.submit(current_user["user_id"], request)
+        return render_model(export_jobs.to_response(job), status_code=status.HTTP_202_ACCEPTED)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error in create_export_job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/jobs/{export_id}", response_model=ExportResponse)
+async def get_export_job(
+    export_id: UUID,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Consultar status e progresso do job de exportação"""
+    job = await export_jobs.get_job(export_id, current_user["user_id"])
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export not found"
+        )
+    
+    return render_model(export_jobs.to_response(job))
+
+
+@router.get("/jobs/{export_id}/download")
+async def download_export(
+    export_id: UUID,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """Baixar o ZIP da exportação (suporta Range para retomar downloads interrompidos)"""
+    job = await export_jobs.get_job(export_id, current_user["user_id"])
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export not found"
+        )
+    
+    if job.status != JOB_COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export is {job.status}"
+        )
+    
+    # FileResponse responde 206/416 a cabeçalhos Range e envia ETag/Last-Modified para If-Range
+    return FileResponse(
+        export_jobs.artifact_path(export_id),
+        media_type="application/zip",
+        filename=export_jobs.download_filename(job)
+    )
@@ -0,0 +1,112 @@
+"""
+Benchmark do controle de carga da IA (limite fixo vs AIMD, circuit breaker em queda da API)
+
+Usa o servidor mock de ai_transport_benchmark com capacidade limitada (--capacity): acima dela a
+latência cresce e, acima do dobro, as requisições recebem 429. Dispara --requests chamadas com
+--concurrency simultâneas (como o worker de análises sob backlog) em dois modos:
+- fixed: limite fixo igual à concorrência (comportamento anterior)
+- adaptive: AdaptiveConcurrencyLimiter partindo do limite padrão
+
+Em seguida simula uma queda (503 em todas as chamadas) e mede quantas chegam à API com o
+circuit breaker e quanto tempo os chamadores esperam pelo fallback.
+
+Uso: python -m benchmarks.ai_limiter_benchmark [--requests 400] [--concurrency 64] [--capacity 8]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.ai_transport_benchmark import MESSAGES, MockOpenAI, start_mock_server
+from services.ai_limiter import AIUnavailableError, AdaptiveConcurrencyLimiter, CircuitBreaker
+from services.ai_transport import AITransport
+
+
+async def drive(transport: AITransport, requests: int, concurrency: int) -> dict:
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    outcomes = {"ok": 0, "error": 0, "unavailable": 0}
+
+    async def call():
+        async with gate:
+            started = time.perf_counter()
+            try:
+                await transport.chat(MESSAGES, "mock", 100, 0.7, 1.0)
+                outcomes["ok"] += 1
+            except AIUnavailableError:
+                outcomes["unavailable"] += 1
+            except Exception:
+                outcomes["error"] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(requests)))
+    return {
+        **outcomes,
+        "elapsed": time.perf_counter() - started,
+        "p50": statistics.median(latencies),
+        "p95": statistics.quantiles(latencies, n=20)[-1]
+    }
+
+
+def new_transport(base_url: str, limiter: AdaptiveConcurrencyLimiter,
+                  breaker: CircuitBreaker = None) -> AITransport:
+    return AITransport(base_url=base_url, api_key="mock", max_retries=0, max_connections=256,
+                       max_keepalive_connections=256, limiter=limiter,
+                       breaker=breaker or CircuitBreaker(failure_threshold=10 ** 9))
+
+
+def run(requests: int, concurrency: int, capacity: int, latency_ms: float) -> None:
+    app = MockOpenAI(latency_ms, capacity=capacity)
+    server, base_url = start_mock_server(app)
+
+    print(f"{requests} calls, concurrency {concurrency}, server capacity {capacity}, "
+          f"base latency {latency_ms:.0f} ms\n")
+    print(f"{'mode':<10} {'ok':>5} {'429/5xx':>8} {'total s':>8} {'p50 ms':>8} {'p95 ms':>8} {'limit':>6}")
+    modes = (
+        ("fixed", AdaptiveConcurrencyLimiter(concurrency, min_limit=concurrency, max_limit=concurrency)),
+        ("adaptive", AdaptiveConcurrencyLimiter(max_limit=concurrency))
+    )
+    for mode, limiter in modes:
+        app.statuses.clear()
+        transport = new_transport(base_url, limiter)
+
+        async def scenario():
+            try:
+                return await drive(transport, requests, concurrency)
+            finally:
+                await transport.close()
+
+        result = asyncio.run(scenario())
+        print(f"{mode:<10} {result['ok']:>5} {result['error']:>8} {result['elapsed']:>8.2f} "
+              f"{result['p50']:>8.1f} {result['p95']:>8.1f} {limiter.limit:>6.1f}")
+
+    print(f"\noutage (503 on every call), {requests} calls")
+    print(f"{'mode':<10} {'reached API':>12} {'fallbacks':>10} {'p50 ms':>8}")
+    app.outage = True
+    for mode, threshold in (("no breaker", 10 ** 9), ("breaker", 5)):
+        app.statuses.clear()
+        transport = new_transport(base_url, AdaptiveConcurrencyLimiter(max_limit=concurrency),
+                                  CircuitBreaker(failure_threshold=threshold, reset_seconds=30))
+
+        async def scenario():
+            try:
+                return await drive(transport, requests, concurrency)
+            finally:
+                await transport.close()
+
+        result = asyncio.run(scenario())
+        print(f"{mode:<10} {sum(app.statuses.values()):>12} "
+              f"{result['error'] + result['unavailable']:>10} {result['p50']:>8.1f}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--capacity", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.capacity, args.latency_ms)
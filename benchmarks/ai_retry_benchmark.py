@@ -0,0 +1,113 @@
+"""
+Benchmark de retry e hedge das chamadas à IA
+
+Usa o servidor mock de ai_transport_benchmark em dois cenários:
+- cauda longa: --tail-probability das respostas são 10x mais lentas; compara a latência
+  (p50/p95/p99) sem hedge e com hedge no p95 observado, e os tokens extras gastos nos hedges
+- falhas transitórias: --error-probability das requisições recebem 429 com Retry-After;
+  compara a taxa de sucesso com uma tentativa e com a política padrão (backoff com jitter)
+
+Uso: python -m benchmarks.ai_retry_benchmark [--requests 600] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from benchmarks.ai_transport_benchmark import MESSAGES, MockOpenAI, start_mock_server
+from core.config import ai_settings
+from services.ai_limiter import AdaptiveConcurrencyLimiter, CircuitBreaker
+from services.ai_retry import AIRequestExecutor
+from services.ai_transport import AITransport
+
+
+def new_executor(base_url: str, concurrency: int, hedge_budget: float) -> AIRequestExecutor:
+    transport = AITransport(
+        base_url=base_url, api_key="mock", max_retries=0,
+        limiter=AdaptiveConcurrencyLimiter(2 * concurrency, max_limit=2 * concurrency),
+        breaker=CircuitBreaker(failure_threshold=10 ** 9)
+    )
+    return AIRequestExecutor(transport, hedge_token_budget=hedge_budget)
+
+
+async def drive(executor: AIRequestExecutor, operation: str, requests: int, concurrency: int) -> dict:
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    def call(timeout):
+        return executor.transport.chat(MESSAGES, "mock", 100, 0.7, 1.0, timeout=timeout)
+
+    async def run_one():
+        nonlocal failures
+        async with gate:
+            started = time.perf_counter()
+            try:
+                await executor.execute(operation, call)
+                latencies.append((time.perf_counter() - started) * 1000)
+            except Exception:
+                failures += 1
+
+    try:
+        await asyncio.gather(*(run_one() for _ in range(requests)))
+    finally:
+        await executor.transport.close()
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        "ok": len(latencies),
+        "failures": failures,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": quantiles[94],
+        "p99": quantiles[98]
+    }
+
+
+def run(requests: int, concurrency: int, latency_ms: float, tail_probability: float,
+        error_probability: float, hedge_budget: float) -> None:
+    logging.getLogger("services").setLevel(logging.ERROR)  # um aviso por retry
+    app = MockOpenAI(latency_ms, tail_probability=tail_probability)
+    server, base_url = start_mock_server(app)
+
+    ai_settings.RETRY_POLICIES = {
+        **ai_settings.RETRY_POLICIES,
+        "bench_plain": {"hedge": False},
+        "bench_hedged": {"hedge": True},
+        "bench_single": {"max_attempts": 1}
+    }
+
+    print(f"long tail: {requests} calls, concurrency {concurrency}, {latency_ms:.0f} ms base, "
+          f"{tail_probability:.0%} at 10x, hedge budget {hedge_budget:.0%} of tokens\n")
+    print(f"{'mode':<10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'hedges':>7} {'wins':>5} {'extra tokens':>13}")
+    for mode, operation in (("no hedge", "bench_plain"), ("hedge", "bench_hedged")):
+        executor = new_executor(base_url, concurrency, hedge_budget)
+        result = asyncio.run(drive(executor, operation, requests, concurrency))
+        stats = executor.stats()
+        extra = stats["hedge_tokens"] / stats["tokens"] if stats["tokens"] else 0.0
+        print(f"{mode:<10} {result['p50']:>8.1f} {result['p95']:>8.1f} {result['p99']:>8.1f} "
+              f"{stats['hedges']:>7} {stats['hedge_wins']:>5} {extra:>12.1%}")
+
+    app.tail_probability = 0.0
+    app.error_probability = error_probability
+    print(f"\ntransient 429s: {error_probability:.0%} of requests, Retry-After 50 ms\n")
+    print(f"{'mode':<10} {'ok':>6} {'failed':>7} {'p50 ms':>8} {'p99 ms':>8} {'retries':>8}")
+    for mode, operation in (("single", "bench_single"), ("retry", "bench_plain")):
+        executor = new_executor(base_url, concurrency, hedge_budget)
+        result = asyncio.run(drive(executor, operation, requests, concurrency))
+        print(f"{mode:<10} {result['ok']:>6} {result['failures']:>7} {result['p50']:>8.1f} "
+              f"{result['p99']:>8.1f} {executor.stats()['retries']:>8}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--tail-probability", type=float, default=0.05)
+    parser.add_argument("--error-probability", type=float, default=0.1)
+    parser.add_argument("--hedge-budget", type=float, default=0.1)
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.latency_ms, args.tail_probability,
+        args.error_probability, args.hedge_budget)
@@ -0,0 +1,114 @@
+"""
+Benchmark do roteamento de modelos da IA (modelo único vs extração no modelo menor)
+
+Executa analyze_job_description e extract_skills_from_text contra o servidor mock de
+ai_transport_benchmark, onde o modelo principal responde em --large-ms e o de extração em
+--small-ms, e --invalid-rate das respostas do modelo menor vêm fora do schema (escaladas para o
+principal). Reporta, por modo, latência p50/p95 por operação, custo total (preços de
+AISettings.MODEL_PRICES) e escalonamentos, a partir dos contadores do ModelRouter.
+
+Uso: python -m benchmarks.ai_routing_benchmark [--requests 200] [--concurrency 8] [--invalid-rate 0.05]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import time
+
+from benchmarks.ai_transport_benchmark import MockOpenAI, start_mock_server
+from core.config import settings, ai_settings
+from services.ai_limiter import AdaptiveConcurrencyLimiter, CircuitBreaker
+from services.ai_routing import ModelRouter
+from services.ai_service import AIService
+from services.ai_transport import AITransport
+
+JOB_TEXT = "Vaga para desenvolvedor backend Python com Django, PostgreSQL, Docker e AWS. " * 20
+
+JOB_RESPONSE = {
+    "keyRequirements": ["Python", "Django", "PostgreSQL"],
+    "requiredSkills": ["APIs REST", "Docker", "AWS"],
+    "experienceLevel": "Senior",
+    "education": "Superior Completo",
+    "benefits": ["Plano de Saúde"],
+    "companyInfo": {"name": "Empresa", "industry": "Tecnologia", "size": "Médio Porte"}
+}
+SKILLS_RESPONSE = {
+    "skills": [{"name": name, "category": "Technical", "confidence": 0.9}
+               for name in ("Python", "Django", "PostgreSQL", "Docker", "AWS")]
+}
+
+
+def responder(invalid_rate: float):
+    def respond(request: dict) -> str:
+        prompt = request["messages"][-1]["content"]
+        payload = SKILLS_RESPONSE if "habilidades técnicas e profissionais" in prompt else JOB_RESPONSE
+        if request["model"] == settings.OPENAI_EXTRACTION_MODEL and random.random() < invalid_rate:
+            # Erro típico de modelo menor: chave renomeada
+            payload = {"skill_list" if key == "skills" else key + "s": value for key, value in payload.items()}
+        return json.dumps(payload, ensure_ascii=False)
+    return respond
+
+
+async def drive(service: AIService, requests: int, concurrency: int) -> dict:
+    gate = asyncio.Semaphore(concurrency)
+    latencies = {"job": [], "skills": []}
+
+    async def run_one(operation: str):
+        async with gate:
+            started = time.perf_counter()
+            if operation == "job":
+                await service.analyze_job_description(JOB_TEXT)
+            else:
+                await service.extract_skills_from_text(JOB_TEXT)
+            latencies[operation].append((time.perf_counter() - started) * 1000)
+
+    try:
+        await asyncio.gather(*(run_one(operation) for _ in range(requests) for operation in latencies))
+    finally:
+        await service.transport.close()
+    return latencies
+
+
+def run(requests: int, concurrency: int, large_ms: float, small_ms: float, invalid_rate: float) -> None:
+    logging.getLogger("services").setLevel(logging.ERROR)  # um aviso por escalonamento
+    app = MockOpenAI(large_ms, model_latency_ms={settings.OPENAI_EXTRACTION_MODEL: small_ms},
+                     responder=responder(invalid_rate))
+    server, base_url = start_mock_server(app)
+    routes = ai_settings.MODEL_ROUTES
+
+    print(f"{requests} calls per operation, concurrency {concurrency}, {settings.OPENAI_MODEL} "
+          f"{large_ms:.0f} ms, {settings.OPENAI_EXTRACTION_MODEL} {small_ms:.0f} ms, "
+          f"{invalid_rate:.0%} invalid extraction output\n")
+    print(f"{'mode':<8} {'operation':<10} {'p50 ms':>8} {'p95 ms':>8} {'cost USD':>10} {'escalations':>12}")
+    for mode, mode_routes in (("single", {}), ("routed", routes)):
+        ai_settings.MODEL_ROUTES = mode_routes
+        transport = AITransport(base_url=base_url, api_key="mock", max_retries=0,
+                                limiter=AdaptiveConcurrencyLimiter(concurrency, max_limit=concurrency),
+                                breaker=CircuitBreaker(failure_threshold=10 ** 9))
+        service = AIService(transport)
+        service.router = ModelRouter(service.model)
+        latencies = asyncio.run(drive(service, requests, concurrency))
+        usage = service.router.stats()
+        for operation, samples in latencies.items():
+            models = usage.get(operation, {})
+            cost = sum(counters["cost_usd"] for counters in models.values())
+            escalations = sum(counters["escalations"] for counters in models.values())
+            p95 = statistics.quantiles(samples, n=20)[-1]
+            print(f"{mode:<8} {operation:<10} {statistics.median(samples):>8.1f} {p95:>8.1f} "
+                  f"{cost:>10.4f} {escalations:>12}")
+    ai_settings.MODEL_ROUTES = routes
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--large-ms", type=float, default=120)
+    parser.add_argument("--small-ms", type=float, default=40)
+    parser.add_argument("--invalid-rate", type=float, default=0.05)
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.large_ms, args.small_ms, args.invalid_rate)
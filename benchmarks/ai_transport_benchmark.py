@@ -0,0 +1,176 @@
+"""
+Benchmark do transporte da IA (cliente compartilhado com pool vs cliente por chamada)
+
+Sobe um servidor local compatível com /v1/chat/completions (latência simulada por --latency-ms)
+e dispara --requests chamadas com --concurrency simultâneas em dois modos:
+- per-call: um cliente (e um pool de conexões) novo por chamada, como o SDK legado fazia
+- shared: AITransport único, conexões reaproveitadas via keep-alive
+
+Reporta tempo total, latência p50/p95 por chamada e conexões TCP abertas no servidor. O mock
+usa HTTP sem TLS, então o ganho real (com handshake TLS por conexão) é maior que o medido.
+
+Uso: python -m benchmarks.ai_transport_benchmark [--requests 500] [--concurrency 32] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import threading
+import time
+
+import uvicorn
+
+from services.ai_limiter import AdaptiveConcurrencyLimiter
+from services.ai_transport import AITransport
+
+MESSAGES = [
+    {"role": "system", "content": "Sempre retorne respostas em JSON válido."},
+    {"role": "user", "content": "Analise o currículo."}
+]
+
+
+class MockOpenAI:
+    """App ASGI mínimo que responde como a API de chat e conta as conexões recebidas.
+    Com `capacity`, a latência cresce com as requisições simultâneas acima da capacidade e o
+    excesso além do dobro recebe 429; com `outage`, todas recebem 503. `tail_probability` torna
+    uma fração das respostas `tail_factor` vezes mais lenta e `error_probability` responde 429
+    com Retry-After a uma fração das requisições. `model_latency_ms` define a latência por modelo e
+    `responder(request) -> content` gera o texto da resposta a partir do corpo da requisição"""
+
+    def __init__(self, latency_ms: float, capacity: int = 0, tail_probability: float = 0.0,
+                 tail_factor: float = 10.0, error_probability: float = 0.0,
+                 model_latency_ms: dict = None, responder=None):
+        self.latency = latency_ms / 1000
+        self.model_latency_ms = model_latency_ms or {}
+        self.responder = responder
+        self.capacity = capacity
+        self.tail_probability = tail_probability
+        self.tail_factor = tail_factor
+        self.error_probability = error_probability
+        self.outage = False
+        self.in_flight = 0
+        self.connections = set()
+        self.statuses = {}
+
+    async def _respond_error(self, send, status: int, headers: list = ()) -> None:
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json"), *headers]})
+        await send({"type": "http.response.body",
+                    "body": b'{"error": {"message": "mock overload", "type": "server_error"}}'})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        self.connections.add(tuple(scope["client"]))
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        request = json.loads(b"".join(chunks) or b"{}")
+        if self.outage:
+            return await self._respond_error(send, 503)
+        if self.capacity and self.in_flight >= 2 * self.capacity:
+            return await self._respond_error(send, 429)
+        if random.random() < self.error_probability:
+            return await self._respond_error(send, 429, [(b"retry-after-ms", b"50")])
+
+        self.in_flight += 1
+        try:
+            load = max(1.0, self.in_flight / self.capacity) if self.capacity else 1.0
+            if random.random() < self.tail_probability:
+                load *= self.tail_factor
+            latency = self.model_latency_ms.get(request.get("model"), self.latency * 1000) / 1000
+            await asyncio.sleep(latency * load)
+        finally:
+            self.in_flight -= 1
+        self.statuses[200] = self.statuses.get(200, 0) + 1
+        content = self.responder(request) if self.responder else "{\"ok\": true}"
+        # ~4 caracteres por token
+        prompt_tokens = max(sum(len(m.get("content", "")) for m in request.get("messages", [])) // 4, 1)
+        completion_tokens = max(len(content) // 4, 1)
+        body = json.dumps({
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "mock",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens}
+        }).encode()
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def start_mock_server(app: MockOpenAI) -> tuple:
+    """Servidor uvicorn numa thread; retorna (servidor, base_url)"""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", timeout_keep_alive=30))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}/v1"
+
+
+async def run_mode(base_url: str, shared: bool, requests: int, concurrency: int) -> tuple:
+    """(segundos totais, latências em ms)"""
+    transport = AITransport(base_url=base_url, api_key="mock", max_retries=0,
+                            max_connections=concurrency, max_keepalive_connections=concurrency,
+                            limiter=AdaptiveConcurrencyLimiter(concurrency, max_limit=concurrency))
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def call():
+        async with gate:
+            started = time.perf_counter()
+            if shared:
+                await transport.chat(MESSAGES, "mock", 100, 0.7, 1.0)
+            else:
+                client = AITransport(base_url=base_url, api_key="mock", max_retries=0)
+                try:
+                    await client.chat(MESSAGES, "mock", 100, 0.7, 1.0)
+                finally:
+                    await client.close()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    await transport.close()
+    return elapsed, latencies
+
+
+def run(requests: int, concurrency: int, latency_ms: float) -> None:
+    app = MockOpenAI(latency_ms)
+    server, base_url = start_mock_server(app)
+
+    print(f"{requests} calls, concurrency {concurrency}, server latency {latency_ms:.0f} ms\n")
+    print(f"{'mode':<10} {'total s':>8} {'p50 ms':>8} {'p95 ms':>8} {'connections':>12}")
+    for mode, shared in (("per-call", False), ("shared", True)):
+        app.connections.clear()
+        elapsed, latencies = asyncio.run(run_mode(base_url, shared, requests, concurrency))
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(f"{mode:<10} {elapsed:>8.2f} {statistics.median(latencies):>8.1f} "
+              f"{p95:>8.1f} {len(app.connections):>12}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.latency_ms)
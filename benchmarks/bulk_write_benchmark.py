@@ -0,0 +1,192 @@
+"""
+Benchmark de escritas em lote nos repositórios SQL
+
+Usa SQLite (arquivo temporário) e compara, para 10/100/1000 itens:
+- analyses: create_analysis item a item (uma sessão por INSERT) vs create_analyses (executemany)
+- notifications: UPDATE por NotificationId vs mark_notifications (UPDATE ... IN, um comando)
+- skills: o MERGE de UserSkillRepository.upsert_user_skills não roda no SQLite, então o caso
+  monta e compila (dialeto mssql+pyodbc) os comandos reais, um por item vs em lote, e verifica
+  que cada bloco fica dentro de MAX_STATEMENT_PARAMS parâmetros posicionais
+
+No SQL Server com pyodbc o executemany usa fast_executemany (um round-trip por lote), então o
+ganho real é maior que o medido aqui, onde não há rede.
+
+Uso: python -m benchmarks.bulk_write_benchmark [--sizes 10 100 1000] [--repeat 5]
+"""
+from datetime import datetime
+from uuid import uuid4
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.dialects.mssql.pyodbc import dialect as mssql_pyodbc_dialect
+from sqlalchemy.orm import sessionmaker
+
+from data.sql_repository import (
+    AnalysisRepository, NotificationRepository, UserSkillRepository, MAX_STATEMENT_PARAMS
+)
+from domain.entities.domain import CompatibilityAnalysis, AnalysisStatus, UserSkill
+
+SCHEMA = (
+    """
+    CREATE TABLE CompatibilityAnalyses (
+        AnalysisId TEXT PRIMARY KEY, UserId TEXT, ResumeId TEXT, JobId TEXT, MatchScore REAL,
+        Status TEXT, AnalysisType TEXT, MongoAnalysisId TEXT
+    )
+    """,
+    """
+    CREATE TABLE Notifications (
+        NotificationId TEXT PRIMARY KEY, UserId TEXT, IsRead INTEGER, ReadAt TIMESTAMP
+    )
+    """
+)
+
+# Dialeto do SQL Server com pyodbc: parâmetros posicionais (?), um por ocorrência
+MSSQL_DIALECT = mssql_pyodbc_dialect(paramstyle="qmark")
+
+
+def build_repository(cls, engine):
+    """Repositório sobre o engine dado, sem passar pelo __init__ (que conecta ao SQL Server)"""
+    repository = object.__new__(cls)
+    repository.engine = engine
+    repository.SessionLocal = sessionmaker(bind=engine)
+    return repository
+
+
+def build_engine(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def register_functions(connection, _):
+        connection.create_function("GETUTCDATE", 0, lambda: datetime.utcnow().isoformat(" "))
+
+    with engine.begin() as connection:
+        for statement in SCHEMA:
+            connection.execute(text(statement))
+    return engine
+
+
+def make_analyses(count: int):
+    user_id = uuid4()
+    return [
+        CompatibilityAnalysis(
+            analysis_id=uuid4(), user_id=user_id, resume_id=uuid4(), job_id=uuid4(),
+            match_score=0.0, status=AnalysisStatus.PENDING, analysis_type="bulk_match"
+        )
+        for _ in range(count)
+    ]
+
+
+def seed_notifications(engine, user_id: str, count: int):
+    ids = [str(uuid4()) for _ in range(count)]
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM Notifications"))
+        connection.execute(
+            text("INSERT INTO Notifications VALUES (:id, :user_id, 0, NULL)"),
+            [{"id": notification_id, "user_id": user_id} for notification_id in ids]
+        )
+    return ids
+
+
+def make_user_skills(user_id, count: int):
+    skills = [
+        UserSkill(user_skill_id=uuid4(), user_id=user_id, skill_id=uuid4(),
+                  proficiency_level=50, years_of_experience=2.0)
+        for _ in range(count)
+    ]
+    # Repetição da mesma SkillId: o MERGE só aceita uma linha de origem por chave
+    return skills + skills[:1]
+
+
+def compile_merges(user_id, user_skills) -> int:
+    """Montar e compilar os MERGEs do upsert; retorna o número de comandos"""
+    statements = UserSkillRepository._merge_statements(user_id, user_skills)
+    for query, params in statements:
+        compiled = text(query).compile(dialect=MSSQL_DIALECT)
+        positional = len(compiled.positiontup)
+        assert positional <= MAX_STATEMENT_PARAMS, f"{positional} parameters in one MERGE"
+        assert set(compiled.positiontup) == set(params), "MERGE placeholders and params differ"
+    return len(statements)
+
+
+def timed(fn, setup, repeat: int) -> float:
+    """Mediana em milissegundos (setup fora da medição)"""
+    samples = []
+    for _ in range(repeat):
+        args = setup()
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(sizes, repeat: int) -> None:
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+
+    try:
+        engine = build_engine(path)
+        analyses_repo = build_repository(AnalysisRepository, engine)
+        notifications_repo = build_repository(NotificationRepository, engine)
+        user_id = str(uuid4())
+
+        def per_item_analyses(analyses):
+            for analysis in analyses:
+                asyncio.run(analyses_repo.create_analysis(analysis))
+
+        def bulk_analyses(analyses):
+            asyncio.run(analyses_repo.create_analyses(analyses))
+
+        def per_item_notifications(ids):
+            for notification_id in ids:
+                with notifications_repo.get_session() as session:
+                    session.execute(text("""
+                        UPDATE Notifications SET IsRead = 1, ReadAt = GETUTCDATE()
+                        WHERE NotificationId = :id AND UserId = :user_id
+                    """), {"id": notification_id, "user_id": user_id})
+                    session.commit()
+
+        def bulk_notifications(ids):
+            updated = asyncio.run(notifications_repo.mark_notifications(user_id, ids, True))
+            assert updated == len(ids), f"updated {updated} of {len(ids)}"
+
+        def per_item_skills(user_skills):
+            for skill in user_skills:
+                compile_merges(user_id, [skill])
+
+        def bulk_skills(user_skills):
+            statements = compile_merges(user_id, user_skills)
+            unique = len(user_skills) - 1
+            rows_per_statement = (MAX_STATEMENT_PARAMS - UserSkillRepository._MERGE_FIXED_PARAMS) \
+                // UserSkillRepository._MERGE_ROW_PARAMS
+            assert statements == -(-unique // rows_per_statement), f"{statements} MERGEs for {unique} skills"
+
+        print(f"median of {repeat} runs (ms)\n")
+        print(f"{'case':<16} {'items':>6} {'per item':>10} {'bulk':>9} {'speedup':>8}")
+
+        for size in sizes:
+            cases = {
+                "analyses": (per_item_analyses, bulk_analyses, lambda: (make_analyses(size),)),
+                "notifications": (per_item_notifications, bulk_notifications,
+                                  lambda: (seed_notifications(engine, user_id, size),)),
+                "skills (build)": (per_item_skills, bulk_skills, lambda: (make_user_skills(user_id, size),))
+            }
+            for name, (per_item, bulk, setup) in cases.items():
+                per_item_time = timed(per_item, setup, repeat)
+                bulk_time = timed(bulk, setup, repeat)
+                print(f"{name:<16} {size:>6} {per_item_time:>10.1f} {bulk_time:>9.1f} "
+                      f"{per_item_time / bulk_time:>7.1f}x")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
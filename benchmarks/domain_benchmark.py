@@ -0,0 +1,145 @@
+"""
+Benchmark das entidades de domínio: dataclass com __dict__ vs __slots__
+
+Compara memória (tracemalloc) e tempo de construção de N instâncias de
+CompatibilityAnalysis, Resume, User, SkillExtraction e ExperienceItem contra
+réplicas sem __slots__ (o formato anterior das entidades). Antes de medir,
+verifica que factories e mappers continuam funcionando com as entidades atuais.
+
+Uso: python -m benchmarks.domain_benchmark [--instances 1000000]
+"""
+from dataclasses import fields, make_dataclass, field as dataclass_field, MISSING
+from datetime import datetime
+from uuid import uuid4
+import argparse
+import gc
+import time
+import tracemalloc
+
+from domain.entities.domain import (
+    CompatibilityAnalysis, Resume, User, SkillExtraction, ExperienceItem,
+    AnalysisStatus, ResumeStatus
+)
+from domain.factories import AnalysisFactory, ResumeFactory, UserFactory
+from mappers import AnalysisMapper, ResumeMapper, UserMapper
+
+
+def legacy_replica(entity: type) -> type:
+    """Mesma entidade como @dataclass simples (com __dict__ por instância)"""
+    spec = []
+    for entity_field in fields(entity):
+        if entity_field.default_factory is not MISSING:
+            spec.append((entity_field.name, entity_field.type,
+                         dataclass_field(default_factory=entity_field.default_factory)))
+        elif entity_field.default is not MISSING:
+            spec.append((entity_field.name, entity_field.type, dataclass_field(default=entity_field.default)))
+        else:
+            spec.append((entity_field.name, entity_field.type))
+    return make_dataclass(f"Legacy{entity.__name__}", spec)
+
+
+# Argumentos de construção representativos (valores compartilhados: mede só o objeto)
+NOW = datetime.utcnow()
+USER_ID = uuid4()
+RESUME_ID = uuid4()
+
+SAMPLES = {
+    CompatibilityAnalysis: lambda i: dict(
+        analysis_id=RESUME_ID, user_id=USER_ID, resume_id=RESUME_ID, job_id=None,
+        match_score=float(i % 100), status=AnalysisStatus.COMPLETED, created_at=NOW
+    ),
+    Resume: lambda i: dict(
+        resume_id=RESUME_ID, user_id=USER_ID, title="Currículo", status=ResumeStatus.ACTIVE,
+        created_at=NOW, updated_at=NOW
+    ),
+    User: lambda i: dict(
+        user_id=USER_ID, email="user@skillsync.app", full_name="Usuário", password_hash="x",
+        created_at=NOW, updated_at=NOW
+    ),
+    SkillExtraction: lambda i: dict(name="Python", confidence=0.9, matched=True, category="backend"),
+    ExperienceItem: lambda i: dict(
+        company="Empresa", position="Engenheira", duration="2 anos", description="APIs", relevance_score=0.8
+    )
+}
+
+
+def check_factories_and_mappers() -> None:
+    """Factories e mappers devem funcionar com as entidades com __slots__"""
+    user = UserFactory.make_user({"email": "user@skillsync.app", "full_name": "Usuário", "password_hash": "x"})
+    user_id = user.user_id
+    # A atualização aplica os campos do DTO, exceto a chave primária
+    UserFactory.make_user_update({"full_name": "Outro Nome", "user_id": uuid4()}, user)
+    assert user.full_name == "Outro Nome" and user.user_id == user_id
+    UserMapper.to_public(user)
+    UserMapper.to_export(user)
+
+    resume = ResumeFactory.make_resume({"title": "Currículo"}, USER_ID)
+    ResumeFactory.make_resume_update({"title": "Currículo v2"}, resume)
+    assert resume.title == "Currículo v2"
+    ResumeMapper.to_public(resume)
+    ResumeMapper.to_export(resume)
+
+    analysis = AnalysisFactory.make_analysis({"resume_id": RESUME_ID, "job_id": uuid4()}, USER_ID)
+    AnalysisFactory.make_analysis_update({"analysis_type": "bulk_match"}, analysis)
+    AnalysisFactory.make_analysis_result(analysis, {"overall_score": 87.5, "processing_time_ms": 1200})
+    assert analysis.status == AnalysisStatus.COMPLETED and analysis.analysis_type == "bulk_match"
+    AnalysisMapper.to_public(analysis)
+    AnalysisMapper.to_export(analysis)
+
+    for entity in SAMPLES:
+        assert not hasattr(entity(**SAMPLES[entity](0)), "__dict__"), f"{entity.__name__} has __dict__"
+
+
+def measure(entity: type, instances: int) -> tuple:
+    """(MB alocados, segundos) para construir `instances` objetos"""
+    kwargs = SAMPLES[entity](0)
+    gc.collect()
+    gc.disable()
+    try:
+        # Tempo medido sem tracemalloc (o rastreamento domina o custo de construção)
+        started = time.perf_counter()
+        objects = [entity(**kwargs) for _ in range(instances)]
+        elapsed = time.perf_counter() - started
+        del objects
+
+        tracemalloc.start()
+        objects = [entity(**kwargs) for _ in range(instances)]
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del objects
+    finally:
+        gc.enable()
+    return allocated / 1024 / 1024, elapsed
+
+
+def measure_legacy(entity: type, instances: int) -> tuple:
+    """Mesma medição para a réplica sem __slots__"""
+    legacy = legacy_replica(entity)
+    SAMPLES[legacy] = SAMPLES[entity]
+    try:
+        return measure(legacy, instances)
+    finally:
+        del SAMPLES[legacy]
+
+
+def run(instances: int) -> None:
+    check_factories_and_mappers()
+    print("factories/mappers: ok\n")
+
+    print(f"{instances:,} instances (memory in MB, construction in s)\n")
+    print(f"{'entity':<24} {'dict MB':>9} {'slots MB':>9} {'saved':>7} {'dict s':>8} {'slots s':>8}")
+
+    for entity in SAMPLES:
+        legacy_memory, legacy_time = measure_legacy(entity, instances)
+        slots_memory, slots_time = measure(entity, instances)
+        print(
+            f"{entity.__name__:<24} {legacy_memory:>9.1f} {slots_memory:>9.1f} "
+            f"{1 - slots_memory / legacy_memory:>6.0%} {legacy_time:>8.2f} {slots_time:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--instances", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.instances)
@@ -0,0 +1,99 @@
+"""
+Benchmark do tempo de importação (cold start) da aplicação
+
+Importa o módulo (por padrão `main`) em processos novos com `python -X importtime` e reporta:
+- mediana do tempo total de importação, comparada ao orçamento (--budget-ms)
+- tempo próprio agregado por pacote raiz (onde o cold start é gasto)
+- módulos pesados que devem ficar fora do startup (--forbid): SDK da OpenAI, Azure Blob,
+  Motor e NumPy são importados só no primeiro uso
+
+Sai com código 1 se o orçamento for excedido ou um módulo proibido for importado, para rodar
+como verificação de regressão no CI.
+
+Uso: python -m benchmarks.import_time_benchmark [--module main] [--repeat 5] [--budget-ms 2000]
+"""
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_FORBIDDEN = ("openai", "azure.storage.blob", "motor", "numpy")
+
+
+def profile_import(module: str) -> List[Tuple[str, int, int]]:
+    """(módulo, tempo próprio em µs, tempo acumulado em µs) de cada import, em processo novo"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def by_package(entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Tempo próprio somado por pacote raiz"""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in entries:
+        totals[name.split(".")[0]] += self_us
+    return totals
+
+
+def run(module: str, repeat: int, budget_ms: float, forbidden: List[str], top: int) -> int:
+    runs = [profile_import(module) for _ in range(repeat)]
+
+    totals_ms = [
+        next(cumulative for name, _, cumulative in entries if name == module) / 1000
+        for entries in runs
+    ]
+    median_ms = statistics.median(totals_ms)
+
+    packages: Dict[str, List[int]] = defaultdict(list)
+    for entries in runs:
+        for package, self_us in by_package(entries).items():
+            packages[package].append(self_us)
+
+    print(f"import {module}: median {median_ms:.0f} ms over {repeat} runs "
+          f"(min {min(totals_ms):.0f}, max {max(totals_ms):.0f}), budget {budget_ms:.0f} ms\n")
+    print(f"{'package':<28} {'self ms':>8}")
+    ranked = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for package, samples in ranked[:top]:
+        print(f"{package:<28} {statistics.median(samples) / 1000:>8.1f}")
+
+    imported = {name for name, _, _ in runs[0]}
+    leaked = [name for name in forbidden if name in imported]
+
+    failed = False
+    if median_ms > budget_ms:
+        print(f"\nFAIL: import time {median_ms:.0f} ms exceeds budget {budget_ms:.0f} ms")
+        failed = True
+    if leaked:
+        print(f"\nFAIL: modules that should load lazily were imported at startup: {', '.join(leaked)}")
+        failed = True
+    if not failed:
+        print("\nOK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--repeat", type=int, default=5)
+    # Orçamento medido numa máquina de desenvolvimento; ajuste para o hardware do CI
+    parser.add_argument("--budget-ms", type=float, default=2000)
+    parser.add_argument("--forbid", nargs="*", default=list(DEFAULT_FORBIDDEN))
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    sys.exit(run(args.module, args.repeat, args.budget_ms, args.forbid, args.top))
@@ -0,0 +1,149 @@
+"""
+Benchmark dos mappers: entidade por linha vs conversão em lote
+
+Para N linhas cruas (como retornadas por execute_query), compara:
+- entity: linha -> entidade de domínio -> mapper por objeto (caminho anterior)
+- batch: mapper em lote direto da linha (RowMapper com mapa de campos pré-calculado)
+
+Uso: python -m benchmarks.mapper_benchmark [--rows 10000] [--repeat 20]
+"""
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+import argparse
+import statistics
+import time
+
+from data.row_factories import analysis_row_factory, resume_row_factory
+from domain.entities.domain import User, SubscriptionType
+from mappers import AnalysisMapper, ResumeMapper, UserMapper
+from schemas.responses.responses import AnalysisResponse
+
+
+def uuid_column() -> str:
+    """pyodbc devolve uniqueidentifier como str maiúscula"""
+    return str(uuid4()).upper()
+
+
+def build_rows(rows: int):
+    now = datetime.utcnow()
+    user_id = uuid_column()
+    statuses = ("completed", "pending", "failed", "processing")
+
+    analyses = [
+        {
+            "AnalysisId": uuid_column(), "UserId": user_id, "ResumeId": uuid_column(),
+            "JobId": uuid_column() if i % 3 else None, "MatchScore": float(i % 100),
+            "Status": statuses[i % 4], "AnalysisType": "job_match", "ProcessingTimeMs": 1000 + i,
+            "CreatedAt": now - timedelta(minutes=i), "CompletedAt": now if i % 4 == 0 else None,
+            "MongoAnalysisId": None, "JobTitle": "Backend Engineer" if i % 2 else None
+        }
+        for i in range(rows)
+    ]
+    resumes = [
+        {
+            "ResumeId": uuid_column(), "UserId": user_id, "Title": f"Currículo {i}", "Version": "v1.0",
+            "Status": "active", "DataLakeFileId": None, "OriginalFileName": "cv.pdf", "FileSize": 1024,
+            "FileType": "pdf", "CreatedAt": now, "UpdatedAt": now, "LastAnalyzedAt": None,
+            "AnalysisCount": i % 10, "AverageMatchScore": 70.0
+        }
+        for i in range(rows)
+    ]
+    users = [
+        {
+            "UserId": uuid_column(), "FullName": f"Usuário {i}", "Email": f"user{i}@skillsync.app",
+            "SubscriptionType": "free", "IsActive": True, "CreatedAt": now, "LastLoginAt": None
+        }
+        for i in range(rows)
+    ]
+    return analyses, resumes, users
+
+
+def row_to_user(row) -> User:
+    """Conversão equivalente à do UserRepository (apenas os campos da listagem)"""
+    return User(
+        user_id=UUID(row["UserId"]), email=row["Email"], full_name=row["FullName"], password_hash="",
+        subscription_type=SubscriptionType(row["SubscriptionType"]), created_at=row["CreatedAt"],
+        last_login_at=row["LastLoginAt"], is_active=row["IsActive"]
+    )
+
+
+def entity_response(analysis) -> AnalysisResponse:
+    """Caminho anterior do AnalysisService (uma construção de modelo por entidade)"""
+    return AnalysisResponse(
+        analysis_id=analysis.analysis_id, user_id=analysis.user_id, resume_id=analysis.resume_id,
+        job_id=analysis.job_id, match_score=analysis.match_score, status=analysis.status,
+        analysis_type=analysis.analysis_type, processing_time_ms=analysis.processing_time_ms,
+        created_at=analysis.created_at, completed_at=analysis.completed_at
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    """Mediana em milissegundos"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, repeat: int) -> None:
+    analyses, resumes, users = build_rows(rows)
+    build_analysis = analysis_row_factory(tuple(analyses[0]))
+    build_resume = resume_row_factory(tuple(resumes[0]))
+
+    def to_analysis(row):
+        return build_analysis(tuple(row.values()))
+
+    def to_resume(row):
+        return build_resume(tuple(row.values()))
+
+    cases = {
+        "analysis list items": (
+            lambda: [AnalysisMapper.to_list_item(to_analysis(row)) for row in analyses],
+            lambda: AnalysisMapper.rows_to_list_items(analyses)
+        ),
+        "analysis responses": (
+            lambda: [entity_response(to_analysis(row)) for row in analyses],
+            lambda: AnalysisMapper.rows_to_responses(analyses, AnalysisResponse)
+        ),
+        "analysis dashboard items": (
+            lambda: [AnalysisMapper.to_dashboard_item(to_analysis(row), row["JobTitle"]) for row in analyses],
+            lambda: AnalysisMapper.rows_to_dashboard_items(analyses)
+        ),
+        "analysis search results": (
+            lambda: [AnalysisMapper.to_search_result(to_analysis(row)) for row in analyses],
+            lambda: AnalysisMapper.rows_to_search_results(analyses)
+        ),
+        "resume list items": (
+            lambda: [ResumeMapper.to_list_item(to_resume(row)) for row in resumes],
+            lambda: ResumeMapper.rows_to_list_items(resumes)
+        ),
+        "resume search results": (
+            lambda: [ResumeMapper.to_search_result(to_resume(row)) for row in resumes],
+            lambda: ResumeMapper.rows_to_search_results(resumes)
+        ),
+        "user list items": (
+            lambda: [UserMapper.to_list_item(row_to_user(row)) for row in users],
+            lambda: UserMapper.rows_to_list_items(users)
+        )
+    }
+
+    print(f"{rows:,} rows, median of {repeat} runs (ms)\n")
+    print(f"{'case':<26} {'entity':>9} {'batch':>9} {'speedup':>8}")
+
+    for name, (entity_path, batch_path) in cases.items():
+        # Os dois caminhos devem produzir o mesmo resultado
+        assert entity_path() == batch_path(), f"{name}: batch output differs"
+
+        entity_time = timed(entity_path, repeat)
+        batch_time = timed(batch_path, repeat)
+        print(f"{name:<26} {entity_time:>9.1f} {batch_time:>9.1f} {entity_time / batch_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,176 @@
+"""
+Benchmark das leituras de listagem no MongoDB (modo "list" vs "detail")
+
+Gera documentos sintéticos de análise e de carta de apresentação no formato gravado pelos
+repositórios e compara, por página, os bytes BSON que trafegariam do servidor para a API e o
+tempo de decodificação:
+- detail: documento completo (o que get_user_analyses/get_user_cover_letters traziam antes)
+- list: projeção do modo "list" (identificação + sub-documento "summary")
+
+Para análises também mede a separação quente/frio: documento quente (sem jobAnalysis e
+resumeAnalysis) lido por padrão no detalhe e o payload frio comprimido (gzip), lido só com
+full_report.
+
+A projeção é aplicada em Python com a mesma regra do servidor (inclusão por caminho), então o
+resultado não depende de um mongod rodando.
+
+Uso: python -m benchmarks.mongo_projection_benchmark [--page-size 50] [--repeat 200]
+"""
+from datetime import datetime
+from uuid import uuid4
+import argparse
+import time
+
+import bson
+
+from data.mongo_repository import (
+    AnalysisMongoRepository, AnalysisPayloadRepository, CoverLetterMongoRepository
+)
+
+SKILLS = ["python", "fastapi", "sql server", "mongodb", "docker", "kubernetes", "aws", "react",
+          "typescript", "terraform", "kafka", "redis", "graphql", "ci/cd", "pandas", "spark"]
+
+
+def build_repository(cls):
+    """Repositório sem conexão (só a declaração de projeção/resumo é usada)"""
+    return object.__new__(cls)
+
+
+def make_analysis(repository, user_id: str, i: int) -> dict:
+    now = datetime.utcnow()
+    document = {
+        "_id": bson.ObjectId(),
+        "analysisId": str(uuid4()),
+        "userId": user_id,
+        "resumeId": str(uuid4()),
+        "jobId": str(uuid4()),
+        "matchScore": float(i % 100),
+        "jobAnalysis": {
+            "title": f"Senior Backend Engineer {i}",
+            "requirements": [f"{skill} experience with production systems" for skill in SKILLS],
+            "description": "Responsible for designing and operating services. " * 40,
+            "keywords": SKILLS * 3
+        },
+        "resumeAnalysis": {
+            "skills": [{"name": skill, "level": 70, "evidence": "Used daily in projects " * 5}
+                       for skill in SKILLS],
+            "experience": [{"company": f"Company {n}", "summary": "Delivered features and led a team. " * 15}
+                           for n in range(6)],
+            "extractedText": "Experienced engineer with a track record of shipping. " * 120
+        },
+        "compatibilityReport": {
+            "overallScore": float(i % 100),
+            "gaps": [{"skill": skill, "recommendation": "Study and build a side project. " * 4}
+                     for skill in SKILLS[:8]],
+            "strengths": SKILLS[8:]
+        },
+        "processingTime": 1200,
+        "aiModel": "gpt-4",
+        "version": "1.0",
+        "createdAt": now,
+        "updatedAt": now
+    }
+    document["summary"] = repository.build_summary(document)
+    return document
+
+
+def make_cover_letter(repository, user_id: str, i: int) -> dict:
+    now = datetime.utcnow()
+    paragraph = "I am excited to apply for this position and bring my experience. " * 12
+    document = {
+        "_id": bson.ObjectId(),
+        "coverLetterId": str(uuid4()),
+        "userId": user_id,
+        "resumeId": str(uuid4()),
+        "jobId": str(uuid4()),
+        "content": {
+            "subject": f"Application for Backend Engineer {i}",
+            "greeting": "Dear Hiring Manager,",
+            "body": [paragraph for _ in range(4)],
+            "closing": "Sincerely,",
+            "fullText": paragraph * 5
+        },
+        "customizations": {"tone": "professional", "length": "medium", "highlights": SKILLS[:5]},
+        "editHistory": [{"editedAt": now, "previous": paragraph} for _ in range(3)],
+        "generatedBy": "ai",
+        "aiModel": "gpt-4",
+        "language": "pt-BR",
+        "wordCount": 450,
+        "createdAt": now,
+        "updatedAt": now
+    }
+    document["summary"] = repository.build_summary(document)
+    return document
+
+
+def project(document: dict, projection) -> dict:
+    """Inclusão por caminho (como o servidor aplica a projeção); _id sempre incluído"""
+    if projection is None:
+        return document
+
+    result = {"_id": document["_id"]}
+    for path in projection:
+        source, target = document, result
+        keys = path.split(".")
+        for key in keys[:-1]:
+            source = source.get(key) if isinstance(source, dict) else None
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(key, {})
+        else:
+            if isinstance(source, dict) and keys[-1] in source:
+                target[keys[-1]] = source[keys[-1]]
+    return result
+
+
+def measure(documents, projection, repeat: int) -> tuple:
+    """(bytes por página, ms para decodificar a página)"""
+    encoded = [bson.encode(project(document, projection)) for document in documents]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for data in encoded:
+            bson.decode(data)
+    elapsed = (time.perf_counter() - started) * 1000 / repeat
+    return sum(len(data) for data in encoded), elapsed
+
+
+def run(page_size: int, repeat: int) -> None:
+    user_id = str(uuid4())
+    cases = {}
+    for cls, factory in ((AnalysisMongoRepository, make_analysis),
+                         (CoverLetterMongoRepository, make_cover_letter)):
+        repository = build_repository(cls)
+        cases[cls.__name__] = (repository, [factory(repository, user_id, i) for i in range(page_size)])
+
+    print(f"page of {page_size} documents, decode time = mean of {repeat} runs\n")
+    print(f"{'repository':<28} {'mode':<7} {'bytes':>10} {'decode ms':>10} {'reduction':>10}")
+
+    for name, (repository, documents) in cases.items():
+        full_bytes, _ = measure(documents, repository.projection("detail"), 1)
+        for mode in ("detail", "list"):
+            size, elapsed = measure(documents, repository.projection(mode), repeat)
+            print(f"{name:<28} {mode:<7} {size:>10,} {elapsed:>10.3f} {full_bytes / size:>9.1f}x")
+
+    repository, documents = cases[AnalysisMongoRepository.__name__]
+    hot_bytes = cold_bytes = raw_cold_bytes = 0
+    started = time.perf_counter()
+    for document in documents:
+        hot = dict(document)
+        data, raw_size = AnalysisPayloadRepository.compress(repository._split_payload(hot))
+        hot_bytes += len(bson.encode(hot))
+        cold_bytes += len(data)
+        raw_cold_bytes += raw_size
+    compress_ms = (time.perf_counter() - started) * 1000 / len(documents)
+
+    full_bytes = sum(len(bson.encode(document)) for document in documents)
+    print(f"\nhot/cold split (per page): full {full_bytes:,} B, hot {hot_bytes:,} B, "
+          f"cold {raw_cold_bytes:,} B -> {cold_bytes:,} B gzip "
+          f"({raw_cold_bytes / cold_bytes:.1f}x, {compress_ms:.2f} ms per document)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.page_size, args.repeat)
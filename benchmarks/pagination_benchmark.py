@@ -0,0 +1,125 @@
+"""
+Benchmark de paginação: OFFSET vs keyset (cursor)
+
+Usa SQLite em memória com o mesmo formato de CompatibilityAnalyses e o índice
+(UserId, CreatedAt DESC, AnalysisId DESC) que a paginação por cursor assume.
+
+Uso: python -m benchmarks.pagination_benchmark [--pages 10000] [--page-size 20]
+"""
+from datetime import datetime, timedelta
+import argparse
+import sqlite3
+import statistics
+import time
+import uuid
+
+from utils.pagination import encode_cursor, decode_cursor
+
+USER_ID = str(uuid.uuid4())
+
+OFFSET_QUERY = """
+SELECT AnalysisId, CreatedAt FROM CompatibilityAnalyses
+WHERE UserId = ?
+ORDER BY CreatedAt DESC, AnalysisId DESC
+LIMIT ? OFFSET ?
+"""
+
+FIRST_PAGE_QUERY = """
+SELECT AnalysisId, CreatedAt FROM CompatibilityAnalyses
+WHERE UserId = ?
+ORDER BY CreatedAt DESC, AnalysisId DESC
+LIMIT ?
+"""
+
+KEYSET_QUERY = """
+SELECT AnalysisId, CreatedAt FROM CompatibilityAnalyses
+WHERE UserId = ?
+  AND CreatedAt <= ?
+  AND (CreatedAt < ? OR AnalysisId < ?)
+ORDER BY CreatedAt DESC, AnalysisId DESC
+LIMIT ?
+"""
+
+
+def build_database(rows: int) -> sqlite3.Connection:
+    """Criar tabela com `rows` análises do mesmo usuário (e ruído de outros usuários)"""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE CompatibilityAnalyses (
+            AnalysisId TEXT PRIMARY KEY,
+            UserId TEXT NOT NULL,
+            MatchScore REAL,
+            CreatedAt TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IX_Analyses_User_Created
+        ON CompatibilityAnalyses (UserId, CreatedAt DESC, AnalysisId DESC)
+    """)
+
+    start = datetime(2024, 1, 1)
+    other_user = str(uuid.uuid4())
+    data = []
+    for i in range(rows):
+        # Timestamps repetidos a cada 3 linhas para exercitar o desempate por Id
+        created_at = (start + timedelta(seconds=i // 3)).isoformat()
+        data.append((str(uuid.uuid4()), USER_ID, 50.0, created_at))
+        if i % 4 == 0:
+            data.append((str(uuid.uuid4()), other_user, 50.0, created_at))
+
+    conn.executemany("INSERT INTO CompatibilityAnalyses VALUES (?, ?, ?, ?)", data)
+    conn.commit()
+    return conn
+
+
+def timed(fn, repeat: int) -> float:
+    """Mediana em milissegundos"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def cursor_before_page(conn: sqlite3.Connection, page: int, page_size: int) -> str:
+    """Cursor que um cliente teria após ler as páginas anteriores"""
+    analysis_id, created_at = conn.execute(
+        OFFSET_QUERY, (USER_ID, 1, (page - 1) * page_size - 1)
+    ).fetchone()
+    return encode_cursor(datetime.fromisoformat(created_at), analysis_id)
+
+
+def run(pages: int, page_size: int, repeat: int) -> None:
+    conn = build_database(pages * page_size)
+    print(f"{pages * page_size} rows, page size {page_size}, median of {repeat} runs\n")
+    print(f"{'page':>8} {'offset (ms)':>12} {'keyset (ms)':>12}")
+
+    for page in (1, 10, 100, 1000, pages):
+        offset_ms = timed(
+            lambda: conn.execute(OFFSET_QUERY, (USER_ID, page_size, (page - 1) * page_size)).fetchall(),
+            repeat
+        )
+
+        if page == 1:
+            keyset_fn = lambda: conn.execute(FIRST_PAGE_QUERY, (USER_ID, page_size)).fetchall()
+        else:
+            created_at, analysis_id = decode_cursor(cursor_before_page(conn, page, page_size))
+            params = (USER_ID, created_at.isoformat(), created_at.isoformat(), analysis_id, page_size)
+            keyset_fn = lambda: conn.execute(KEYSET_QUERY, params).fetchall()
+
+            # As duas estratégias devem devolver a mesma página
+            expected = conn.execute(OFFSET_QUERY, (USER_ID, page_size, (page - 1) * page_size)).fetchall()
+            assert keyset_fn() == expected, f"keyset mismatch at page {page}"
+
+        keyset_ms = timed(keyset_fn, repeat)
+        print(f"{page:>8} {offset_ms:>12.3f} {keyset_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.pages, args.page_size, args.repeat)
@@ -0,0 +1,145 @@
+"""
+Benchmark do roteamento de leituras para réplicas
+
+Usa arquivos SQLite como primário e réplicas (cópias do mesmo banco) e executa leituras do
+dashboard (DashboardRepository) concorrentes, em threads, para cada política:
+- distribuição das leituras entre primário e réplicas
+- read-your-writes: um usuário que acabou de escrever lê do primário durante a janela
+- fallback: uma réplica inacessível é marcada como indisponível e a leitura volta ao primário
+
+Uso: python -m benchmarks.replica_routing_benchmark [--replicas 3] [--reads 2000] [--threads 8]
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from uuid import uuid4
+import argparse
+import asyncio
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from data.sql_repository import DashboardRepository
+from data.sql_router import SQLEngineRouter, ROUTING_POLICIES
+
+ENGINE_OPTIONS = {"connect_args": {"detect_types": sqlite3.PARSE_DECLTYPES, "check_same_thread": False}}
+
+
+def build_primary(path: str, users: int, analyses_per_user: int):
+    engine = create_engine(f"sqlite:///{path}", **ENGINE_OPTIONS)
+    now = datetime.utcnow()
+    user_ids = [str(uuid4()) for _ in range(users)]
+
+    with engine.begin() as connection:
+        connection.execute(text("""
+            CREATE TABLE CompatibilityAnalyses (
+                AnalysisId TEXT, UserId TEXT, ResumeId TEXT, JobId TEXT, MatchScore REAL,
+                Status TEXT, AnalysisType TEXT, ProcessingTimeMs INTEGER,
+                CreatedAt TIMESTAMP, CompletedAt TIMESTAMP, MongoAnalysisId TEXT
+            )
+        """))
+        connection.execute(text("CREATE INDEX IX_Analyses_User ON CompatibilityAnalyses (UserId, CreatedAt)"))
+        connection.execute(text("CREATE TABLE JobDescriptions (JobId TEXT, Title TEXT)"))
+        connection.execute(
+            text("""
+                INSERT INTO CompatibilityAnalyses VALUES
+                (:id, :user_id, :resume_id, NULL, :score, 'completed', 'job_match', 900, :created, :created, NULL)
+            """),
+            [
+                {"id": str(uuid4()), "user_id": user_id, "resume_id": str(uuid4()),
+                 "score": float(i % 100), "created": now - timedelta(minutes=i)}
+                for user_id in user_ids for i in range(analyses_per_user)
+            ]
+        )
+    engine.dispose()
+    return user_ids
+
+
+RECENT_ANALYSES = """
+SELECT AnalysisId, MatchScore, Status, CreatedAt
+FROM CompatibilityAnalyses
+WHERE UserId = :user_id
+ORDER BY CreatedAt DESC
+LIMIT :limit
+"""
+
+
+def run_policy(policy: str, primary: str, replicas, user_ids, reads: int, threads: int) -> None:
+    router = SQLEngineRouter.from_urls(
+        f"sqlite:///{primary}", [f"sqlite:///{path}" for path in replicas],
+        engine_options=ENGINE_OPTIONS, policy=policy, read_your_writes_seconds=60.0
+    )
+    repository = DashboardRepository(router=router)
+
+    # Metade dos usuários "acabou de escrever": suas leituras ficam no primário
+    for user_id in user_ids[: len(user_ids) // 2]:
+        repository.mark_write(user_id)
+
+    def read(i: int) -> int:
+        user_id = user_ids[i % len(user_ids)]
+        return len(repository.execute_query(
+            RECENT_ANALYSES, {"user_id": user_id, "limit": 5}, read_replica=True, user_id=user_id
+        ))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(read, range(reads)))
+    elapsed = time.perf_counter() - started
+
+    assert all(count == 5 for count in results), "every read should return the user's 5 latest analyses"
+    stats = router.stats()
+    distribution = " ".join(f"{name}={info['reads']}" for name, info in stats["replicas"].items())
+    print(f"{policy:<18} {elapsed * 1000:>8.1f} ms  primary={stats['primary_reads']} "
+          f"sticky={stats['sticky_reads']} {distribution} fallbacks={stats['fallbacks']}")
+    router.dispose()
+
+
+def run_fallback(primary: str, replicas, user_ids) -> None:
+    # A última réplica aponta para um diretório inexistente: falha ao conectar
+    broken = [f"sqlite:///{path}" for path in replicas[:-1]] + ["sqlite:////nonexistent/replica.db"]
+    router = SQLEngineRouter.from_urls(
+        f"sqlite:///{primary}", broken, engine_options=ENGINE_OPTIONS, replica_retry_seconds=60
+    )
+    repository = DashboardRepository(router=router)
+
+    for i in range(len(replicas) * 4):
+        user_id = user_ids[i % len(user_ids)]
+        asyncio.run(repository.get_score_distribution(user_id))
+
+    stats = router.stats()
+    unavailable = [name for name, info in stats["replicas"].items() if not info["available"]]
+    print(f"fallback: {stats['fallbacks']} read(s) retried on primary, unavailable={unavailable}")
+    router.dispose()
+
+
+def run(replica_count: int, reads: int, threads: int) -> None:
+    workdir = tempfile.mkdtemp()
+    try:
+        primary = os.path.join(workdir, "primary.db")
+        user_ids = build_primary(primary, users=100, analyses_per_user=50)
+
+        # Réplicas = cópias do primário (replicação já em dia)
+        replicas = []
+        for index in range(replica_count):
+            path = os.path.join(workdir, f"replica-{index}.db")
+            shutil.copyfile(primary, path)
+            replicas.append(path)
+
+        print(f"{reads:,} reads, {threads} threads, {replica_count} replicas, half of the users sticky\n")
+        for policy in ROUTING_POLICIES:
+            run_policy(policy, primary, replicas, user_ids, reads, threads)
+        run_fallback(primary, replicas, user_ids)
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--replicas", type=int, default=3)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    run(args.replicas, args.reads, args.threads)
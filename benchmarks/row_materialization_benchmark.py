@@ -0,0 +1,135 @@
+"""
+Benchmark de materialização de linhas SQL
+
+Usa SQLite (arquivo temporário) com o formato de CompatibilityAnalyses e compara, para N linhas:
+- dict: execute_query (dict por linha) + conversão campo a campo em entidade (caminho anterior)
+- factory: execute_rows com analysis_row_factory (tupla -> entidade, posições resolvidas uma vez)
+- stream: stream_rows com a mesma factory, em lotes (pico de memória limitado ao lote)
+
+Uso: python -m benchmarks.row_materialization_benchmark [--rows 100000] [--batch-size 1000]
+"""
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from data.row_factories import analysis_row_factory
+from data.sql_repository import SQLRepository
+from domain.entities.domain import CompatibilityAnalysis, AnalysisStatus
+
+QUERY = """
+SELECT AnalysisId, UserId, ResumeId, JobId, MatchScore,
+       Status, AnalysisType, ProcessingTimeMs, CreatedAt, CompletedAt,
+       MongoAnalysisId
+FROM CompatibilityAnalyses
+"""
+
+
+def build_repository(path: str, rows: int) -> SQLRepository:
+    """Repositório apontando para um SQLite com `rows` análises"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"detect_types": sqlite3.PARSE_DECLTYPES})
+    now = datetime.utcnow()
+
+    with engine.begin() as connection:
+        connection.execute(text("""
+            CREATE TABLE CompatibilityAnalyses (
+                AnalysisId TEXT, UserId TEXT, ResumeId TEXT, JobId TEXT, MatchScore REAL,
+                Status TEXT, AnalysisType TEXT, ProcessingTimeMs INTEGER,
+                CreatedAt TIMESTAMP, CompletedAt TIMESTAMP, MongoAnalysisId TEXT
+            )
+        """))
+        user_id = str(uuid4()).upper()
+        connection.execute(
+            text("""
+                INSERT INTO CompatibilityAnalyses VALUES
+                (:id, :user_id, :resume_id, NULL, :score, 'completed', 'job_match', 1200, :created, :created, NULL)
+            """),
+            [
+                {"id": str(uuid4()).upper(), "user_id": user_id, "resume_id": str(uuid4()).upper(),
+                 "score": float(i % 100), "created": now - timedelta(minutes=i)}
+                for i in range(rows)
+            ]
+        )
+
+    # Sem passar pelo __init__ (que conecta ao SQL Server da configuração)
+    repository = object.__new__(SQLRepository)
+    repository.engine = engine
+    repository.SessionLocal = sessionmaker(bind=engine)
+    return repository
+
+
+def dict_to_analysis(row) -> CompatibilityAnalysis:
+    """Conversão campo a campo a partir do dict (caminho anterior)"""
+    return CompatibilityAnalysis(
+        analysis_id=UUID(str(row["AnalysisId"])),
+        user_id=UUID(str(row["UserId"])),
+        resume_id=UUID(str(row["ResumeId"])),
+        job_id=UUID(str(row["JobId"])) if row["JobId"] else None,
+        match_score=row["MatchScore"],
+        status=AnalysisStatus(row["Status"]),
+        analysis_type=row["AnalysisType"],
+        processing_time_ms=row["ProcessingTimeMs"],
+        created_at=row["CreatedAt"],
+        completed_at=row["CompletedAt"],
+        mongo_analysis_id=row["MongoAnalysisId"]
+    )
+
+
+def measure(fn) -> tuple:
+    """(segundos, pico de memória em MB, resultado)"""
+    # Tempo sem tracemalloc (o rastreamento domina o custo); memória numa segunda execução
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, result
+
+
+def run(rows: int, batch_size: int) -> None:
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+
+    try:
+        repository = build_repository(path, rows)
+
+        def dict_path():
+            return len([dict_to_analysis(row) for row in repository.execute_query(QUERY)])
+
+        def factory_path():
+            return len(repository.execute_rows(QUERY, row_factory=analysis_row_factory))
+
+        def stream_path():
+            total = 0
+            for analyses in repository.stream_rows(QUERY, row_factory=analysis_row_factory,
+                                                   batch_size=batch_size):
+                total += len(analyses)
+            return total
+
+        print(f"{rows:,} rows (time in s, peak traced memory in MB)\n")
+        print(f"{'path':<10} {'time':>8} {'peak MB':>9}")
+
+        for name, path_fn in (("dict", dict_path), ("factory", factory_path), ("stream", stream_path)):
+            elapsed, peak, count = measure(path_fn)
+            assert count == rows, f"{name} returned {count} rows"
+            print(f"{name:<10} {elapsed:>8.2f} {peak:>9.1f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.rows, args.batch_size)
@@ -0,0 +1,180 @@
+"""
+Benchmark de serialização: caminho padrão do FastAPI vs respostas JSON rápidas
+
+Compara, para DetailedAnalysisResponse e DashboardResponse com tamanhos realistas:
+- response_model: validação + serialize + json.dumps (fluxo padrão com response_model)
+- jsonable_encoder: jsonable_encoder + json.dumps (fluxo padrão sem response_model)
+- fast: ModelJSONResponse (pydantic-core direto para bytes)
+- orjson: FastJSONResponse sobre o dict já serializado pelo response_model
+
+Uso: python -m benchmarks.serialization_benchmark [--repeat 200]
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from core.responses import FastJSONResponse, ModelJSONResponse
+from domain.entities.domain import AnalysisStatus, NotificationType
+from schemas.responses.responses import (
+    DetailedAnalysisResponse, SkillMatchResponse, ExperienceMatchResponse,
+    CompatibilityScoresResponse, DashboardResponse, DashboardStatsResponse,
+    RecentActivityResponse, AnalysisResponse, NotificationResponse
+)
+
+
+def build_detailed_analysis(skills: int = 80, experiences: int = 15) -> DetailedAnalysisResponse:
+    """Análise detalhada com listas aninhadas no tamanho de um currículo sênior"""
+    return DetailedAnalysisResponse(
+        analysis_id=uuid4(),
+        match_score=78.5,
+        status=AnalysisStatus.COMPLETED,
+        job_analysis={
+            "title": "Senior Backend Engineer",
+            "required_skills": [f"skill-{i}" for i in range(40)],
+            "nice_to_have": [f"extra-{i}" for i in range(20)],
+            "seniority": "senior",
+            "summary": "Lorem ipsum dolor sit amet. " * 20
+        },
+        extracted_skills=[
+            SkillMatchResponse(
+                name=f"Skill {i}", confidence=0.5 + (i % 50) / 100, matched=i % 3 != 0,
+                category=["backend", "frontend", "cloud", "data"][i % 4], proficiency_level=i % 5 + 1
+            )
+            for i in range(skills)
+        ],
+        experience_matches=[
+            ExperienceMatchResponse(
+                company=f"Company {i}", position="Software Engineer", duration=f"{i % 6 + 1} anos",
+                description="Desenvolvimento de APIs, mensageria e observabilidade. " * 6,
+                relevance_score=0.3 + (i % 7) / 10
+            )
+            for i in range(experiences)
+        ],
+        education=[{"institution": f"Universidade {i}", "degree": "Bacharelado"} for i in range(3)],
+        languages=["Português", "Inglês", "Espanhol"],
+        certifications=[f"Certificação {i}" for i in range(8)],
+        compatibility_scores=CompatibilityScoresResponse(
+            overall_score=78.5, skills=81.0, experience=75.0, education=70.0, cultural=88.0
+        ),
+        strengths=[f"Ponto forte {i}: experiência relevante com sistemas distribuídos" for i in range(10)],
+        weaknesses=[f"Ponto fraco {i}: pouca exposição a liderança técnica" for i in range(6)],
+        recommendations=[f"Recomendação {i}: destacar resultados mensuráveis" for i in range(10)],
+        improvement_areas=[{"area": f"Área {i}", "priority": i % 3, "actions": ["a", "b", "c"]} for i in range(8)],
+        processing_time_ms=4200,
+        ai_model="gpt-4-turbo-preview",
+        created_at=datetime.utcnow()
+    )
+
+
+def build_dashboard(items: int = 10, trend_days: int = 90) -> DashboardResponse:
+    """Dashboard com tendência de 90 dias e listas com detalhes"""
+    now = datetime.utcnow()
+    user_id = uuid4()
+    return DashboardResponse(
+        stats=DashboardStatsResponse(
+            saved_resumes=12, average_match=72.4, best_match="Senior Backend Engineer",
+            best_match_percentage=93.0, total_analyses=340, this_month=42, completed_analyses=320,
+            pending_analyses=5, cover_letters_generated=28, profile_views=0,
+            analysis_trend=[
+                {"date": (now - timedelta(days=d)).strftime("%Y-%m-%d"), "created": d % 7,
+                 "completed": d % 5, "averageScore": 60 + d % 30}
+                for d in range(trend_days)
+            ],
+            match_score_distribution=[{"range": f"{b}-{b + 10}", "count": b} for b in range(0, 100, 10)]
+        ),
+        recent_activities=[
+            RecentActivityResponse(
+                activity_type="analysis_completed", title="Análise concluída",
+                description=f"Score de compatibilidade: {70 + i}%", timestamp=now, resource_id=uuid4(),
+                resource_type="analysis"
+            )
+            for i in range(items)
+        ],
+        recent_analyses=[
+            AnalysisResponse(
+                analysis_id=uuid4(), user_id=user_id, resume_id=uuid4(), job_id=uuid4(),
+                match_score=70.0 + i, status=AnalysisStatus.COMPLETED, analysis_type="full",
+                processing_time_ms=3000 + i, created_at=now, completed_at=now
+            )
+            for i in range(items)
+        ],
+        notifications=[
+            NotificationResponse(
+                notification_id=uuid4(), type=list(NotificationType)[0], title=f"Notificação {i}",
+                message="Sua análise foi concluída com sucesso.", is_read=i % 2 == 0, created_at=now
+            )
+            for i in range(items)
+        ]
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    """Mediana em microssegundos"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(samples)
+
+
+def run(repeat: int) -> None:
+    payloads = {
+        "DetailedAnalysisResponse": build_detailed_analysis(),
+        "DashboardResponse": build_dashboard()
+    }
+
+    loop = asyncio.new_event_loop()
+
+    print(f"median of {repeat} runs (µs)\n")
+    print(f"{'model':<26} {'bytes':>8} {'response_model':>15} {'jsonable_enc':>13} {'fast':>8} {'orjson':>8} {'speedup':>8}")
+
+    for name, model in payloads.items():
+        field = create_model_field(name=f"Response_{name}", type_=type(model), mode="serialization")
+
+        def response_model_path():
+            content = loop.run_until_complete(serialize_response(field=field, response_content=model))
+            return JSONResponse(content).body
+
+        def jsonable_encoder_path():
+            return JSONResponse(jsonable_encoder(model)).body
+
+        def fast_path():
+            return ModelJSONResponse(model).body
+
+        def orjson_path():
+            content = model.model_dump(mode="json")
+            return FastJSONResponse(content).body
+
+        # Os caminhos devem produzir o mesmo JSON
+        expected = json.loads(response_model_path())
+        for path in (jsonable_encoder_path, fast_path, orjson_path):
+            assert json.loads(path()) == expected, f"{path.__name__} output differs for {name}"
+
+        baseline = timed(response_model_path, repeat)
+        encoder = timed(jsonable_encoder_path, repeat)
+        fast = timed(fast_path, repeat)
+        orjson_time = timed(orjson_path, repeat)
+
+        print(
+            f"{name:<26} {len(fast_path()):>8} {baseline:>15.1f} {encoder:>13.1f} "
+            f"{fast:>8.1f} {orjson_time:>8.1f} {baseline / fast:>7.1f}x"
+        )
+
+    loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.repeat)
@@ -0,0 +1,86 @@
+"""
+Benchmark do container de serviços (instâncias compartilhadas vs construção por requisição)
+
+Simula a resolução de dependências de uma requisição autenticada (get_current_user + rota),
+que antes construía dois UserService (repositórios SQL e MongoDB, StatisticsService e um
+CryptContext) e agora busca a instância no container. Mede, por requisição:
+- tempo de resolução das dependências
+- memória alocada (tracemalloc)
+
+Os repositórios SQL usam um roteador sobre SQLite em memória; nenhuma consulta é executada.
+
+Uso: python -m benchmarks.service_container_benchmark [--requests 2000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from core.container import ServiceContainer
+from data import sql_router
+from data.sql_router import SQLEngineRouter
+from services.analysis_service import AnalysisService
+from services.dashboard_service import DashboardService
+from services.user_service import UserService
+
+
+def per_request(service_type, count: int):
+    def resolve():
+        # get_current_user + a própria rota: duas construções por requisição
+        return [service_type() for _ in range(count)]
+    return resolve
+
+
+def from_container(container: ServiceContainer, service_type, count: int):
+    def resolve():
+        return [container.get(service_type) for _ in range(count)]
+    return resolve
+
+
+def measure(resolve, requests: int) -> tuple:
+    """(µs por requisição, KB alocados por requisição)"""
+    resolve()  # aquecimento (imports e caches)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        resolve()
+    elapsed_us = (time.perf_counter() - started) * 1_000_000 / requests
+
+    samples = max(1, requests // 10)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [resolve() for _ in range(samples)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return elapsed_us, (after - before) / samples / 1024
+
+
+def run(requests: int) -> None:
+    # Roteador compartilhado sobre SQLite: os repositórios são construídos sem SQL Server
+    sql_router._router = SQLEngineRouter.from_urls("sqlite://")
+
+    container = ServiceContainer()
+    cases = (
+        ("auth request", UserService, 2),
+        ("analysis request", AnalysisService, 1),
+        ("dashboard request", DashboardService, 1)
+    )
+    for _, service_type, _ in cases:
+        container.register(service_type)
+
+    print(f"{requests:,} simulated requests\n")
+    print(f"{'case':<20} {'mode':<11} {'us/request':>11} {'KB/request':>11}")
+    for name, service_type, count in cases:
+        for mode, resolve in (("per-request", per_request(service_type, count)),
+                              ("container", from_container(container, service_type, count))):
+            elapsed_us, allocated_kb = measure(resolve, requests)
+            print(f"{name:<20} {mode:<11} {elapsed_us:>11.1f} {allocated_kb:>11.2f}")
+
+    sql_router.dispose_engine_router()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.requests)
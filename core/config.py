@@ -1,7 +1,7 @@
 """
 Configurações da aplicação SkillSync
 """
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Tuple
 from pydantic import BaseModel, validator
 from pydantic_settings import BaseSettings
 from decouple import config
@@ -60,9 +60,31 @@ class Settings(BaseSettings):
             f"&TrustServerCertificate=yes"
         )
     
+    # Réplicas de leitura (servidores separados por vírgula; mesmo banco e credenciais)
+    SQL_READ_REPLICAS: str = config("SQL_READ_REPLICAS", default="")
+    SQL_READ_POLICY: str = config("SQL_READ_POLICY", default="round_robin")  # round_robin, least_connections
+    SQL_READ_YOUR_WRITES_SECONDS: float = config("SQL_READ_YOUR_WRITES_SECONDS", default=5.0, cast=float)
+    SQL_REPLICA_RETRY_SECONDS: float = config("SQL_REPLICA_RETRY_SECONDS", default=30.0, cast=float)
+    
+    @property
+    def sql_replica_connection_strings(self) -> List[str]:
+        return [
+            f"mssql+pyodbc://{self.SQL_USERNAME}:{self.SQL_PASSWORD}"
+            f"@{server}/{self.SQL_DATABASE}"
+            f"?driver={self.SQL_DRIVER.replace(' ', '+')}"
+            f"&TrustServerCertificate=yes"
+            for server in (s.strip() for s in self.SQL_READ_REPLICAS.split(","))
+            if server
+        ]
+    
     # MongoDB
     MONGO_URL: str = config("MONGO_URL", default="mongodb://localhost:27017")
     MONGO_DATABASE: str = config("MONGO_DATABASE", default="skillsync")
+    MONGO_ENSURE_INDEXES: bool = config("MONGO_ENSURE_INDEXES", default=True, cast=bool)
+    # Auditoria das consultas com explain() no startup: off, warn, strict (COLLSCAN impede o startup)
+    MONGO_QUERY_AUDIT: str = config("MONGO_QUERY_AUDIT", default="off")
+    # Payload frio das análises (análises brutas do currículo e da vaga), gravado comprimido com gzip
+    ANALYSIS_PAYLOAD_COMPRESSION_LEVEL: int = config("ANALYSIS_PAYLOAD_COMPRESSION_LEVEL", default=6, cast=int)
     
     # Azure Blob Storage
     AZURE_STORAGE_ACCOUNT: str = config("AZURE_STORAGE_ACCOUNT", default="")
@@ -82,9 +104,52 @@ class Settings(BaseSettings):
     REDIS_URL: str = config("REDIS_URL", default="redis://localhost:6379")
     CACHE_EXPIRE_SECONDS: int = config("CACHE_EXPIRE_SECONDS", default=3600, cast=int)
     
+    # Serialização rápida de respostas (orjson / pydantic-core)
+    FAST_JSON_RESPONSES: bool = config("FAST_JSON_RESPONSES", default=False, cast=bool)
+    
+    # Compressão de respostas (gzip/brotli acima do tamanho mínimo)
+    COMPRESSION_MINIMUM_SIZE: int = config("COMPRESSION_MINIMUM_SIZE", default=1024, cast=int)
+    COMPRESSION_GZIP_LEVEL: int = config("COMPRESSION_GZIP_LEVEL", default=6, cast=int)
+    COMPRESSION_BROTLI_QUALITY: int = config("COMPRESSION_BROTLI_QUALITY", default=4, cast=int)
+
+    # Dashboard
+    DASHBOARD_CACHE_TTL: int = config("DASHBOARD_CACHE_TTL", default=300, cast=int)
+    DASHBOARD_CACHE_MAX_ENTRIES: int = config("DASHBOARD_CACHE_MAX_ENTRIES", default=10000, cast=int)
+    DASHBOARD_PART_TIMEOUT: float = config("DASHBOARD_PART_TIMEOUT", default=2.0, cast=float)
+
+    # Paginação
+    PAGINATION_TOTAL_CAP: int = config("PAGINATION_TOTAL_CAP", default=10000, cast=int)  # limite da contagem aproximada
+
+    # Exportação de dados
+    EXPORT_BATCH_SIZE: int = config("EXPORT_BATCH_SIZE", default=1000, cast=int)  # linhas por lote lido
+    EXPORT_CHUNK_SIZE: int = config("EXPORT_CHUNK_SIZE", default=64 * 1024, cast=int)  # bytes por chunk enviado
+    EXPORT_GZIP_LEVEL: int = config("EXPORT_GZIP_LEVEL", default=6, cast=int)
+    EXPORT_STORAGE_DIR: str = config("EXPORT_STORAGE_DIR", default="exports")  # artefatos dos jobs
+    EXPORT_MAX_CONCURRENT_JOBS: int = config("EXPORT_MAX_CONCURRENT_JOBS", default=2, cast=int)
+    EXPORT_ARTIFACT_TTL_HOURS: int = config("EXPORT_ARTIFACT_TTL_HOURS", default=24, cast=int)
+
     # OpenAI
     OPENAI_API_KEY: str = config("OPENAI_API_KEY", default="")
     OPENAI_MODEL: str = config("OPENAI_MODEL", default="gpt-4-turbo-preview")
+    OPENAI_EXTRACTION_MODEL: str = config("OPENAI_EXTRACTION_MODEL", default="gpt-4o-mini")  # extração estruturada
+    OPENAI_BASE_URL: str = config("OPENAI_BASE_URL", default="")  # vazio = API oficial; mock local em testes
+    OPENAI_MAX_CONNECTIONS: int = config("OPENAI_MAX_CONNECTIONS", default=20, cast=int)
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = config("OPENAI_MAX_KEEPALIVE_CONNECTIONS", default=20, cast=int)  # igual ao máximo: sem churn sob carga
+    OPENAI_KEEPALIVE_EXPIRY: float = config("OPENAI_KEEPALIVE_EXPIRY", default=30.0, cast=float)  # segundos
+    OPENAI_MAX_CONCURRENT_REQUESTS: int = config("OPENAI_MAX_CONCURRENT_REQUESTS", default=16, cast=int)
+    OPENAI_TIMEOUT: float = config("OPENAI_TIMEOUT", default=60.0, cast=float)  # segundos por requisição
+    OPENAI_CONNECT_TIMEOUT: float = config("OPENAI_CONNECT_TIMEOUT", default=5.0, cast=float)
+    OPENAI_HTTP2: bool = config("OPENAI_HTTP2", default=True, cast=bool)  # requer o pacote h2
+    OPENAI_MAX_RETRIES: int = config("OPENAI_MAX_RETRIES", default=0, cast=int)  # retries do SDK; ver AISettings.RETRY_POLICIES
+    AI_LIMITER_INITIAL_LIMIT: int = config("AI_LIMITER_INITIAL_LIMIT", default=4, cast=int)  # máximo: OPENAI_MAX_CONCURRENT_REQUESTS
+    AI_LIMITER_MIN_LIMIT: int = config("AI_LIMITER_MIN_LIMIT", default=1, cast=int)
+    AI_LIMITER_QUEUE_TIMEOUT: float = config("AI_LIMITER_QUEUE_TIMEOUT", default=10.0, cast=float)  # espera por vaga
+    AI_LIMITER_LATENCY_TOLERANCE: float = config("AI_LIMITER_LATENCY_TOLERANCE", default=2.0, cast=float)  # x latência de referência
+    AI_BREAKER_FAILURE_THRESHOLD: int = config("AI_BREAKER_FAILURE_THRESHOLD", default=5, cast=int)  # falhas consecutivas
+    AI_BREAKER_RESET_SECONDS: float = config("AI_BREAKER_RESET_SECONDS", default=30.0, cast=float)
+    AI_HEDGE_TOKEN_BUDGET: float = config("AI_HEDGE_TOKEN_BUDGET", default=0.05, cast=float)  # fração dos tokens gastos
+    AI_HEDGE_MIN_SAMPLES: int = config("AI_HEDGE_MIN_SAMPLES", default=20, cast=int)  # antes disso não há p95
+    AI_LATENCY_WINDOW: int = config("AI_LATENCY_WINDOW", default=200, cast=int)  # chamadas por operação
     
     # Azure Cognitive Services
     AZURE_TEXT_ANALYTICS_ENDPOINT: str = config("AZURE_TEXT_ANALYTICS_ENDPOINT", default="")
@@ -96,6 +161,21 @@ class Settings(BaseSettings):
     SMTP_USERNAME: str = config("SMTP_USERNAME", default="")
     SMTP_PASSWORD: str = config("SMTP_PASSWORD", default="")
     
+    # Topologia de processos (server.py): workers web e pool de workers de análise
+    WEB_WORKERS: int = config("WEB_WORKERS", default=1, cast=int)
+    # 0 = análises processadas na própria requisição; > 0 = ficam pendentes para os workers do launcher
+    ANALYSIS_WORKERS: int = config("ANALYSIS_WORKERS", default=0, cast=int)
+    ANALYSIS_WORKER_CONCURRENCY: int = config("ANALYSIS_WORKER_CONCURRENCY", default=4, cast=int)  # análises por worker
+    ANALYSIS_WORKER_POLL_SECONDS: float = config("ANALYSIS_WORKER_POLL_SECONDS", default=2.0, cast=float)
+    WORKER_SHUTDOWN_TIMEOUT: int = config("WORKER_SHUTDOWN_TIMEOUT", default=30, cast=int)  # segundos
+    # Reserva de uma análise pelo worker: vencida (worker morto), volta a ser reservada por outro
+    ANALYSIS_CLAIM_LEASE_SECONDS: int = config("ANALYSIS_CLAIM_LEASE_SECONDS", default=600, cast=int)
+    # Warm start: conexões abertas por engine SQL antes de o worker aceitar requisições
+    SQL_WARM_CONNECTIONS: int = config("SQL_WARM_CONNECTIONS", default=2, cast=int)
+    # Snapshots de métricas por processo (agregados no /metrics); vazio = desativado
+    METRICS_DIR: str = config("METRICS_DIR", default="")
+    METRICS_SNAPSHOT_INTERVAL: float = config("METRICS_SNAPSHOT_INTERVAL", default=5.0, cast=float)
+    
     # Logging
     LOG_LEVEL: str = config("LOG_LEVEL", default="INFO")
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -135,6 +215,18 @@ class DatabaseSettings:
     MAX_RETRIES: int = 3
     RETRY_DELAY: int = 1
 
+    # Logs de atividade (write-behind)
+    ACTIVITY_LOG_BUFFER_SIZE: int = 10000
+    ACTIVITY_LOG_BATCH_SIZE: int = 500
+    ACTIVITY_LOG_FLUSH_INTERVAL: float = 1.0  # segundos
+    ACTIVITY_LOG_OVERFLOW_POLICY: str = "drop_oldest"  # drop_oldest, drop_newest, block
+    ACTIVITY_LOG_BLOCK_TIMEOUT: float = 0.05  # segundos (apenas para "block")
+    ACTIVITY_LOG_SHUTDOWN_TIMEOUT: float = 10.0  # segundos
+
+    # Estatísticas pré-calculadas
+    STATS_DAILY_RETENTION_DAYS: int = 365
+    STATS_ACTIVITY_WINDOW_DAYS: int = 30
+
 
 db_settings = DatabaseSettings()
 
@@ -147,6 +239,29 @@ class AISettings:
     TEMPERATURE: float = 0.7
     TOP_P: float = 1.0
     
+    # Modelo por operação (ausentes usam OPENAI_MODEL); saída do modelo roteado que não passa
+    # na validação do schema é refeita no OPENAI_MODEL
+    MODEL_ROUTES: Dict[str, str] = {
+        "job": settings.OPENAI_EXTRACTION_MODEL,
+        "skills": settings.OPENAI_EXTRACTION_MODEL
+    }
+    
+    # USD por 1K tokens (prompt, completion), para o custo por modelo nas métricas
+    MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+        "gpt-4-turbo-preview": (0.01, 0.03),
+        "gpt-4o": (0.0025, 0.01),
+        "gpt-4o-mini": (0.00015, 0.0006)
+    }
+    
+    # Retry (backoff exponencial com jitter, respeitando Retry-After) e hedge por operação;
+    # operações ausentes usam "default". timeout: segundos por tentativa (None = OPENAI_TIMEOUT)
+    RETRY_POLICIES: Dict[str, Dict[str, Any]] = {
+        "default": {"max_attempts": 3, "base_delay": 0.5, "max_delay": 8.0, "max_retry_after": 30.0,
+                    "timeout": None, "hedge": False},
+        "compatibility": {"timeout": 45.0, "hedge": True},
+        "cover_letter": {"max_attempts": 2}
+    }
+    
     # Análise de currículo
     RESUME_ANALYSIS_PROMPT: str = """
     Analise o seguinte currículo e extraia as seguintes informações:
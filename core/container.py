@@ -0,0 +1,74 @@
+"""
+Container de serviços
+Uma instância de cada serviço por processo, registrada no lifespan e injetada nas rotas via
+Depends; os serviços não guardam estado de requisição, então podem ser compartilhados
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Type, TypeVar
+import inspect
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ServiceContainer:
+    """Registro de fábricas e instâncias únicas (criadas no primeiro uso, thread-safe)"""
+
+    def __init__(self):
+        self._factories: Dict[type, Callable[[], Any]] = {}
+        self._instances: Dict[type, Any] = {}
+        # Reentrante: a fábrica de um serviço pode resolver suas dependências no container
+        self._lock = threading.RLock()
+
+    def register(self, service_type: Type[T], factory: Optional[Callable[[], T]] = None) -> None:
+        """Registrar serviço (a fábrica padrão é o próprio construtor)"""
+        with self._lock:
+            self._factories[service_type] = factory or service_type
+            self._instances.pop(service_type, None)
+
+    def get(self, service_type: Type[T]) -> T:
+        instance = self._instances.get(service_type)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(service_type)
+            if instance is None:
+                factory = self._factories.get(service_type)
+                if factory is None:
+                    raise LookupError(f"Service {service_type.__name__} is not registered")
+                instance = self._instances[service_type] = factory()
+            return instance
+
+    def provider(self, service_type: Type[T]) -> Callable[[], Awaitable[T]]:
+        """Dependência do FastAPI que entrega a instância registrada (async: resolvida no event
+        loop, sem passar pelo threadpool a cada requisição)"""
+        async def provide() -> T:
+            return self.get(service_type)
+
+        provide.__name__ = f"get_{service_type.__name__}"
+        return provide
+
+    async def close(self) -> None:
+        """Encerrar as instâncias criadas (close() de cada serviço, quando existir), na ordem
+        inversa da criação: quem depende de outro serviço fecha antes dele"""
+        with self._lock:
+            instances = list(self._instances.values())
+            self._instances.clear()
+
+        for instance in reversed(instances):
+            close = getattr(instance, "close", None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error closing {type(instance).__name__}: {e}")
+
+
+# Instância global do container
+container = ServiceContainer()
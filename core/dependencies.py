@@ -7,18 +7,41 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import logging
 
+from core.container import container
 from services.user_service import UserService
+from services.analysis_service import AnalysisService
+from services.cover_letter_service import CoverLetterService
+from services.dashboard_service import DashboardService
+from services.export_service import ExportService
+from services.statistics_service import StatisticsService
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
+# Serviços compartilhados por todas as requisições do processo
+SERVICES = (UserService, AnalysisService, CoverLetterService, DashboardService, ExportService,
+            StatisticsService)
+
+
+def register_services() -> None:
+    """Registrar os serviços no container (lifespan da aplicação)"""
+    for service_type in SERVICES:
+        container.register(service_type)
+
+
+get_user_service = container.provider(UserService)
+get_analysis_service = container.provider(AnalysisService)
+get_cover_letter_service = container.provider(CoverLetterService)
+get_dashboard_service = container.provider(DashboardService)
+get_export_service = container.provider(ExportService)
+
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    user_service: UserService = Depends(get_user_service)
 ) -> Dict[str, Any]:
     """Obter usuário atual a partir do token JWT"""
     try:
-        user_service = UserService()
         token_data = await user_service.verify_token(credentials.credentials)
         
         if not token_data:
@@ -46,14 +69,15 @@ async def get_current_user(
 
 
 async def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    user_service: UserService = Depends(get_user_service)
 ) -> Optional[Dict[str, Any]]:
     """Obter usuário atual (opcional) - para endpoints públicos"""
     if not credentials:
         return None
     
     try:
-        return await get_current_user(credentials)
+        return await get_current_user(credentials, user_service)
     except HTTPException:
         return None
 
@@ -0,0 +1,50 @@
+"""
+Eventos da aplicação
+Publicação/assinatura em processo para desacoplar efeitos colaterais (ex.: invalidação de cache)
+"""
+from typing import Callable, Dict, Any, List
+from collections import defaultdict
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Eventos de análise
+ANALYSIS_CREATED = "analysis.created"
+ANALYSIS_COMPLETED = "analysis.completed"
+ANALYSIS_FAILED = "analysis.failed"
+
+# Eventos de criação de conteúdo
+RESUME_CREATED = "resume.created"
+COVER_LETTER_CREATED = "cover_letter.created"
+
+
+class EventBus:
+    """Barramento de eventos em memória"""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable]] = defaultdict(list)
+
+    def subscribe(self, event: str, handler: Callable) -> None:
+        """Registrar handler (síncrono ou assíncrono) para um evento"""
+        if handler not in self._handlers[event]:
+            self._handlers[event].append(handler)
+
+    def unsubscribe(self, event: str, handler: Callable) -> None:
+        """Remover handler de um evento"""
+        if handler in self._handlers[event]:
+            self._handlers[event].remove(handler)
+
+    async def publish(self, event: str, payload: Dict[str, Any]) -> None:
+        """Publicar evento; falhas de um handler não afetam os demais"""
+        for handler in list(self._handlers.get(event, [])):
+            try:
+                result = handler(payload)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error handling event {event}: {e}")
+
+
+# Instância global do barramento de eventos
+event_bus = EventBus()
@@ -0,0 +1,173 @@
+"""
+Middlewares da aplicação
+Compressão de respostas (gzip/brotli) com tamanho mínimo
+"""
+from typing import Callable, Optional, Tuple
+import logging
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, apenas gzip
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Conteúdos já comprimidos ou que não podem ser bufferizados
+EXCLUDED_CONTENT_TYPES: Tuple[str, ...] = (
+    "text/event-stream",
+    "application/gzip",
+    "application/zip",
+    "application/octet-stream",
+    "image/",
+    "video/",
+    "audio/"
+)
+
+
+def etag_for_encoding(etag: str, encoding: str) -> str:
+    """ETag forte da representação comprimida (ex.: "abc" -> "abc-gzip")"""
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+class GzipEncoder:
+    """Compressor gzip em streaming (zlib com cabeçalho gzip)"""
+    encoding = "gzip"
+
+    def __init__(self, level: int = 6) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        compressed = self._compressor.compress(body)
+        # Em streaming, flush a cada chunk para o cliente receber os dados sem atraso
+        return compressed + self._compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    """Compressor brotli em streaming"""
+    encoding = "br"
+
+    def __init__(self, quality: int = 4) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        compressed = self._compressor.process(body)
+        return compressed + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class EncodingResponder:
+    """Envolve a app ASGI e comprime o corpo com o encoder negociado.
+
+    O ETag recebe o sufixo da codificação em toda resposta elegível (inclusive 304 e corpos abaixo
+    de `minimum_size`), para o 304 devolver o mesmo ETag que o 200 da mesma negociação.
+    Respostas parciais (Range), conteúdos já comprimidos e com Content-Encoding seguem intactos"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, encoder_factory: Callable[[], object],
+                 encoding: str) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoder_factory = encoder_factory
+        self.encoding = encoding
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        start_message: Optional[Message] = None
+        encoder = None
+        passthrough = False
+
+        async def send_encoded(message: Message) -> None:
+            nonlocal start_message, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                passthrough = (
+                    message["status"] == 206 or "content-range" in headers
+                    or "content-encoding" in headers
+                    or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+                )
+                if not passthrough:
+                    if "etag" in headers:
+                        headers["ETag"] = etag_for_encoding(headers["etag"], self.encoding)
+                    headers.add_vary_header("Accept-Encoding")
+                if passthrough or message["status"] == 304:
+                    await send(message)
+                    passthrough = True
+                else:
+                    # Guardar até ver o primeiro corpo (tamanho decide se comprime)
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                start, start_message = start_message, None
+                if len(body) < self.minimum_size and not more_body:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                encoder = self.encoder_factory()
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = self.encoding
+                body = encoder.compress(body, more_body)
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            await send({"type": "http.response.body", "body": encoder.compress(body, more_body),
+                        "more_body": more_body})
+
+        await self.app(scope, receive, send_encoded)
+
+
+class CompressionMiddleware:
+    """Comprime respostas acima de `minimum_size` com brotli (preferido) ou gzip"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024,
+                 gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _accepted_encodings(self, accept_encoding: str) -> set:
+        accepted = set()
+        for item in accept_encoding.split(","):
+            name, _, params = item.strip().partition(";")
+            if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(name.strip().lower())
+        return accepted
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = self._accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+
+        if brotli is not None and "br" in accepted:
+            responder = EncodingResponder(self.app, self.minimum_size,
+                                          lambda: BrotliEncoder(self.brotli_quality), "br")
+        elif "gzip" in accepted:
+            responder = EncodingResponder(self.app, self.minimum_size,
+                                          lambda: GzipEncoder(self.gzip_level), "gzip")
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        await responder(scope, receive, send)
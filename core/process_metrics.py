@@ -0,0 +1,141 @@
+"""
+Métricas por processo
+Cada processo (workers web e de análise) grava periodicamente um snapshot JSON em METRICS_DIR;
+o /metrics de qualquer worker lê todos os snapshots e soma os contadores
+"""
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import json
+import logging
+import os
+import time
+
+import psutil
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Campos que não se somam entre processos (máximo) ou que perdem sentido na soma (ignorados)
+MAX_FIELDS = {"max_ms"}
+SKIPPED_FIELDS = {"pid", "avg_ms", "available", "p95_ms"}
+
+
+def process_info(role: str) -> Dict[str, Any]:
+    """Identificação e uso de recursos do processo atual"""
+    process = psutil.Process()
+    with process.oneshot():
+        return {
+            "pid": process.pid,
+            "role": role,
+            "memory_usage_mb": round(process.memory_info().rss / 1024 / 1024, 1),
+            "cpu_percent": process.cpu_percent(interval=None),
+            "uptime_seconds": round(time.time() - process.create_time(), 1)
+        }
+
+
+def _merge(total: Dict[str, Any], values: Dict[str, Any]) -> None:
+    """Somar recursivamente os contadores numéricos de `values` em `total`"""
+    for key, value in values.items():
+        if key in SKIPPED_FIELDS or isinstance(value, bool):
+            continue
+        if isinstance(value, dict):
+            _merge(total.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)):
+            if key in MAX_FIELDS:
+                total[key] = max(total.get(key, 0), value)
+            else:
+                total[key] = round(total.get(key, 0) + value, 3)
+
+
+def aggregate_process_metrics(directory: str = None) -> Dict[str, Any]:
+    """Snapshots recentes de todos os processos e a soma dos contadores"""
+    directory = directory or settings.METRICS_DIR
+    if not directory or not os.path.isdir(directory):
+        return {}
+
+    # Snapshot de um processo que morreu (ou travou) deixa de contar após 3 intervalos
+    stale_before = time.time() - 3 * settings.METRICS_SNAPSHOT_INTERVAL
+    processes: List[Dict[str, Any]] = []
+    totals: Dict[str, Any] = {}
+
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < stale_before:
+                continue
+            with open(path, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            # Snapshot removido ou sendo substituído no meio da leitura
+            continue
+
+        processes.append(snapshot["process"])
+        _merge(totals, snapshot["metrics"])
+
+    return {
+        "process_count": len(processes),
+        "processes": processes,
+        "totals": totals
+    }
+
+
+class ProcessMetricsWriter:
+    """Grava o snapshot do processo em intervalos (escrita atômica via rename)"""
+
+    def __init__(self, role: str, collect: Callable[[], Dict[str, Any]],
+                 directory: str = None, interval: float = None):
+        self.role = role
+        self.collect = collect
+        self.directory = directory or settings.METRICS_DIR
+        self.interval = interval or settings.METRICS_SNAPSHOT_INTERVAL
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"{self.role}-{os.getpid()}.json")
+
+    def write(self) -> None:
+        snapshot = {
+            "process": process_info(self.role),
+            "metrics": self.collect(),
+            "written_at": datetime.utcnow().isoformat()
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, default=str)
+        os.replace(temporary, self.path)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                logger.error(f"Error writing process metrics: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Parar e remover o snapshot (o processo deixa de contar imediatamente)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
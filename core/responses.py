@@ -0,0 +1,127 @@
+"""
+Respostas JSON rápidas
+Serialização via orjson / pydantic-core, sem o duplo percurso do jsonable_encoder
+"""
+from typing import Any, Optional, Type
+from functools import lru_cache
+import hashlib
+import logging
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from core.config import settings
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele, usa o json da stdlib
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Conteúdo pode ser guardado pelo cliente, mas deve ser revalidado (If-None-Match) a cada uso
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+# Sufixos adicionados ao ETag pelo CompressionMiddleware
+ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que serializa com orjson (ou pydantic-core para modelos)"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
+
+
+class ModelJSONResponse(FastJSONResponse):
+    """Resposta que serializa o conteúdo com um serializador pydantic pré-compilado"""
+
+    def __init__(self, content: Any, status_code: int = 200,
+                 response_type: Optional[Type] = None, **kwargs):
+        self.response_type = response_type
+        super().__init__(content, status_code=status_code, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.response_type is not None:
+            return get_type_adapter(self.response_type).dump_json(content, by_alias=True)
+        return super().render(content)
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(response_type: Any) -> TypeAdapter:
+    """Serializador compilado (e reutilizado) para tipos que não são modelos, ex.: List[Model]"""
+    return TypeAdapter(response_type)
+
+
+def render_model(content: Any, status_code: int = 200, response_type: Optional[Type] = None) -> Any:
+    """Retornar o conteúdo no caminho rápido quando FAST_JSON_RESPONSES está ativo.
+
+    Com o modo desligado, devolve o próprio conteúdo e o FastAPI segue o fluxo padrão
+    (validação pelo response_model + jsonable_encoder). Com o modo ligado, devolve uma
+    Response pronta: o FastAPI não revalida nem percorre o modelo novamente.
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return content
+    return ModelJSONResponse(content, status_code=status_code, response_type=response_type)
+
+
+def warm_up_serializers(*response_types: Any) -> None:
+    """Compilar no startup os serializadores dos tipos de resposta mais usados"""
+    for response_type in response_types:
+        if isinstance(response_type, type) and issubclass(response_type, BaseModel):
+            # Modelos já têm o serializador compilado; basta garantir o schema completo
+            response_type.model_rebuild()
+        else:
+            get_type_adapter(response_type)
+    logger.info(f"Warmed up {len(response_types)} response serializers")
+
+
+# ===== GET CONDICIONAL =====
+
+def make_etag(*parts: Any) -> str:
+    """ETag forte a partir dos campos que identificam a versão do recurso"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    """Normalizar para comparação fraca: sem W/ e sem o sufixo da codificação"""
+    tag = etag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)]
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match usa comparação fraca (RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == current for candidate in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Resposta 304 sem corpo"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL})
+
+
+def with_etag(content: Any, etag: str) -> Response:
+    """Resposta JSON com ETag/Cache-Control (caminho rápido quando ativo)"""
+    response = render_model(content)
+    if not isinstance(response, Response):
+        response = JSONResponse(jsonable_encoder(content))
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CONDITIONAL_CACHE_CONTROL
+    return response
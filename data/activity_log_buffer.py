@@ -0,0 +1,193 @@
+"""
+Buffer de logs de atividade
+Registro write-behind: as atividades ficam em memória e são gravadas no MongoDB em lote
+"""
+from typing import List, Optional, Dict, Any, Deque
+from collections import deque
+from datetime import datetime
+import asyncio
+import logging
+
+from core.config import db_settings
+from data.mongo_repository import ActivityLogMongoRepository, UserStatisticsMongoRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogBuffer:
+    """Logger de atividades com buffer em anel e gravação em lote"""
+
+    OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+    def __init__(self, repository: Optional[ActivityLogMongoRepository] = None,
+                 statistics_repository: Optional[UserStatisticsMongoRepository] = None,
+                 capacity: int = db_settings.ACTIVITY_LOG_BUFFER_SIZE,
+                 batch_size: int = db_settings.ACTIVITY_LOG_BATCH_SIZE,
+                 flush_interval: float = db_settings.ACTIVITY_LOG_FLUSH_INTERVAL,
+                 overflow_policy: str = db_settings.ACTIVITY_LOG_OVERFLOW_POLICY,
+                 block_timeout: float = db_settings.ACTIVITY_LOG_BLOCK_TIMEOUT):
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy: {overflow_policy}")
+
+        self.repository = repository or ActivityLogMongoRepository()
+        self.statistics_repository = statistics_repository or UserStatisticsMongoRepository()
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._flush_requested = asyncio.Event()
+        self._space_available = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0
+        }
+
+    @property
+    def pending(self) -> int:
+        """Quantidade de atividades aguardando gravação"""
+        return len(self._buffer)
+
+    def start(self) -> None:
+        """Iniciar a tarefa de flush em background"""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = db_settings.ACTIVITY_LOG_SHUTDOWN_TIMEOUT) -> None:
+        """Parar a tarefa de flush gravando o que restar no buffer"""
+        self._closing = True
+        self._flush_requested.set()
+
+        try:
+            if self._task is not None:
+                await asyncio.wait_for(self._task, timeout=timeout)
+            # Garante que nada enfileirado durante o encerramento fique para trás
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Timeout flushing activity logs ({self.pending} pending dropped)")
+            self.stats["dropped"] += self.pending
+            self._buffer.clear()
+        finally:
+            self._task = None
+            await self.repository.disconnect()
+            await self.statistics_repository.disconnect()
+
+    async def log_activity(self, activity: Dict[str, Any]) -> None:
+        """Enfileirar atividade para gravação (não aguarda o MongoDB)"""
+        activity["timestamp"] = datetime.utcnow()
+
+        if len(self._buffer) >= self.capacity and not await self._make_room():
+            self.stats["dropped"] += 1
+            return
+
+        self._buffer.append(activity)
+        self.stats["enqueued"] += 1
+
+        if len(self._buffer) >= self.batch_size:
+            self._flush_requested.set()
+
+        if self._task is None and not self._closing:
+            self.start()
+
+    async def flush(self) -> int:
+        """Gravar todo o conteúdo do buffer (retorna quantidade gravada)"""
+        written = 0
+
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._take_batch()
+                written += await self._write_batch(batch)
+                self.stats["batches"] += 1
+                self._space_available.set()
+
+        return written
+
+    async def _make_room(self) -> bool:
+        """Aplicar a política de overflow quando o buffer está cheio"""
+        if self.overflow_policy == "drop_oldest":
+            self._buffer.popleft()
+            self.stats["dropped"] += 1
+            return True
+
+        if self.overflow_policy == "block":
+            # Backpressure: espera um flush liberar espaço por um tempo limitado
+            self._space_available.clear()
+            self._flush_requested.set()
+            try:
+                await asyncio.wait_for(self._space_available.wait(), timeout=self.block_timeout)
+            except asyncio.TimeoutError:
+                pass
+            return len(self._buffer) < self.capacity
+
+        return False
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        """Retirar o próximo lote do buffer"""
+        size = min(self.batch_size, len(self._buffer))
+        return [self._buffer.popleft() for _ in range(size)]
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """Gravar lote no MongoDB"""
+        try:
+            if self.repository.database is None:
+                await self.repository.connect()
+
+            written = await self.repository.log_activities(batch)
+
+        except Exception as e:
+            logger.error(f"Error writing activity log batch: {e}")
+            written = 0
+
+        if written:
+            await self._update_statistics(batch)
+
+        self.stats["written"] += written
+        self.stats["failed"] += len(batch) - written
+        return written
+
+    async def _update_statistics(self, batch: List[Dict[str, Any]]) -> None:
+        """Somar o lote aos contadores de atividade pré-calculados"""
+        counts: Dict[tuple, int] = {}
+        for activity in batch:
+            if not activity.get("userId") or not activity.get("action"):
+                continue
+            key = (activity["userId"], activity["action"], activity["timestamp"].strftime("%Y-%m-%d"))
+            counts[key] = counts.get(key, 0) + 1
+
+        try:
+            if self.statistics_repository.database is None:
+                await self.statistics_repository.connect()
+
+            await self.statistics_repository.apply_activity_counts(counts)
+
+        except Exception as e:
+            logger.error(f"Error updating activity statistics: {e}")
+
+    async def _run(self) -> None:
+        """Loop de flush por tamanho (batch_size) ou tempo (flush_interval)"""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._flush_requested.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error in activity log flush loop: {e}")
+
+
+# Instância global do logger de atividades
+activity_logger = ActivityLogBuffer()
@@ -2,33 +2,115 @@
 Repositório MongoDB
 Camada de acesso a dados para MongoDB
 """
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, AsyncIterator, NamedTuple, Tuple
 from uuid import UUID
-from datetime import datetime
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
-from pymongo.errors import PyMongoError
+from datetime import datetime, timedelta
+from pymongo import UpdateOne, IndexModel, ReturnDocument, ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError, BulkWriteError, OperationFailure
+from bson import Binary, ObjectId, decode as bson_decode, encode as bson_encode
+from bson.errors import InvalidId
+import asyncio
+import gzip
 import logging
 
-from core.config import settings
+from core.config import settings, db_settings
+from utils.pagination import CursorPage, InvalidCursorError, encode_cursor, decode_cursor
 from domain.entities.domain import (
     DetailedAnalysis, CoverLetterDocument, UserPreferences
 )
 
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+
 logger = logging.getLogger(__name__)
 
+# Modos de leitura: "list" traz só a projeção compacta (com o resumo), "detail" o documento inteiro
+READ_MODES = ("list", "detail")
+
+# Valores de exemplo para as formas de consulta (o plano depende só dos campos e operadores)
+_SAMPLE_ID = "query-shape-audit"
+_SAMPLE_DATE = datetime(2024, 1, 1)
+
+
+class QueryShape(NamedTuple):
+    """Forma de uma consulta do repositório, verificada com explain() na auditoria"""
+    name: str
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = None
+
+
+class QueryShapeAuditError(RuntimeError):
+    """Consulta de repositório sem índice (COLLSCAN)"""
+
+
+def _keyset_page_shapes(name: str, sort_field: str) -> List[QueryShape]:
+    """Formas geradas por find_page: primeira página e página seguinte (cursor)"""
+    sort = [(sort_field, DESCENDING), ("_id", DESCENDING)]
+    return [
+        QueryShape(f"{name}_first_page", {"userId": _SAMPLE_ID}, sort),
+        QueryShape(f"{name}_next_page", {
+            "userId": _SAMPLE_ID,
+            sort_field: {"$lte": _SAMPLE_DATE},
+            "$or": [
+                {sort_field: {"$lt": _SAMPLE_DATE}},
+                {sort_field: _SAMPLE_DATE, "_id": {"$lt": ObjectId()}}
+            ]
+        }, sort)
+    ]
+
+
+def _get_path(document: Dict[str, Any], path: str) -> Any:
+    """Valor de um campo com notação de ponto ("jobAnalysis.title")"""
+    value: Any = document
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """Todos os estágios de um plano do explain() (inputStage, inputStages, queryPlan...)"""
+    stages: List[str] = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
 
 class MongoRepository:
     """Repositório base para MongoDB"""
     
+    # Declarativo por coleção: índices aplicados no startup e consultas auditadas com explain()
+    INDEXES: List[IndexModel] = []
+    QUERY_SHAPES: List[QueryShape] = []
+    
+    # Resumo denormalizado (sub-documento "summary"): campo do resumo -> caminho no documento
+    SUMMARY_FIELDS: Dict[str, str] = {}
+    SUMMARY_DEFAULTS: Dict[str, Any] = {}
+    # Campos de identificação incluídos na projeção de listagem
+    LIST_FIELDS: Tuple[str, ...] = ()
+    
     def __init__(self):
-        self.client: AsyncIOMotorClient = None
-        self.database: AsyncIOMotorDatabase = None
+        self.client: Optional["AsyncIOMotorClient"] = None
+        self.database: Optional["AsyncIOMotorDatabase"] = None
+    
+    def _open_client(self) -> None:
+        # Motor é importado só quando o repositório acessa o banco pela primeira vez
+        from motor.motor_asyncio import AsyncIOMotorClient
+        
+        self.client = AsyncIOMotorClient(settings.MONGO_URL)
+        self.database = self.client[settings.MONGO_DATABASE]
     
     async def connect(self):
         """Conectar ao MongoDB"""
         try:
-            self.client = AsyncIOMotorClient(settings.MONGO_URL)
-            self.database = self.client[settings.MONGO_DATABASE]
+            self._open_client()
             
             # Testar conexão
             await self.client.admin.command('ping')
@@ -44,60 +126,329 @@ class MongoRepository:
             self.client.close()
             logger.info("Disconnected from MongoDB")
     
-    def get_collection(self, collection_name: str) -> AsyncIOMotorCollection:
+    def get_collection(self, collection_name: str) -> "AsyncIOMotorCollection":
         """Obter coleção do MongoDB"""
+        if self.database is None:
+            # O cliente Motor conecta sob demanda; connect() continua disponível para validar no startup
+            self._open_client()
         return self.database[collection_name]
 
+    def projection(self, mode: str) -> Optional[Dict[str, int]]:
+        """Projeção do modo de leitura (None = documento inteiro)"""
+        if mode not in READ_MODES:
+            raise ValueError(f"Unknown read mode '{mode}' (expected one of {READ_MODES})")
+        if mode == "detail" or not self.SUMMARY_FIELDS:
+            return None
+        
+        # Além do resumo, os campos de origem (pequenos) para documentos ainda sem resumo
+        fields = [*self.LIST_FIELDS, "summary", *self.SUMMARY_FIELDS.values()]
+        return {field: 1 for field in fields}
+    
+    def build_summary(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Montar o resumo a partir dos campos do documento"""
+        summary = {}
+        for key, path in self.SUMMARY_FIELDS.items():
+            value = _get_path(document, path)
+            summary[key] = self.SUMMARY_DEFAULTS.get(key) if value is None else value
+        return summary
+    
+    def summary_updates(self, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """$set dos campos do resumo afetados por uma atualização"""
+        return {
+            f"summary.{key}": _get_path(updates, path)
+            for key, path in self.SUMMARY_FIELDS.items()
+            if path.split(".")[0] in updates
+        }
+    
+    def _with_summaries(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Garantir "summary" em cada documento listado (documentos antigos usam os campos de origem)"""
+        for document in documents:
+            if "summary" not in document:
+                document["summary"] = self.build_summary(document)
+        return documents
+    
+    async def backfill_summaries(self) -> int:
+        """Gravar o resumo nos documentos que ainda não o têm (uma atualização no servidor)"""
+        if not self.SUMMARY_FIELDS:
+            return 0
+        
+        summary = {
+            key: {"$ifNull": [f"${path}", self.SUMMARY_DEFAULTS[key]]} if key in self.SUMMARY_DEFAULTS else f"${path}"
+            for key, path in self.SUMMARY_FIELDS.items()
+        }
+        
+        try:
+            collection = self.get_collection(self.collection_name)
+            result = await collection.update_many(
+                {"summary": {"$exists": False}},
+                [{"$set": {"summary": summary}}]
+            )
+            return result.modified_count
+            
+        except PyMongoError as e:
+            logger.error(f"Error backfilling summaries on {self.collection_name}: {e}")
+            return 0
+    
+    async def ensure_indexes(self) -> List[str]:
+        """Criar os índices declarados (idempotente: índices já existentes são mantidos)"""
+        collection = self.get_collection(self.collection_name)
+        created = []
+        
+        # Um por vez: um índice em conflito não impede a criação dos demais
+        for index in self.INDEXES:
+            try:
+                created.extend(await collection.create_indexes([index]))
+            except OperationFailure as e:
+                logger.error(f"Error creating index {index.document['name']} on {self.collection_name}: {e}")
+        
+        return created
+    
+    async def explain_query_shapes(self) -> Dict[str, List[str]]:
+        """Estágios do plano vencedor de cada forma de consulta declarada"""
+        collection = self.get_collection(self.collection_name)
+        plans = {}
+        
+        for shape in self.QUERY_SHAPES:
+            cursor = collection.find(shape.filter)
+            if shape.sort:
+                cursor = cursor.sort(shape.sort)
+            explanation = await cursor.explain()
+            plans[shape.name] = _plan_stages(explanation["queryPlanner"]["winningPlan"])
+        
+        return plans
+    
+    async def find_page(self, collection_name: str, query: Dict[str, Any], sort_field: str = "createdAt",
+                        limit: int = 50, cursor: Optional[str] = None,
+                        include_total: bool = False,
+                        projection: Optional[Dict[str, int]] = None) -> CursorPage[Dict[str, Any]]:
+        """Buscar página por keyset (sort_field, _id), sem skip()
+        
+        A projeção precisa incluir sort_field (usado no cursor); _id sempre vem.
+        """
+        collection = self.get_collection(collection_name)
+        page_query = dict(query)
+
+        if cursor:
+            sort_value, document_id = decode_cursor(cursor)
+            try:
+                document_id = ObjectId(document_id)
+            except InvalidId as e:
+                raise InvalidCursorError("Invalid pagination cursor") from e
+
+            # O limite superior fora do $or mantém a varredura do índice delimitada
+            page_query[sort_field] = {"$lte": sort_value}
+            page_query["$or"] = [
+                {sort_field: {"$lt": sort_value}},
+                {sort_field: sort_value, "_id": {"$lt": document_id}}
+            ]
+
+        documents = await collection.find(page_query, projection).sort(
+            [(sort_field, DESCENDING), ("_id", DESCENDING)]
+        ).limit(limit + 1).to_list(length=limit + 1)
+
+        # Um documento extra indica que existe próxima página
+        page = CursorPage(items=documents[:limit])
+        if len(documents) > limit:
+            last = page.items[-1]
+            page.next_cursor = encode_cursor(last[sort_field], last["_id"])
+
+        if include_total:
+            cap = settings.PAGINATION_TOTAL_CAP
+            page.total = await collection.count_documents(query, limit=cap)
+            page.total_capped = page.total >= cap
+
+        return page
+
+
+class AnalysisPayloadRepository(MongoRepository):
+    """Repositório do payload frio das análises (análises brutas da IA), comprimido com gzip
+    
+    O documento da análise fica só com os campos quentes (scores, relatório, resumo); o payload
+    é lido apenas quando o cliente pede o relatório completo.
+    """
+    
+    INDEXES = [
+        IndexModel([("analysisId", ASCENDING)], name="analysisId_unique", unique=True)
+    ]
+    QUERY_SHAPES = [
+        QueryShape("by_analysis_id", {"analysisId": _SAMPLE_ID})
+    ]
+    
+    ENCODING = "bson+gzip"
+    
+    def __init__(self):
+        super().__init__()
+        self.collection_name = "analysis_payloads"
+    
+    @staticmethod
+    def compress(payload: Dict[str, Any]) -> Tuple[Binary, int]:
+        """(payload BSON comprimido, tamanho original em bytes)"""
+        raw = bson_encode(payload)
+        return Binary(gzip.compress(raw, compresslevel=settings.ANALYSIS_PAYLOAD_COMPRESSION_LEVEL)), len(raw)
+    
+    @staticmethod
+    def decompress(data: bytes) -> Dict[str, Any]:
+        return bson_decode(gzip.decompress(data))
+    
+    async def save_payload(self, analysis_id: str, payload: Dict[str, Any]) -> None:
+        """Gravar (ou substituir) o payload da análise (compressão fora do event loop)"""
+        data, raw_size = await asyncio.to_thread(self.compress, payload)
+        
+        try:
+            collection = self.get_collection(self.collection_name)
+            await collection.replace_one(
+                {"analysisId": analysis_id},
+                {
+                    "analysisId": analysis_id,
+                    "encoding": self.ENCODING,
+                    "data": data,
+                    "rawSize": raw_size,
+                    "storedSize": len(data),
+                    "updatedAt": datetime.utcnow()
+                },
+                upsert=True
+            )
+            
+        except PyMongoError as e:
+            logger.error(f"Error saving analysis payload: {e}")
+            raise
+    
+    async def get_payload(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """Payload descomprimido fora do event loop (None se não houver)"""
+        try:
+            collection = self.get_collection(self.collection_name)
+            
+            document = await collection.find_one({"analysisId": analysis_id}, {"data": 1})
+            return await asyncio.to_thread(self.decompress, document["data"]) if document else None
+            
+        except PyMongoError as e:
+            logger.error(f"Error getting analysis payload: {e}")
+            return None
+    
+    async def delete_payload(self, analysis_id: str) -> bool:
+        try:
+            collection = self.get_collection(self.collection_name)
+            
+            result = await collection.delete_one({"analysisId": analysis_id})
+            return result.deleted_count > 0
+            
+        except PyMongoError as e:
+            logger.error(f"Error deleting analysis payload: {e}")
+            return False
+
 
 class AnalysisMongoRepository(MongoRepository):
     """Repositório MongoDB para análises detalhadas"""
     
+    INDEXES = [
+        IndexModel([("analysisId", ASCENDING)], name="analysisId_unique", unique=True),
+        IndexModel([("userId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)],
+                   name="userId_createdAt_id")
+    ]
+    SUMMARY_FIELDS = {
+        "matchScore": "matchScore",
+        "status": "status",
+        "jobTitle": "jobAnalysis.title",
+        "aiModel": "aiModel",
+        "createdAt": "createdAt",
+        "updatedAt": "updatedAt"
+    }
+    # Só análises concluídas têm documento detalhado
+    SUMMARY_DEFAULTS = {"status": "completed"}
+    LIST_FIELDS = ("analysisId", "userId", "resumeId", "jobId")
+    # Campos frios: vão para o payload comprimido (AnalysisPayloadRepository)
+    PAYLOAD_FIELDS = ("jobAnalysis", "resumeAnalysis")
+    
+    QUERY_SHAPES = [
+        QueryShape("by_analysis_id", {"analysisId": _SAMPLE_ID}),
+        QueryShape("statistics_match", {"userId": _SAMPLE_ID}),
+        *_keyset_page_shapes("user_analyses", "createdAt")
+    ]
+    
     def __init__(self):
         super().__init__()
         self.collection_name = "compatibility_analyses"
+        self.payloads = AnalysisPayloadRepository()
+    
+    async def disconnect(self):
+        await super().disconnect()
+        await self.payloads.disconnect()
+    
+    def _split_payload(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Remover os campos frios do documento e devolvê-los"""
+        return {field: analysis.pop(field) for field in self.PAYLOAD_FIELDS if field in analysis}
     
     async def create_detailed_analysis(self, analysis: Dict[str, Any]) -> str:
-        """Criar análise detalhada"""
+        """Criar análise detalhada (documento quente + payload frio comprimido)"""
         try:
             collection = self.get_collection(self.collection_name)
             
             # Adicionar timestamps
             analysis["createdAt"] = datetime.utcnow()
             analysis["updatedAt"] = datetime.utcnow()
+            analysis["summary"] = self.build_summary(analysis)
             
-            result = await collection.insert_one(analysis)
+            document = dict(analysis)
+            payload = self._split_payload(document)
+            if payload:
+                # Payload antes do documento: um documento com payloadStored sempre tem o payload
+                await self.payloads.save_payload(analysis["analysisId"], payload)
+                document["payloadStored"] = True
+            
+            result = await collection.insert_one(document)
             return str(result.inserted_id)
             
         except PyMongoError as e:
             logger.error(f"Error creating detailed analysis: {e}")
             raise
     
-    async def get_detailed_analysis(self, analysis_id: str) -> Optional[Dict[str, Any]]:
-        """Buscar análise detalhada por ID"""
+    async def get_detailed_analysis(self, analysis_id: str,
+                                    include_payload: bool = False) -> Optional[Dict[str, Any]]:
+        """Buscar análise detalhada por ID
+        
+        Sem include_payload traz só os campos quentes (também em documentos antigos, que ainda
+        guardam o payload inline); com include_payload descomprime e junta o payload frio.
+        """
         try:
             collection = self.get_collection(self.collection_name)
             
-            result = await collection.find_one({"analysisId": analysis_id})
+            projection = None if include_payload else {field: 0 for field in self.PAYLOAD_FIELDS}
+            result = await collection.find_one({"analysisId": analysis_id}, projection)
+            
+            if result and include_payload and result.get("payloadStored"):
+                result.update(await self.payloads.get_payload(analysis_id) or {})
             return result
             
         except PyMongoError as e:
             logger.error(f"Error getting detailed analysis: {e}")
             return None
     
-    async def get_user_analyses(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+    async def get_user_analyses(self, user_id: str, limit: int = 50,
+                                mode: str = "list") -> List[Dict[str, Any]]:
         """Buscar análises do usuário"""
+        page = await self.get_user_analyses_page(user_id, limit, mode=mode)
+        return page.items
+    
+    async def get_user_analyses_page(self, user_id: str, limit: int = 50, cursor: Optional[str] = None,
+                                     include_total: bool = False,
+                                     mode: str = "list") -> CursorPage[Dict[str, Any]]:
+        """Buscar análises do usuário (paginado por cursor)
+        
+        mode="list" traz só identificação e resumo (sem resumeAnalysis/jobAnalysis);
+        mode="detail" traz os documentos completos.
+        """
         try:
-            collection = self.get_collection(self.collection_name)
-            
-            cursor = collection.find(
-                {"userId": user_id}
-            ).sort("createdAt", -1).limit(limit)
-            
-            return await cursor.to_list(length=limit)
+            page = await self.find_page(
+                self.collection_name, {"userId": user_id}, "createdAt",
+                limit, cursor, include_total, self.projection(mode)
+            )
+            if mode == "list":
+                self._with_summaries(page.items)
+            return page
             
         except PyMongoError as e:
             logger.error(f"Error getting user analyses: {e}")
-            return []
+            return CursorPage()
     
     async def update_analysis(self, analysis_id: str, updates: Dict[str, Any]) -> bool:
         """Atualizar análise"""
@@ -105,11 +456,32 @@ class AnalysisMongoRepository(MongoRepository):
             collection = self.get_collection(self.collection_name)
             
             updates["updatedAt"] = datetime.utcnow()
+            summary_updates = self.summary_updates(updates)
+            
+            # Campos frios: regravar o payload inteiro (é comprimido como um bloco)
+            payload_updates = self._split_payload(updates)
+            unset = {}
+            if payload_updates:
+                document = await collection.find_one(
+                    {"analysisId": analysis_id}, {field: 1 for field in ("payloadStored", *self.PAYLOAD_FIELDS)}
+                )
+                if not document:
+                    return False
+                
+                payload = (
+                    await self.payloads.get_payload(analysis_id) if document.get("payloadStored")
+                    else self._split_payload(document)
+                ) or {}
+                payload.update(payload_updates)
+                await self.payloads.save_payload(analysis_id, payload)
+                updates["payloadStored"] = True
+                unset = {field: "" for field in self.PAYLOAD_FIELDS}
             
-            result = await collection.update_one(
-                {"analysisId": analysis_id},
-                {"$set": updates}
-            )
+            operations = {"$set": {**updates, **summary_updates}}
+            if unset:
+                operations["$unset"] = unset
+            
+            result = await collection.update_one({"analysisId": analysis_id}, operations)
             
             return result.modified_count > 0
             
@@ -123,6 +495,7 @@ class AnalysisMongoRepository(MongoRepository):
             collection = self.get_collection(self.collection_name)
             
             result = await collection.delete_one({"analysisId": analysis_id})
+            await self.payloads.delete_payload(analysis_id)
             return result.deleted_count > 0
             
         except PyMongoError as e:
@@ -162,6 +535,33 @@ class AnalysisMongoRepository(MongoRepository):
 class CoverLetterMongoRepository(MongoRepository):
     """Repositório MongoDB para cartas de apresentação"""
     
+    INDEXES = [
+        IndexModel([("coverLetterId", ASCENDING)], name="coverLetterId_unique", unique=True),
+        # Também atende o stream da exportação (createdAt crescente, percorrido ao contrário)
+        IndexModel([("userId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)],
+                   name="userId_createdAt_id")
+    ]
+    SUMMARY_FIELDS = {
+        "title": "title",
+        "subject": "content.subject",
+        "status": "status",
+        "wordCount": "wordCount",
+        "language": "language",
+        "generatedBy": "generatedBy",
+        "createdAt": "createdAt",
+        "updatedAt": "updatedAt"
+    }
+    SUMMARY_DEFAULTS = {"status": "generated"}
+    LIST_FIELDS = ("coverLetterId", "userId", "resumeId", "jobId")
+    
+    QUERY_SHAPES = [
+        QueryShape("by_cover_letter_id", {"coverLetterId": _SAMPLE_ID}),
+        QueryShape("export_stream", {
+            "userId": _SAMPLE_ID, "createdAt": {"$gte": _SAMPLE_DATE, "$lte": _SAMPLE_DATE}
+        }, [("createdAt", ASCENDING)]),
+        *_keyset_page_shapes("user_cover_letters", "createdAt")
+    ]
+    
     def __init__(self):
         super().__init__()
         self.collection_name = "cover_letters"
@@ -174,6 +574,7 @@ class CoverLetterMongoRepository(MongoRepository):
             # Adicionar timestamps
             cover_letter["createdAt"] = datetime.utcnow()
             cover_letter["updatedAt"] = datetime.utcnow()
+            cover_letter["summary"] = self.build_summary(cover_letter)
             
             result = await collection.insert_one(cover_letter)
             return str(result.inserted_id)
@@ -194,20 +595,76 @@ class CoverLetterMongoRepository(MongoRepository):
             logger.error(f"Error getting cover letter: {e}")
             return None
     
-    async def get_user_cover_letters(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """Buscar cartas do usuário"""
+    async def get_cover_letter_version(self, cover_letter_id: str) -> Optional[Dict[str, Any]]:
+        """Buscar apenas dono e updatedAt da carta (validação de ETag sem ler o documento)"""
         try:
             collection = self.get_collection(self.collection_name)
             
-            cursor = collection.find(
-                {"userId": user_id}
-            ).sort("createdAt", -1).limit(limit)
+            return await collection.find_one(
+                {"coverLetterId": cover_letter_id},
+                {"_id": 0, "userId": 1, "updatedAt": 1}
+            )
             
-            return await cursor.to_list(length=limit)
+        except PyMongoError as e:
+            logger.error(f"Error getting cover letter version: {e}")
+            return None
+    
+    async def get_user_cover_letters(self, user_id: str, limit: int = 50,
+                                     mode: str = "list") -> List[Dict[str, Any]]:
+        """Buscar cartas do usuário"""
+        page = await self.get_user_cover_letters_page(user_id, limit, mode=mode)
+        return page.items
+    
+    async def get_user_cover_letters_page(self, user_id: str, limit: int = 50, cursor: Optional[str] = None,
+                                          include_total: bool = False,
+                                          mode: str = "list") -> CursorPage[Dict[str, Any]]:
+        """Buscar cartas do usuário (paginado por cursor)
+        
+        mode="list" traz só identificação e resumo (sem o corpo da carta nem o histórico);
+        mode="detail" traz os documentos completos.
+        """
+        try:
+            page = await self.find_page(
+                self.collection_name, {"userId": user_id}, "createdAt",
+                limit, cursor, include_total, self.projection(mode)
+            )
+            if mode == "list":
+                self._with_summaries(page.items)
+            return page
             
         except PyMongoError as e:
             logger.error(f"Error getting user cover letters: {e}")
-            return []
+            return CursorPage()
+    
+    async def stream_user_cover_letters(self, user_id: str, date_from: Optional[datetime] = None,
+                                        date_to: Optional[datetime] = None,
+                                        batch_size: int = 1000) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Percorrer cartas do usuário em lotes (exportação)"""
+        collection = self.get_collection(self.collection_name)
+        
+        query: Dict[str, Any] = {"userId": user_id}
+        if date_from or date_to:
+            query["createdAt"] = {}
+            if date_from:
+                query["createdAt"]["$gte"] = date_from
+            if date_to:
+                query["createdAt"]["$lte"] = date_to
+        
+        # batch_size limita quantos documentos o driver mantém por ida ao servidor
+        cursor = collection.find(query).sort("createdAt", 1).batch_size(batch_size)
+        
+        batch: List[Dict[str, Any]] = []
+        try:
+            async for document in cursor:
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            
+            if batch:
+                yield batch
+        finally:
+            await cursor.close()
     
     async def update_cover_letter(self, cover_letter_id: str, updates: Dict[str, Any]) -> bool:
         """Atualizar carta"""
@@ -232,7 +689,7 @@ class CoverLetterMongoRepository(MongoRepository):
             
             result = await collection.update_one(
                 {"coverLetterId": cover_letter_id},
-                {"$set": updates}
+                {"$set": {**updates, **self.summary_updates(updates)}}
             )
             
             return result.modified_count > 0
@@ -257,6 +714,9 @@ class CoverLetterMongoRepository(MongoRepository):
 class UserPreferencesMongoRepository(MongoRepository):
     """Repositório MongoDB para preferências do usuário"""
     
+    INDEXES = [IndexModel([("userId", ASCENDING)], name="userId_unique", unique=True)]
+    QUERY_SHAPES = [QueryShape("by_user_id", {"userId": _SAMPLE_ID})]
+    
     def __init__(self):
         super().__init__()
         self.collection_name = "user_preferences"
@@ -312,6 +772,15 @@ class UserPreferencesMongoRepository(MongoRepository):
 class ActivityLogMongoRepository(MongoRepository):
     """Repositório MongoDB para logs de atividade"""
     
+    INDEXES = [
+        IndexModel([("userId", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+                   name="userId_timestamp_id")
+    ]
+    QUERY_SHAPES = [
+        QueryShape("statistics_match", {"userId": _SAMPLE_ID, "timestamp": {"$gte": _SAMPLE_DATE}}),
+        *_keyset_page_shapes("user_activities", "timestamp")
+    ]
+    
     def __init__(self):
         super().__init__()
         self.collection_name = "activity_logs"
@@ -329,21 +798,45 @@ class ActivityLogMongoRepository(MongoRepository):
         except PyMongoError as e:
             logger.error(f"Error logging activity: {e}")
             raise
-    
+
+    async def log_activities(self, activities: List[Dict[str, Any]]) -> int:
+        """Registrar atividades em lote (retorna quantidade gravada)"""
+        if not activities:
+            return 0
+
+        try:
+            collection = self.get_collection(self.collection_name)
+
+            # ordered=False: um documento inválido não impede a gravação dos demais
+            result = await collection.insert_many(activities, ordered=False)
+            return len(result.inserted_ids)
+
+        except BulkWriteError as e:
+            inserted = e.details.get("nInserted", 0)
+            logger.error(f"Error logging activities batch ({len(activities) - inserted} lost): {e}")
+            return inserted
+
+        except PyMongoError as e:
+            logger.error(f"Error logging activities batch: {e}")
+            raise
+
     async def get_user_activities(self, user_id: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Buscar atividades do usuário"""
+        page = await self.get_user_activities_page(user_id, limit)
+        return page.items
+    
+    async def get_user_activities_page(self, user_id: str, limit: int = 100, cursor: Optional[str] = None,
+                                       include_total: bool = False) -> CursorPage[Dict[str, Any]]:
+        """Buscar atividades do usuário (paginado por cursor)"""
         try:
-            collection = self.get_collection(self.collection_name)
-            
-            cursor = collection.find(
-                {"userId": user_id}
-            ).sort("timestamp", -1).limit(limit)
-            
-            return await cursor.to_list(length=limit)
+            return await self.find_page(
+                self.collection_name, {"userId": user_id}, "timestamp",
+                limit, cursor, include_total
+            )
             
         except PyMongoError as e:
             logger.error(f"Error getting user activities: {e}")
-            return []
+            return CursorPage()
     
     async def get_activity_statistics(self, user_id: str, days: int = 30) -> Dict[str, Any]:
         """Obter estatísticas de atividade"""
@@ -351,7 +844,7 @@ class ActivityLogMongoRepository(MongoRepository):
             collection = self.get_collection(self.collection_name)
             
             start_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-            start_date = start_date.replace(day=start_date.day - days)
+            start_date = start_date - timedelta(days=days)
             
             pipeline = [
                 {"$match": {
@@ -385,9 +878,188 @@ class ActivityLogMongoRepository(MongoRepository):
             return {}
 
 
+class UserStatisticsMongoRepository(MongoRepository):
+    """Repositório MongoDB para estatísticas pré-calculadas por usuário"""
+    
+    INDEXES = [IndexModel([("userId", ASCENDING)], name="userId_unique", unique=True)]
+    QUERY_SHAPES = [QueryShape("by_user_id", {"userId": _SAMPLE_ID})]
+    
+    def __init__(self):
+        super().__init__()
+        self.collection_name = "user_statistics"
+    
+    async def get_user_statistics(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Buscar estatísticas do usuário (leitura única por chave)"""
+        try:
+            collection = self.get_collection(self.collection_name)
+            
+            return await collection.find_one({"userId": user_id}, {"_id": 0})
+            
+        except PyMongoError as e:
+            logger.error(f"Error getting user statistics: {e}")
+            return None
+    
+    async def get_statistics_version(self, user_id: str) -> Optional[datetime]:
+        """updatedAt das estatísticas: muda a cada evento do usuário, em qualquer processo"""
+        try:
+            collection = self.get_collection(self.collection_name)
+            
+            document = await collection.find_one({"userId": user_id}, {"_id": 0, "updatedAt": 1})
+            return document.get("updatedAt") if document else None
+            
+        except PyMongoError as e:
+            logger.error(f"Error getting user statistics version: {e}")
+            return None
+    
+    async def touch_statistics(self, user_id: str) -> bool:
+        """Avançar updatedAt sem alterar contadores (invalida caches dos outros processos)"""
+        try:
+            collection = self.get_collection(self.collection_name)
+            
+            result = await collection.update_one({"userId": user_id}, {"$set": {"updatedAt": datetime.utcnow()}})
+            return result.modified_count > 0
+            
+        except PyMongoError as e:
+            logger.error(f"Error touching user statistics: {e}")
+            return False
+    
+    async def increment_statistics(self, user_id: str, increments: Dict[str, Any],
+                                   maximums: Optional[Dict[str, Any]] = None,
+                                   minimums: Optional[Dict[str, Any]] = None) -> Optional[bool]:
+        """Atualizar contadores de forma atômica ($inc/$max/$min).
+        Só altera documentos reconstruídos (com rebuiltAt): retorna None quando o usuário ainda não
+        tem estatísticas, para o serviço reconstruir em vez de criar um documento parcial"""
+        try:
+            collection = self.get_collection(self.collection_name)
+            
+            update: Dict[str, Any] = {
+                "$inc": increments,
+                "$set": {"updatedAt": datetime.utcnow()}
+            }
+            if maximums:
+                update["$max"] = maximums
+            if minimums:
+                update["$min"] = minimums
+            
+            previous = await collection.find_one_and_update(
+                {"userId": user_id, "rebuiltAt": {"$exists": True}},
+                update,
+                projection={"_id": 0, "dailyPrunedOn": 1},
+                return_document=ReturnDocument.BEFORE
+            )
+            if previous is None:
+                return None
+            
+            # Buckets diários antigos saem na primeira escrita do dia
+            today = datetime.utcnow().strftime("%Y-%m-%d")
+            if previous.get("dailyPrunedOn") != today:
+                await self.prune_statistics(user_id, today)
+            return True
+            
+        except PyMongoError as e:
+            logger.error(f"Error incrementing user statistics: {e}")
+            return False
+    
+    async def prune_statistics(self, user_id: str, today: str) -> bool:
+        """Remover buckets diários fora das janelas (daily e activity.*.daily), uma vez por dia"""
+        now = datetime.utcnow()
+        daily_since = (now - timedelta(days=db_settings.STATS_DAILY_RETENTION_DAYS)).strftime("%Y-%m-%d")
+        activity_since = (now - timedelta(days=db_settings.STATS_ACTIVITY_WINDOW_DAYS)).strftime("%Y-%m-%d")
+        
+        def recent(buckets: str, since: str) -> Dict[str, Any]:
+            return {"$arrayToObject": {"$filter": {
+                "input": {"$objectToArray": {"$ifNull": [buckets, {}]}},
+                "as": "bucket",
+                "cond": {"$gte": ["$$bucket.k", since]}
+            }}}
+        
+        try:
+            collection = self.get_collection(self.collection_name)
+            
+            result = await collection.update_one(
+                {"userId": user_id, "dailyPrunedOn": {"$ne": today}},
+                [{"$set": {
+                    "daily": recent("$daily", daily_since),
+                    "activity": {"$arrayToObject": {"$map": {
+                        "input": {"$objectToArray": {"$ifNull": ["$activity", {}]}},
+                        "as": "action",
+                        "in": {
+                            "k": "$$action.k",
+                            "v": {"$mergeObjects": [
+                                "$$action.v",
+                                {"daily": recent("$$action.v.daily", activity_since)}
+                            ]}
+                        }
+                    }}},
+                    "dailyPrunedOn": today
+                }}]
+            )
+            return result.modified_count > 0
+            
+        except PyMongoError as e:
+            logger.error(f"Error pruning user statistics: {e}")
+            return False
+    
+    async def apply_activity_counts(self, counts: Dict[tuple, int]) -> bool:
+        """Somar contadores de atividade agregados por (usuário, ação, dia).
+        Usuários sem estatísticas reconstruídas são ignorados (a reconstrução lê os logs)"""
+        if not counts:
+            return True
+        
+        try:
+            collection = self.get_collection(self.collection_name)
+            
+            increments_by_user: Dict[str, Dict[str, int]] = {}
+            for (user_id, action, day), count in counts.items():
+                increments = increments_by_user.setdefault(user_id, {})
+                increments[f"activity.{action}.total"] = increments.get(f"activity.{action}.total", 0) + count
+                increments[f"activity.{action}.daily.{day}"] = count
+            
+            now = datetime.utcnow()
+            operations = [
+                UpdateOne(
+                    {"userId": user_id, "rebuiltAt": {"$exists": True}},
+                    {"$inc": increments, "$set": {"updatedAt": now}}
+                )
+                for user_id, increments in increments_by_user.items()
+            ]
+            
+            await collection.bulk_write(operations, ordered=False)
+            return True
+            
+        except PyMongoError as e:
+            logger.error(f"Error applying activity counts: {e}")
+            return False
+    
+    async def replace_user_statistics(self, user_id: str, statistics: Dict[str, Any]) -> bool:
+        """Substituir estatísticas do usuário (usado na reconstrução)"""
+        try:
+            collection = self.get_collection(self.collection_name)
+            
+            statistics["userId"] = user_id
+            statistics["updatedAt"] = datetime.utcnow()
+            
+            result = await collection.replace_one({"userId": user_id}, statistics, upsert=True)
+            return result.modified_count > 0 or result.upserted_id is not None
+            
+        except PyMongoError as e:
+            logger.error(f"Error replacing user statistics: {e}")
+            return False
+
+
 class AIAnalysisCacheRepository(MongoRepository):
     """Repositório MongoDB para cache de análises de IA"""
     
+    INDEXES = [
+        IndexModel([("cacheKey", ASCENDING)], name="cacheKey_unique", unique=True),
+        # TTL: o servidor remove entradas vencidas; cleanup_expired_cache usa o mesmo índice
+        IndexModel([("expiresAt", ASCENDING)], name="expiresAt_ttl", expireAfterSeconds=0)
+    ]
+    QUERY_SHAPES = [
+        QueryShape("by_cache_key", {"cacheKey": _SAMPLE_ID, "expiresAt": {"$gt": _SAMPLE_DATE}}),
+        QueryShape("expired", {"expiresAt": {"$lt": _SAMPLE_DATE}})
+    ]
+    
     def __init__(self):
         super().__init__()
         self.collection_name = "ai_analysis_cache"
@@ -425,9 +1097,7 @@ class AIAnalysisCacheRepository(MongoRepository):
         try:
             collection = self.get_collection(self.collection_name)
             
-            expires_at = datetime.utcnow().replace(
-                hour=datetime.utcnow().hour + ttl_hours
-            )
+            expires_at = datetime.utcnow() + timedelta(hours=ttl_hours)
             
             cache_entry = {
                 "cacheKey": cache_key,
@@ -470,6 +1140,12 @@ class AIAnalysisCacheRepository(MongoRepository):
 class FeedbackMongoRepository(MongoRepository):
     """Repositório MongoDB para feedback dos usuários"""
     
+    INDEXES = [
+        IndexModel([("userId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)],
+                   name="userId_createdAt_id")
+    ]
+    QUERY_SHAPES = _keyset_page_shapes("user_feedback", "createdAt")
+    
     def __init__(self):
         super().__init__()
         self.collection_name = "user_feedback"
@@ -492,18 +1168,21 @@ class FeedbackMongoRepository(MongoRepository):
     
     async def get_user_feedback(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Buscar feedback do usuário"""
+        page = await self.get_user_feedback_page(user_id, limit)
+        return page.items
+    
+    async def get_user_feedback_page(self, user_id: str, limit: int = 50, cursor: Optional[str] = None,
+                                     include_total: bool = False) -> CursorPage[Dict[str, Any]]:
+        """Buscar feedback do usuário (paginado por cursor)"""
         try:
-            collection = self.get_collection(self.collection_name)
-            
-            cursor = collection.find(
-                {"userId": user_id}
-            ).sort("createdAt", -1).limit(limit)
-            
-            return await cursor.to_list(length=limit)
+            return await self.find_page(
+                self.collection_name, {"userId": user_id}, "createdAt",
+                limit, cursor, include_total
+            )
             
         except PyMongoError as e:
             logger.error(f"Error getting user feedback: {e}")
-            return []
+            return CursorPage()
     
     async def update_feedback_status(self, feedback_id: str, status: str, 
                                    resolution: Optional[str] = None) -> bool:
@@ -532,3 +1211,90 @@ class FeedbackMongoRepository(MongoRepository):
         except PyMongoError as e:
             logger.error(f"Error updating feedback status: {e}")
             return False
+
+
+# Repositórios com índices declarados (ordem de aplicação no startup)
+INDEXED_REPOSITORIES = (
+    AnalysisMongoRepository, AnalysisPayloadRepository, CoverLetterMongoRepository, UserPreferencesMongoRepository,
+    ActivityLogMongoRepository, UserStatisticsMongoRepository, AIAnalysisCacheRepository,
+    FeedbackMongoRepository
+)
+
+
+async def ensure_mongo_indexes() -> Dict[str, List[str]]:
+    """Aplicar os índices declarados em todas as coleções (idempotente)"""
+    results = {}
+    for repository_class in INDEXED_REPOSITORIES:
+        repository = repository_class()
+        try:
+            results[repository.collection_name] = await repository.ensure_indexes()
+        except PyMongoError as e:
+            logger.error(f"Error ensuring indexes on {repository.collection_name}: {e}")
+        finally:
+            await repository.disconnect()
+    
+    created = sum(len(names) for names in results.values())
+    logger.info(f"Mongo indexes ensured on {len(results)} collections ({created} specs applied)")
+    return results
+
+
+async def backfill_mongo_summaries() -> Dict[str, int]:
+    """Gravar o resumo de listagem nos documentos antigos (manutenção; pode rodar várias vezes)"""
+    results = {}
+    for repository_class in INDEXED_REPOSITORIES:
+        if not repository_class.SUMMARY_FIELDS:
+            continue
+        repository = repository_class()
+        try:
+            results[repository.collection_name] = await repository.backfill_summaries()
+        finally:
+            await repository.disconnect()
+    
+    logger.info(f"Mongo list summaries backfilled: {results}")
+    return results
+
+
+async def audit_query_shapes(strict: bool = False) -> Dict[str, Dict[str, List[str]]]:
+    """Rodar explain() em cada forma de consulta e apontar as que varrem a coleção
+
+    strict=True levanta QueryShapeAuditError (modo desenvolvimento/testes).
+    """
+    plans = {}
+    for repository_class in INDEXED_REPOSITORIES:
+        repository = repository_class()
+        try:
+            plans[repository.collection_name] = await repository.explain_query_shapes()
+        finally:
+            await repository.disconnect()
+
+    collscans = [
+        f"{collection}.{shape}"
+        for collection, shapes in plans.items()
+        for shape, stages in shapes.items()
+        if "COLLSCAN" in stages
+    ]
+    if collscans:
+        message = f"Mongo query shapes without index (COLLSCAN): {', '.join(collscans)}"
+        if strict:
+            raise QueryShapeAuditError(message)
+        logger.warning(message)
+
+    return plans
+
+
+if __name__ == "__main__":
+    # Manutenção: python -m data.mongo_repository {indexes|backfill-summaries|audit}
+    import argparse
+    import asyncio
+
+    tasks = {
+        "indexes": ensure_mongo_indexes,
+        "backfill-summaries": backfill_mongo_summaries,
+        "audit": audit_query_shapes
+    }
+    parser = argparse.ArgumentParser(description="Manutenção das coleções do MongoDB")
+    parser.add_argument("task", choices=tasks)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(tasks[args.task]())
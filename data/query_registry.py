@@ -0,0 +1,119 @@
+"""
+Registro de queries SQL
+Cada statement quente é registrado uma única vez (na importação do repositório) como
+text() já parseado, com ID estável e contadores de execução para o endpoint de métricas
+"""
+from typing import Callable, Dict, Hashable, Iterator, Tuple
+from contextlib import contextmanager
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+
+class RegisteredQuery:
+    """Statement registrado: o mesmo TextClause (e o mesmo SQL) a cada execução"""
+    __slots__ = ("query_id", "statement")
+
+    def __init__(self, query_id: str, sql: str):
+        self.query_id = query_id
+        self.statement: TextClause = text(sql)
+
+    @property
+    def sql(self) -> str:
+        return self.statement.text
+
+    def __repr__(self) -> str:
+        return f"RegisteredQuery({self.query_id!r})"
+
+
+class QueryStats:
+    """Contadores de um query ID"""
+    __slots__ = ("calls", "errors", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3)
+        }
+
+
+class QueryRegistry:
+    """Queries registradas por ID, variantes compiladas e contadores"""
+
+    def __init__(self):
+        self._queries: Dict[str, RegisteredQuery] = {}
+        self._variants: Dict[Tuple[str, Hashable], RegisteredQuery] = {}
+        self._stats: Dict[str, QueryStats] = {}
+        # Os repositórios executam em threads (asyncio.to_thread)
+        self._lock = threading.Lock()
+
+    def register(self, query_id: str, sql: str) -> RegisteredQuery:
+        """Registrar statement; IDs são únicos"""
+        with self._lock:
+            if query_id in self._queries:
+                raise ValueError(f"Query '{query_id}' already registered")
+            query = self._queries[query_id] = RegisteredQuery(query_id, sql)
+            self._stats[query_id] = QueryStats()
+            return query
+
+    def get(self, query_id: str) -> RegisteredQuery:
+        return self._queries[query_id]
+
+    def variant(self, query_id: str, key: Hashable, build: Callable[[], str]) -> RegisteredQuery:
+        """Statement dinâmico compilado uma vez por chave (ex.: conjunto de colunas do SET)
+
+        As variantes compartilham os contadores do query ID.
+        """
+        cache_key = (query_id, key)
+        query = self._variants.get(cache_key)
+        if query is not None:
+            return query
+
+        with self._lock:
+            query = self._variants.get(cache_key)
+            if query is None:
+                query = self._variants[cache_key] = RegisteredQuery(query_id, build())
+                self._stats.setdefault(query_id, QueryStats())
+            return query
+
+    @contextmanager
+    def track(self, query: RegisteredQuery) -> Iterator[None]:
+        """Contabilizar uma execução (tempo e erro) no ID da query"""
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._lock:
+                stats = self._stats[query.query_id]
+                stats.calls += 1
+                stats.errors += failed
+                stats.total_ms += elapsed
+                stats.max_ms = max(stats.max_ms, elapsed)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Contadores por query ID (para o endpoint de métricas)"""
+        with self._lock:
+            return {query_id: stats.as_dict() for query_id, stats in sorted(self._stats.items())}
+
+    def __len__(self) -> int:
+        return len(self._queries) + len(self._variants)
+
+
+# Instância global
+query_registry = QueryRegistry()
@@ -0,0 +1,83 @@
+"""
+Fábricas de linhas SQL
+Constroem entidades direto da tupla retornada pelo driver: as posições das colunas são
+resolvidas uma única vez por resultado, sem dict intermediário por linha
+"""
+from typing import Any, Callable, Dict, Sequence, Tuple
+from uuid import UUID
+
+from domain.entities.domain import CompatibilityAnalysis, Resume, AnalysisStatus, ResumeStatus
+
+# Recebe os nomes das colunas do resultado e devolve o construtor de cada linha
+RowFactory = Callable[[Sequence[str]], Callable[[Sequence[Any]], Any]]
+
+# Lookup direto (mais barato que chamar o Enum por valor a cada linha)
+_ANALYSIS_STATUS: Dict[str, AnalysisStatus] = {status.value: status for status in AnalysisStatus}
+_RESUME_STATUS: Dict[str, ResumeStatus] = {status.value: status for status in ResumeStatus}
+
+
+def column_positions(columns: Sequence[str], *names: str) -> Tuple[int, ...]:
+    """Posição de cada coluna no resultado (KeyError se a query não a selecionou)"""
+    positions = {column: index for index, column in enumerate(columns)}
+    return tuple(positions[name] for name in names)
+
+
+def _uuid(value: Any) -> Any:
+    if value is None or isinstance(value, UUID):
+        return value
+    return UUID(str(value))
+
+
+def analysis_row_factory(columns: Sequence[str]) -> Callable[[Sequence[Any]], CompatibilityAnalysis]:
+    """Linha de CompatibilityAnalyses -> CompatibilityAnalysis"""
+    (analysis_id, user_id, resume_id, job_id, match_score, status, analysis_type,
+     processing_time_ms, created_at, completed_at, mongo_analysis_id) = column_positions(
+        columns, "AnalysisId", "UserId", "ResumeId", "JobId", "MatchScore", "Status", "AnalysisType",
+        "ProcessingTimeMs", "CreatedAt", "CompletedAt", "MongoAnalysisId"
+    )
+
+    def build(row: Sequence[Any]) -> CompatibilityAnalysis:
+        return CompatibilityAnalysis(
+            analysis_id=_uuid(row[analysis_id]),
+            user_id=_uuid(row[user_id]),
+            resume_id=_uuid(row[resume_id]),
+            job_id=_uuid(row[job_id]),
+            match_score=row[match_score],
+            status=_ANALYSIS_STATUS[row[status]],
+            analysis_type=row[analysis_type],
+            processing_time_ms=row[processing_time_ms],
+            created_at=row[created_at],
+            completed_at=row[completed_at],
+            mongo_analysis_id=row[mongo_analysis_id]
+        )
+
+    return build
+
+
+def resume_row_factory(columns: Sequence[str]) -> Callable[[Sequence[Any]], Resume]:
+    """Linha de Resumes -> Resume"""
+    (resume_id, user_id, title, version, status, data_lake_file_id, original_filename, file_size,
+     file_type, created_at, updated_at, last_analyzed_at, analysis_count, average_match_score) = column_positions(
+        columns, "ResumeId", "UserId", "Title", "Version", "Status", "DataLakeFileId", "OriginalFileName",
+        "FileSize", "FileType", "CreatedAt", "UpdatedAt", "LastAnalyzedAt", "AnalysisCount", "AverageMatchScore"
+    )
+
+    def build(row: Sequence[Any]) -> Resume:
+        return Resume(
+            resume_id=_uuid(row[resume_id]),
+            user_id=_uuid(row[user_id]),
+            title=row[title],
+            version=row[version],
+            status=_RESUME_STATUS[row[status]],
+            data_lake_file_id=_uuid(row[data_lake_file_id]),
+            original_filename=row[original_filename],
+            file_size=row[file_size],
+            file_type=row[file_type],
+            created_at=row[created_at],
+            updated_at=row[updated_at],
+            last_analyzed_at=row[last_analyzed_at],
+            analysis_count=row[analysis_count],
+            average_match_score=row[average_match_score]
+        )
+
+    return build
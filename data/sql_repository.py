@@ -2,56 +2,224 @@
 Repositório SQL Server
 Camada de acesso a dados para SQL Server
 """
-from typing import List, Optional, Dict, Any
+from typing import (
+    TYPE_CHECKING, List, Optional, Dict, Any, Tuple, Iterator, AsyncIterator, Sequence, Union, Callable
+)
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy import create_engine, text, and_, or_, desc, asc
+from sqlalchemy import text, and_, or_, desc, asc
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql.elements import TextClause
+from contextlib import nullcontext
+import asyncio
 import logging
 
 from core.config import settings
+from utils.pagination import CursorPage, encode_cursor, decode_cursor
 from domain.entities.domain import (
     User, Resume, Company, JobDescription, CompatibilityAnalysis,
     CoverLetter, Skill, UserSkill, Notification, UserSession, DataLakeFile
 )
+from data.row_factories import RowFactory, analysis_row_factory, resume_row_factory
+from data.query_registry import RegisteredQuery, query_registry
+from data.sql_router import SQLEngineRouter, get_engine_router
+
+if TYPE_CHECKING:
+    # NumPy só é carregado no caminho analítico (get_user_analyses_batch)
+    from domain.entities.analysis_batch import AnalysisBatch
 
 logger = logging.getLogger(__name__)
 
+# SQL Server aceita até 2100 parâmetros por comando
+MAX_STATEMENT_PARAMS = 2000
+
+
+def expand_in(name: str, values: Sequence[Any]) -> Tuple[str, Dict[str, Any]]:
+    """Placeholders de um IN (...) com um parâmetro por valor: (":ids_0, :ids_1", params)"""
+    params = {f"{name}_{i}": value for i, value in enumerate(values)}
+    return ", ".join(f":{key}" for key in params), params
+
+
+# SQL cru ou statement do registro (parseado uma vez e contabilizado nas métricas)
+Query = Union[str, RegisteredQuery]
+
+
+def _statement(query: Query) -> TextClause:
+    return query.statement if isinstance(query, RegisteredQuery) else text(query)
+
+
+def _tracked(query: Query):
+    return query_registry.track(query) if isinstance(query, RegisteredQuery) else nullcontext()
+
 
 class SQLRepository:
-    """Repositório base para SQL Server"""
-    
-    def __init__(self):
-        self.engine = create_engine(
-            settings.sql_connection_string,
-            pool_size=10,
-            max_overflow=20,
-            pool_timeout=30,
-            pool_recycle=3600,
-            echo=settings.DEBUG
-        )
+    """Repositório base para SQL Server
+    
+    Escritas e leituras pontuais usam o primário. Leituras marcadas com read_replica=True
+    vão para uma réplica via roteador (exceto logo após uma escrita do mesmo usuário).
+    """
+    
+    # Sem roteador (repositório montado sobre um engine avulso), tudo vai para self.engine
+    router: Optional[SQLEngineRouter] = None
+    
+    def __init__(self, router: Optional[SQLEngineRouter] = None):
+        # Engines compartilhados entre os repositórios (um pool por servidor)
+        self.router = router or get_engine_router()
+        self.engine = self.router.primary
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
     
     def get_session(self) -> Session:
         """Obter sessão do banco"""
         return self.SessionLocal()
     
-    def execute_query(self, query: str, params: Dict[str, Any] = None) -> List[Dict]:
+    def mark_write(self, user_id: Any) -> None:
+        """Manter as leituras do usuário no primário pela janela de read-your-writes"""
+        if self.router is not None:
+            self.router.mark_write(user_id)
+    
+    def _read(self, work: Callable[[Any], Any], read_replica: bool, user_id: Any) -> Any:
+        """Executar leitura numa réplica (via roteador) ou numa sessão do primário"""
+        if read_replica and self.router is not None:
+            return self.router.run_read(work, user_id)
+        with self.get_session() as session:
+            return work(session)
+    
+    def execute_query(self, query: Query, params: Dict[str, Any] = None, *,
+                      read_replica: bool = False, user_id: Any = None) -> List[Dict]:
         """Executar query SQL raw"""
+        statement = _statement(query)
+        
+        def work(executor) -> List[Dict]:
+            return [dict(row._mapping) for row in executor.execute(statement, params or {})]
+        
         try:
-            with self.get_session() as session:
-                result = session.execute(text(query), params or {})
-                return [dict(row._mapping) for row in result]
+            with _tracked(query):
+                return self._read(work, read_replica, user_id)
         except SQLAlchemyError as e:
             logger.error(f"SQL query error: {e}")
             raise
     
-    def execute_scalar(self, query: str, params: Dict[str, Any] = None) -> Any:
+    async def execute_query_async(self, query: Query, params: Dict[str, Any] = None, *,
+                                  read_replica: bool = False, user_id: Any = None) -> List[Dict]:
+        """Executar query SQL raw em thread, sem bloquear o event loop"""
+        return await asyncio.to_thread(
+            self.execute_query, query, params, read_replica=read_replica, user_id=user_id
+        )
+    
+    def execute_rows(self, query: Query, params: Dict[str, Any] = None,
+                     row_factory: Optional[RowFactory] = None, *,
+                     read_replica: bool = False, user_id: Any = None) -> List[Any]:
+        """Executar query sem copiar cada linha para um dict
+        
+        Com row_factory, constrói os objetos direto das tuplas do driver; sem ela, devolve
+        RowMapping (acesso por nome de coluna sobre a própria linha).
+        """
+        statement = _statement(query)
+        
+        def work(executor) -> List[Any]:
+            result = executor.execute(statement, params or {})
+            if row_factory is None:
+                return result.mappings().all()
+            build = row_factory(tuple(result.keys()))
+            return [build(row) for row in result]
+        
+        try:
+            with _tracked(query):
+                return self._read(work, read_replica, user_id)
+        except SQLAlchemyError as e:
+            logger.error(f"SQL query error: {e}")
+            raise
+    
+    async def execute_rows_async(self, query: Query, params: Dict[str, Any] = None,
+                                 row_factory: Optional[RowFactory] = None, *,
+                                 read_replica: bool = False, user_id: Any = None) -> List[Any]:
+        """Versão assíncrona de execute_rows (em thread)"""
+        return await asyncio.to_thread(
+            self.execute_rows, query, params, row_factory, read_replica=read_replica, user_id=user_id
+        )
+    
+    def stream_rows(self, query: Query, params: Dict[str, Any] = None,
+                    row_factory: Optional[RowFactory] = None, batch_size: int = 1000, *,
+                    read_replica: bool = False, user_id: Any = None) -> Iterator[List[Any]]:
+        """Percorrer o resultado em lotes via cursor no servidor (yield_per)
+        
+        Nunca mantém o resultado inteiro em memória; cada lote vem como objetos da
+        row_factory ou, sem ela, como RowMapping.
+        """
+        if read_replica and self.router is not None:
+            connection_scope = self.router.read_connection(user_id)
+        else:
+            connection_scope = self.engine.connect()
+        
+        try:
+            with connection_scope as connection:
+                result = connection.execution_options(
+                    stream_results=True, yield_per=batch_size
+                ).execute(_statement(query), params or {})
+                
+                if row_factory is None:
+                    yield from result.mappings().partitions(batch_size)
+                    return
+                
+                build = row_factory(tuple(result.keys()))
+                for partition in result.partitions(batch_size):
+                    yield [build(row) for row in partition]
+        except SQLAlchemyError as e:
+            logger.error(f"SQL stream query error: {e}")
+            raise
+    
+    async def stream_rows_async(self, query: Query, params: Dict[str, Any] = None,
+                                row_factory: Optional[RowFactory] = None,
+                                batch_size: int = 1000, *, read_replica: bool = False,
+                                user_id: Any = None) -> AsyncIterator[List[Any]]:
+        """Versão assíncrona de stream_rows: cada lote é buscado em thread"""
+        batches = self.stream_rows(
+            query, params, row_factory, batch_size, read_replica=read_replica, user_id=user_id
+        )
+        try:
+            while True:
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            # Fecha cursor e conexão também quando o consumidor desiste no meio
+            await asyncio.to_thread(batches.close)
+    
+    def execute_many(self, query: Query, params_list: Sequence[Dict[str, Any]]) -> int:
+        """Executar o mesmo comando para vários conjuntos de parâmetros (executemany)
+        
+        Todos os itens vão numa única transação: ou entram todos, ou nenhum.
+        """
+        if not params_list:
+            return 0
+        
+        try:
+            with _tracked(query), self.get_session() as session:
+                session.execute(_statement(query), list(params_list))
+                session.commit()
+                return len(params_list)
+        except SQLAlchemyError as e:
+            logger.error(f"SQL executemany error: {e}")
+            raise
+    
+    def execute_command(self, query: Query, params: Dict[str, Any] = None) -> int:
+        """Executar INSERT/UPDATE/DELETE com commit; retorna as linhas afetadas"""
+        try:
+            with _tracked(query), self.get_session() as session:
+                result = session.execute(_statement(query), params or {})
+                session.commit()
+                return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"SQL command error: {e}")
+            raise
+    
+    def execute_scalar(self, query: Query, params: Dict[str, Any] = None) -> Any:
         """Executar query que retorna valor único"""
         try:
-            with self.get_session() as session:
-                result = session.execute(text(query), params or {})
+            with _tracked(query), self.get_session() as session:
+                result = session.execute(_statement(query), params or {})
                 return result.scalar()
         except SQLAlchemyError as e:
             logger.error(f"SQL scalar query error: {e}")
@@ -81,54 +249,46 @@ class UserRepository(SQLRepository):
         user.user_id = result
         return user
     
-    async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
-        """Buscar usuário por ID"""
-        query = """
+    _USER_COLUMNS = """
         SELECT UserId, Email, PasswordHash, FullName, Phone, AvatarUrl,
                SubscriptionType, CreatedAt, UpdatedAt, LastLoginAt,
                IsActive, EmailVerified, TwoFactorEnabled
-        FROM Users 
-        WHERE UserId = :user_id AND IsActive = 1
-        """
-        
-        result = self.execute_query(query, {"user_id": str(user_id)})
-        if not result:
-            return None
-        
-        row = result[0]
-        return User(
-            user_id=UUID(row["UserId"]),
-            email=row["Email"],
-            password_hash=row["PasswordHash"],
-            full_name=row["FullName"],
-            phone=row["Phone"],
-            avatar_url=row["AvatarUrl"],
-            subscription_type=row["SubscriptionType"],
-            created_at=row["CreatedAt"],
-            updated_at=row["UpdatedAt"],
-            last_login_at=row["LastLoginAt"],
-            is_active=row["IsActive"],
-            email_verified=row["EmailVerified"],
-            two_factor_enabled=row["TwoFactorEnabled"]
-        )
+        FROM Users
+    """
+    GET_BY_ID = query_registry.register(
+        "users.get_by_id", _USER_COLUMNS + "WHERE UserId = :user_id AND IsActive = 1"
+    )
+    GET_BY_EMAIL = query_registry.register(
+        "users.get_by_email", _USER_COLUMNS + "WHERE Email = :email AND IsActive = 1"
+    )
+    UPDATE_LAST_LOGIN = query_registry.register("users.update_last_login", """
+        UPDATE Users 
+        SET LastLoginAt = GETUTCDATE()
+        WHERE UserId = :user_id
+    """)
+    
+    # Campos atualizáveis por update_user -> coluna
+    UPDATABLE_COLUMNS = {
+        "full_name": "FullName",
+        "phone": "Phone",
+        "avatar_url": "AvatarUrl",
+        "subscription_type": "SubscriptionType"
+    }
+    
+    async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
+        """Buscar usuário por ID"""
+        result = self.execute_rows(self.GET_BY_ID, {"user_id": str(user_id)})
+        return self._row_to_user(result[0]) if result else None
     
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Buscar usuário por email"""
-        query = """
-        SELECT UserId, Email, PasswordHash, FullName, Phone, AvatarUrl,
-               SubscriptionType, CreatedAt, UpdatedAt, LastLoginAt,
-               IsActive, EmailVerified, TwoFactorEnabled
-        FROM Users 
-        WHERE Email = :email AND IsActive = 1
-        """
-        
-        result = self.execute_query(query, {"email": email})
-        if not result:
-            return None
-        
-        row = result[0]
+        result = self.execute_rows(self.GET_BY_EMAIL, {"email": email})
+        return self._row_to_user(result[0]) if result else None
+    
+    @staticmethod
+    def _row_to_user(row) -> User:
         return User(
-            user_id=UUID(row["UserId"]),
+            user_id=UUID(str(row["UserId"])),
             email=row["Email"],
             password_hash=row["PasswordHash"],
             full_name=row["FullName"],
@@ -143,49 +303,39 @@ class UserRepository(SQLRepository):
             two_factor_enabled=row["TwoFactorEnabled"]
         )
     
+    def _update_query(self, fields: Tuple[str, ...]) -> RegisteredQuery:
+        """UPDATE compilado uma vez por conjunto de colunas alteradas"""
+        def build() -> str:
+            set_clauses = [f"{self.UPDATABLE_COLUMNS[field]} = :{field}" for field in fields]
+            set_clauses.append("UpdatedAt = GETUTCDATE()")
+            return f"""
+            UPDATE Users 
+            SET {', '.join(set_clauses)}
+            WHERE UserId = :user_id
+            """
+        
+        return query_registry.variant("users.update", fields, build)
+    
     async def update_user(self, user_id: UUID, updates: Dict[str, Any]) -> bool:
         """Atualizar usuário"""
-        set_clauses = []
-        params = {"user_id": str(user_id)}
-        
-        for key, value in updates.items():
-            if key in ["full_name", "phone", "avatar_url", "subscription_type"]:
-                set_clauses.append(f"{key.title().replace('_', '')} = :{key}")
-                params[key] = value
-        
-        if not set_clauses:
+        # Ordem canônica: o mesmo conjunto de campos sempre gera o mesmo SQL
+        fields = tuple(field for field in self.UPDATABLE_COLUMNS if field in updates)
+        if not fields:
             return False
         
-        set_clauses.append("UpdatedAt = GETUTCDATE()")
-        
-        query = f"""
-        UPDATE Users 
-        SET {', '.join(set_clauses)}
-        WHERE UserId = :user_id
-        """
+        params = {field: updates[field] for field in fields}
+        params["user_id"] = str(user_id)
         
         try:
-            with self.get_session() as session:
-                result = session.execute(text(query), params)
-                session.commit()
-                return result.rowcount > 0
+            return self.execute_command(self._update_query(fields), params) > 0
         except SQLAlchemyError as e:
             logger.error(f"Error updating user: {e}")
             return False
     
     async def update_last_login(self, user_id: UUID) -> bool:
         """Atualizar último login"""
-        query = """
-        UPDATE Users 
-        SET LastLoginAt = GETUTCDATE()
-        WHERE UserId = :user_id
-        """
-        
         try:
-            with self.get_session() as session:
-                result = session.execute(text(query), {"user_id": str(user_id)})
-                session.commit()
-                return result.rowcount > 0
+            return self.execute_command(self.UPDATE_LAST_LOGIN, {"user_id": str(user_id)}) > 0
         except SQLAlchemyError as e:
             logger.error(f"Error updating last login: {e}")
             return False
@@ -218,7 +368,8 @@ class ResumeRepository(SQLRepository):
             with self.get_session() as session:
                 session.execute(text(query), params)
                 session.commit()
-                return resume
+            self.mark_write(resume.user_id)
+            return resume
         except SQLAlchemyError as e:
             logger.error(f"Error creating resume: {e}")
             raise
@@ -241,40 +392,39 @@ class ResumeRepository(SQLRepository):
         
         query += " ORDER BY UpdatedAt DESC"
         
-        result = self.execute_query(query, params)
-        
-        resumes = []
-        for row in result:
-            resumes.append(Resume(
-                resume_id=UUID(row["ResumeId"]),
-                user_id=UUID(row["UserId"]),
-                title=row["Title"],
-                version=row["Version"],
-                status=row["Status"],
-                data_lake_file_id=UUID(row["DataLakeFileId"]) if row["DataLakeFileId"] else None,
-                original_filename=row["OriginalFileName"],
-                file_size=row["FileSize"],
-                file_type=row["FileType"],
-                created_at=row["CreatedAt"],
-                updated_at=row["UpdatedAt"],
-                last_analyzed_at=row["LastAnalyzedAt"],
-                analysis_count=row["AnalysisCount"],
-                average_match_score=row["AverageMatchScore"]
-            ))
-        
-        return resumes
+        return await self.execute_rows_async(query, params, resume_row_factory, read_replica=True, user_id=user_id)
     
-    async def get_resume_by_id(self, resume_id: UUID) -> Optional[Resume]:
-        """Buscar currículo por ID"""
+    async def stream_user_resumes(self, user_id: UUID, date_from: Optional[datetime] = None,
+                                  date_to: Optional[datetime] = None,
+                                  batch_size: int = 1000) -> AsyncIterator[List[Resume]]:
+        """Percorrer currículos do usuário em lotes (exportação)"""
         query = """
         SELECT ResumeId, UserId, Title, Version, Status, DataLakeFileId,
                OriginalFileName, FileSize, FileType, CreatedAt, UpdatedAt,
                LastAnalyzedAt, AnalysisCount, AverageMatchScore
         FROM Resumes 
-        WHERE ResumeId = :resume_id
+        WHERE UserId = :user_id
+          AND (:date_from IS NULL OR CreatedAt >= :date_from)
+          AND (:date_to IS NULL OR CreatedAt <= :date_to)
+        ORDER BY CreatedAt
         """
         
-        result = self.execute_query(query, {"resume_id": str(resume_id)})
+        params = {"user_id": str(user_id), "date_from": date_from, "date_to": date_to}
+        
+        async for resumes in self.stream_rows_async(query, params, resume_row_factory, batch_size, read_replica=True, user_id=user_id):
+            yield resumes
+    
+    GET_BY_ID = query_registry.register("resumes.get_by_id", """
+        SELECT ResumeId, UserId, Title, Version, Status, DataLakeFileId,
+               OriginalFileName, FileSize, FileType, CreatedAt, UpdatedAt,
+               LastAnalyzedAt, AnalysisCount, AverageMatchScore
+        FROM Resumes 
+        WHERE ResumeId = :resume_id
+    """)
+    
+    async def get_resume_by_id(self, resume_id: UUID) -> Optional[Resume]:
+        """Buscar currículo por ID"""
+        result = self.execute_rows(self.GET_BY_ID, {"resume_id": str(resume_id)})
         if not result:
             return None
         
@@ -296,7 +446,24 @@ class ResumeRepository(SQLRepository):
             average_match_score=row["AverageMatchScore"]
         )
     
-    async def update_resume_analysis_stats(self, resume_id: UUID, match_score: float) -> bool:
+    async def get_owned_resume_ids(self, user_id: UUID, resume_ids: Sequence[UUID]) -> List[UUID]:
+        """Dos IDs informados, quais currículos pertencem ao usuário (uma única consulta)"""
+        if not resume_ids:
+            return []
+        
+        placeholders, params = expand_in("resume_id", [str(resume_id) for resume_id in resume_ids])
+        query = f"""
+        SELECT ResumeId
+        FROM Resumes
+        WHERE UserId = :user_id AND ResumeId IN ({placeholders})
+        """
+        params["user_id"] = str(user_id)
+        
+        result = await self.execute_query_async(query, params)
+        return [UUID(str(row["ResumeId"])) for row in result]
+    
+    async def update_resume_analysis_stats(self, resume_id: UUID, match_score: float,
+                                           user_id: Optional[UUID] = None) -> bool:
         """Atualizar estatísticas de análise do currículo"""
         query = """
         UPDATE Resumes 
@@ -314,7 +481,8 @@ class ResumeRepository(SQLRepository):
                     "match_score": match_score
                 })
                 session.commit()
-                return result.rowcount > 0
+            self.mark_write(user_id)
+            return result.rowcount > 0
         except SQLAlchemyError as e:
             logger.error(f"Error updating resume stats: {e}")
             return False
@@ -323,16 +491,71 @@ class ResumeRepository(SQLRepository):
 class AnalysisRepository(SQLRepository):
     """Repositório de análises"""
     
-    async def create_analysis(self, analysis: CompatibilityAnalysis) -> CompatibilityAnalysis:
-        """Criar nova análise"""
-        query = """
-        INSERT INTO CompatibilityAnalyses (AnalysisId, UserId, ResumeId, JobId,
-                                         MatchScore, Status, AnalysisType, MongoAnalysisId)
-        VALUES (NEWSEQUENTIALID(), :user_id, :resume_id, :job_id,
-                :match_score, :status, :analysis_type, :mongo_analysis_id)
-        """
-        
-        params = {
+    INSERT_ANALYSIS = query_registry.register("analyses.insert", """
+    INSERT INTO CompatibilityAnalyses (AnalysisId, UserId, ResumeId, JobId,
+                                     MatchScore, Status, AnalysisType, MongoAnalysisId, ClaimedAt)
+    VALUES (:analysis_id, :user_id, :resume_id, :job_id,
+            :match_score, :status, :analysis_type, :mongo_analysis_id,
+            CASE WHEN :status = 'processing' THEN GETUTCDATE() END)
+    """)
+    GET_ROW = query_registry.register("analyses.get_row", """
+        SELECT AnalysisId, UserId, ResumeId, JobId, MatchScore, Status,
+               AnalysisType, ProcessingTimeMs, CreatedAt, CompletedAt, MongoAnalysisId
+        FROM CompatibilityAnalyses 
+        WHERE AnalysisId = :analysis_id AND UserId = :user_id
+    """)
+    COMPLETE = query_registry.register("analyses.complete", """
+        UPDATE CompatibilityAnalyses 
+        SET MatchScore = :match_score,
+            Status = 'completed',
+            ProcessingTimeMs = :processing_time,
+            CompletedAt = GETUTCDATE(),
+            MongoAnalysisId = :mongo_id
+        WHERE AnalysisId = :analysis_id
+    """)
+    UPDATE_STATUS = query_registry.register("analyses.update_status", """
+        UPDATE CompatibilityAnalyses 
+        SET Status = :status,
+            ProcessingTimeMs = COALESCE(:processing_time_ms, ProcessingTimeMs),
+            CompletedAt = CASE WHEN :status = 'completed' THEN GETUTCDATE() ELSE CompletedAt END,
+            ClaimedAt = CASE WHEN :status = 'processing' THEN GETUTCDATE() ELSE ClaimedAt END
+        WHERE AnalysisId = :analysis_id
+    """)
+    
+    # Fila de análises: os workers reservam as pendentes mais antigas; READPAST pula as linhas
+    # já bloqueadas por outro worker, então cada análise é entregue a um único worker. A reserva
+    # vale por um lease (ClaimedAt, renovado a cada passagem para 'processing'): análises em
+    # 'processing' com lease vencido ou sem lease (processo morto ou encerrado à força, ou linhas
+    # anteriores à coluna) voltam a ser reservadas. Coluna criada por
+    # migrations/sqlserver/001_compatibility_analyses_claimed_at.sql
+    CLAIM_PENDING = query_registry.register("analyses.claim_pending", """
+        WITH next_analyses AS (
+            SELECT TOP (:limit) *
+            FROM CompatibilityAnalyses WITH (ROWLOCK, UPDLOCK, READPAST)
+            WHERE Status = 'pending'
+               OR (Status = 'processing'
+                   AND (ClaimedAt IS NULL OR ClaimedAt < DATEADD(SECOND, -:lease_seconds, GETUTCDATE())))
+            ORDER BY CreatedAt
+        )
+        UPDATE next_analyses
+        SET Status = 'processing',
+            ClaimedAt = GETUTCDATE()
+        OUTPUT inserted.AnalysisId, inserted.UserId, inserted.ResumeId, inserted.JobId,
+               inserted.MatchScore, inserted.Status, inserted.AnalysisType,
+               inserted.ProcessingTimeMs, inserted.CreatedAt, inserted.CompletedAt,
+               inserted.MongoAnalysisId
+    """)
+    RELEASE_CLAIM = query_registry.register("analyses.release_claim", """
+        UPDATE CompatibilityAnalyses
+        SET Status = 'pending',
+            ClaimedAt = NULL
+        WHERE AnalysisId = :analysis_id AND Status = 'processing'
+    """)
+    
+    @staticmethod
+    def _insert_params(analysis: CompatibilityAnalysis) -> Dict[str, Any]:
+        return {
+            "analysis_id": str(analysis.analysis_id),
             "user_id": str(analysis.user_id),
             "resume_id": str(analysis.resume_id),
             "job_id": str(analysis.job_id) if analysis.job_id else None,
@@ -341,67 +564,205 @@ class AnalysisRepository(SQLRepository):
             "analysis_type": analysis.analysis_type,
             "mongo_analysis_id": analysis.mongo_analysis_id
         }
-        
+    
+    async def create_analysis(self, analysis: CompatibilityAnalysis) -> CompatibilityAnalysis:
+        """Criar nova análise"""
         try:
-            with self.get_session() as session:
-                session.execute(text(query), params)
-                session.commit()
-                return analysis
+            self.execute_command(self.INSERT_ANALYSIS, self._insert_params(analysis))
+            self.mark_write(analysis.user_id)
+            return analysis
         except SQLAlchemyError as e:
             logger.error(f"Error creating analysis: {e}")
             raise
     
+    async def create_analyses(self, analyses: Sequence[CompatibilityAnalysis]) -> List[CompatibilityAnalysis]:
+        """Criar várias análises em uma única transação (executemany)"""
+        try:
+            await asyncio.to_thread(
+                self.execute_many, self.INSERT_ANALYSIS, [self._insert_params(a) for a in analyses]
+            )
+            for user_id in {a.user_id for a in analyses}:
+                self.mark_write(user_id)
+            return list(analyses)
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating analyses in bulk: {e}")
+            raise
+    
     async def get_user_analyses(self, user_id: UUID, limit: int = 50) -> List[CompatibilityAnalysis]:
         """Buscar análises do usuário"""
-        query = """
+        page = await self.get_user_analyses_page(user_id, limit)
+        return page.items
+    
+    async def get_user_analyses_page(self, user_id: UUID, limit: int = 50, cursor: Optional[str] = None,
+                                     include_total: bool = False, as_rows: bool = False) -> CursorPage:
+        """Buscar página de análises do usuário por keyset (CreatedAt, AnalysisId)
+        
+        Com as_rows, os itens são as linhas (RowMapping) para os mappers em lote, sem entidades.
+        """
+        params = {"user_id": str(user_id), "limit": limit + 1}
+        keyset = ""
+        
+        if cursor:
+            created_at, analysis_id = decode_cursor(cursor)
+            # "CreatedAt <= :c" isolado delimita o seek no índice (UserId, CreatedAt, AnalysisId);
+            # o OR apenas desempata dentro do mesmo CreatedAt
+            keyset = """
+          AND CreatedAt <= :cursor_created_at
+          AND (CreatedAt < :cursor_created_at OR AnalysisId < :cursor_id)"""
+            params.update({"cursor_created_at": created_at, "cursor_id": analysis_id})
+        
+        query = f"""
         SELECT TOP (:limit) AnalysisId, UserId, ResumeId, JobId, MatchScore,
                Status, AnalysisType, ProcessingTimeMs, CreatedAt, CompletedAt,
                MongoAnalysisId
         FROM CompatibilityAnalyses 
+        WHERE UserId = :user_id{keyset}
+        ORDER BY CreatedAt DESC, AnalysisId DESC
+        """
+        
+        result = await self.execute_rows_async(
+            query, params, None if as_rows else analysis_row_factory, read_replica=True, user_id=user_id
+        )
+        
+        # Uma linha extra indica que existe próxima página, sem COUNT(*)
+        has_next = len(result) > limit
+        items = result[:limit]
+        
+        page = CursorPage(items=items)
+        if has_next:
+            last = items[-1]
+            page.next_cursor = (
+                encode_cursor(last["CreatedAt"], last["AnalysisId"]) if as_rows
+                else encode_cursor(last.created_at, last.analysis_id)
+            )
+        
+        if include_total:
+            page.total, page.total_capped = await self.count_user_analyses(user_id)
+        
+        return page
+    
+    async def stream_user_analyses(self, user_id: UUID, date_from: Optional[datetime] = None,
+                                   date_to: Optional[datetime] = None,
+                                   batch_size: int = 1000) -> AsyncIterator[List[CompatibilityAnalysis]]:
+        """Percorrer análises do usuário em lotes (exportação)"""
+        query = """
+        SELECT AnalysisId, UserId, ResumeId, JobId, MatchScore,
+               Status, AnalysisType, ProcessingTimeMs, CreatedAt, CompletedAt,
+               MongoAnalysisId
+        FROM CompatibilityAnalyses 
         WHERE UserId = :user_id
-        ORDER BY CreatedAt DESC
+          AND (:date_from IS NULL OR CreatedAt >= :date_from)
+          AND (:date_to IS NULL OR CreatedAt <= :date_to)
+        ORDER BY CreatedAt
         """
         
-        result = self.execute_query(query, {"user_id": str(user_id), "limit": limit})
-        
-        analyses = []
-        for row in result:
-            analyses.append(CompatibilityAnalysis(
-                analysis_id=UUID(row["AnalysisId"]),
-                user_id=UUID(row["UserId"]),
-                resume_id=UUID(row["ResumeId"]),
-                job_id=UUID(row["JobId"]) if row["JobId"] else None,
-                match_score=row["MatchScore"],
-                status=row["Status"],
-                analysis_type=row["AnalysisType"],
-                processing_time_ms=row["ProcessingTimeMs"],
-                created_at=row["CreatedAt"],
-                completed_at=row["CompletedAt"],
-                mongo_analysis_id=row["MongoAnalysisId"]
-            ))
+        params = {"user_id": str(user_id), "date_from": date_from, "date_to": date_to}
         
-        return analyses
+        async for analyses in self.stream_rows_async(query, params, analysis_row_factory, batch_size, read_replica=True, user_id=user_id):
+            yield analyses
     
-    async def update_analysis_status(self, analysis_id: UUID, status: str, 
-                                   processing_time_ms: Optional[int] = None) -> bool:
-        """Atualizar status da análise"""
+    async def get_user_analyses_batch(self, user_id: UUID, since: Optional[datetime] = None,
+                                      batch_size: int = 5000) -> "AnalysisBatch":
+        """Modo analítico: apenas as colunas agregáveis, em um lote colunar (sem entidades)"""
+        from domain.entities.analysis_batch import AnalysisBatch
+        
         query = """
-        UPDATE CompatibilityAnalyses 
-        SET Status = :status,
-            ProcessingTimeMs = COALESCE(:processing_time_ms, ProcessingTimeMs),
-            CompletedAt = CASE WHEN :status = 'completed' THEN GETUTCDATE() ELSE CompletedAt END
-        WHERE AnalysisId = :analysis_id
+        SELECT MatchScore, ProcessingTimeMs, Status, CreatedAt, CompletedAt
+        FROM CompatibilityAnalyses 
+        WHERE UserId = :user_id AND (:since IS NULL OR CreatedAt >= :since)
         """
         
+        params = {"user_id": str(user_id), "since": since}
+        parts = [
+            AnalysisBatch.from_rows(rows)
+            async for rows in self.stream_rows_async(
+                query, params, batch_size=batch_size, read_replica=True, user_id=user_id
+            )
+        ]
+        return AnalysisBatch.concat(parts)
+    
+    async def count_user_analyses(self, user_id: UUID,
+                                  cap: int = settings.PAGINATION_TOTAL_CAP) -> Tuple[int, bool]:
+        """Contagem aproximada: para de contar ao atingir `cap` (custo limitado)"""
+        query = """
+        SELECT COUNT(*) AS Total
+        FROM (
+            SELECT TOP (:cap) 1 AS Found
+            FROM CompatibilityAnalyses
+            WHERE UserId = :user_id
+        ) AS capped
+        """
+        
+        result = await self.execute_query_async(
+            query, {"user_id": str(user_id), "cap": cap}, read_replica=True, user_id=user_id
+        )
+        total = result[0]["Total"] if result else 0
+        return total, total >= cap
+    
+    async def get_analysis_row(self, analysis_id: UUID, user_id: UUID) -> Optional[Dict[str, Any]]:
+        """Buscar metadados da análise (SQL) do usuário"""
+        result = await self.execute_query_async(
+            self.GET_ROW, {"analysis_id": str(analysis_id), "user_id": str(user_id)}
+        )
+        return result[0] if result else None
+    
+    async def complete_analysis(self, analysis_id: UUID, match_score: float,
+                                processing_time_ms: int, mongo_analysis_id: str,
+                                user_id: Optional[UUID] = None) -> bool:
+        """Marcar análise como concluída, vinculando o documento detalhado"""
         try:
-            with self.get_session() as session:
-                result = session.execute(text(query), {
-                    "analysis_id": str(analysis_id),
-                    "status": status,
-                    "processing_time_ms": processing_time_ms
+            updated = self.execute_command(self.COMPLETE, {
+                "analysis_id": str(analysis_id),
+                "match_score": match_score,
+                "processing_time": processing_time_ms,
+                "mongo_id": mongo_analysis_id
+            }) > 0
+            self.mark_write(user_id)
+            return updated
+        except SQLAlchemyError as e:
+            logger.error(f"Error completing analysis: {e}")
+            raise
+    
+    def claim_pending_analyses(self, limit: int,
+                               lease_seconds: int = settings.ANALYSIS_CLAIM_LEASE_SECONDS) -> List[CompatibilityAnalysis]:
+        """Reservar até `limit` análises pendentes ou com lease vencido (status -> processing)"""
+        try:
+            with _tracked(self.CLAIM_PENDING), self.get_session() as session:
+                result = session.execute(self.CLAIM_PENDING.statement, {
+                    "limit": limit,
+                    "lease_seconds": lease_seconds
                 })
+                build = analysis_row_factory(tuple(result.keys()))
+                analyses = [build(row) for row in result]
                 session.commit()
-                return result.rowcount > 0
+        except SQLAlchemyError as e:
+            logger.error(f"Error claiming pending analyses: {e}")
+            raise
+        
+        for user_id in {analysis.user_id for analysis in analyses}:
+            self.mark_write(user_id)
+        return analyses
+    
+    def release_claim(self, analysis_id: UUID) -> bool:
+        """Devolver a análise reservada à fila (volta a 'pending')"""
+        try:
+            return self.execute_command(self.RELEASE_CLAIM, {"analysis_id": str(analysis_id)}) > 0
+        except SQLAlchemyError as e:
+            logger.error(f"Error releasing analysis claim: {e}")
+            return False
+    
+    async def update_analysis_status(self, analysis_id: UUID, status: str, 
+                                   processing_time_ms: Optional[int] = None,
+                                   user_id: Optional[UUID] = None) -> bool:
+        """Atualizar status da análise"""
+        try:
+            updated = self.execute_command(self.UPDATE_STATUS, {
+                "analysis_id": str(analysis_id),
+                "status": status,
+                "processing_time_ms": processing_time_ms
+            }) > 0
+            self.mark_write(user_id)
+            return updated
         except SQLAlchemyError as e:
             logger.error(f"Error updating analysis status: {e}")
             return False
@@ -410,22 +771,80 @@ class AnalysisRepository(SQLRepository):
 class DashboardRepository(SQLRepository):
     """Repositório para dados do dashboard"""
     
-    async def get_dashboard_stats(self, user_id: UUID) -> Dict[str, Any]:
-        """Obter estatísticas do dashboard"""
+    async def get_dashboard_stats(self, user_id: UUID, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """Obter estatísticas do dashboard (desde a data informada)"""
         query = """
-        EXEC sp_GetDashboardStats @UserId = :user_id
+        SELECT a.TotalAnalyses, a.CompletedAnalyses, a.PendingAnalyses, a.AverageMatch,
+               m.ThisMonth, r.SavedResumes, cl.CoverLettersGenerated,
+               b.BestMatchScore, b.BestMatchTitle
+        FROM (
+            SELECT COUNT(*) AS TotalAnalyses,
+                   COUNT(CASE WHEN Status = 'completed' THEN 1 END) AS CompletedAnalyses,
+                   COUNT(CASE WHEN Status IN ('pending', 'processing') THEN 1 END) AS PendingAnalyses,
+                   AVG(CASE WHEN Status = 'completed' THEN MatchScore END) AS AverageMatch
+            FROM CompatibilityAnalyses
+            WHERE UserId = :user_id AND (:since IS NULL OR CreatedAt >= :since)
+        ) a
+        CROSS JOIN (
+            SELECT COUNT(*) AS ThisMonth
+            FROM CompatibilityAnalyses
+            WHERE UserId = :user_id
+              AND CreatedAt >= DATEADD(month, DATEDIFF(month, 0, GETUTCDATE()), 0)
+        ) m
+        CROSS JOIN (
+            SELECT COUNT(*) AS SavedResumes
+            FROM Resumes
+            WHERE UserId = :user_id AND Status <> 'archived'
+        ) r
+        CROSS JOIN (
+            SELECT COUNT(*) AS CoverLettersGenerated
+            FROM CoverLetters
+            WHERE UserId = :user_id AND (:since IS NULL OR GeneratedAt >= :since)
+        ) cl
+        OUTER APPLY (
+            SELECT TOP 1 ca.MatchScore AS BestMatchScore,
+                   COALESCE(jd.Title, res.Title) AS BestMatchTitle
+            FROM CompatibilityAnalyses ca
+            LEFT JOIN JobDescriptions jd ON ca.JobId = jd.JobId
+            LEFT JOIN Resumes res ON ca.ResumeId = res.ResumeId
+            WHERE ca.UserId = :user_id AND ca.Status = 'completed'
+              AND (:since IS NULL OR ca.CreatedAt >= :since)
+            ORDER BY ca.MatchScore DESC
+        ) b
         """
         
-        result = self.execute_query(query, {"user_id": str(user_id)})
+        result = await self.execute_query_async(
+            query, {"user_id": str(user_id), "since": since}, read_replica=True, user_id=user_id
+        )
         if not result:
             return {}
         
         return result[0]
     
+    async def get_score_distribution(self, user_id: UUID, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Obter distribuição dos scores em faixas de 10 pontos"""
+        query = """
+        SELECT Bucket, COUNT(*) AS Count
+        FROM (
+            SELECT CASE WHEN MatchScore >= 100 THEN 90
+                        ELSE CAST(FLOOR(MatchScore / 10) * 10 AS INT) END AS Bucket
+            FROM CompatibilityAnalyses
+            WHERE UserId = :user_id AND Status = 'completed'
+              AND (:since IS NULL OR CreatedAt >= :since)
+        ) scores
+        GROUP BY Bucket
+        ORDER BY Bucket
+        """
+        
+        return await self.execute_query_async(
+            query, {"user_id": str(user_id), "since": since}, read_replica=True, user_id=user_id
+        )
+    
     async def get_recent_analyses(self, user_id: UUID, limit: int = 5) -> List[Dict[str, Any]]:
         """Obter análises recentes"""
         query = """
-        SELECT TOP (:limit) ca.AnalysisId, ca.MatchScore, ca.CreatedAt,
+        SELECT TOP (:limit) ca.AnalysisId, ca.UserId, ca.ResumeId, ca.JobId, ca.MatchScore,
+               ca.Status, ca.AnalysisType, ca.ProcessingTimeMs, ca.CreatedAt, ca.CompletedAt,
                r.Title as ResumeTitle, jd.Title as JobTitle, c.Name as CompanyName
         FROM CompatibilityAnalyses ca
         LEFT JOIN Resumes r ON ca.ResumeId = r.ResumeId
@@ -435,7 +854,233 @@ class DashboardRepository(SQLRepository):
         ORDER BY ca.CreatedAt DESC
         """
         
-        return self.execute_query(query, {"user_id": str(user_id), "limit": limit})
+        return await self.execute_query_async(
+            query, {"user_id": str(user_id), "limit": limit}, read_replica=True, user_id=user_id
+        )
+
+
+class NotificationRepository(SQLRepository):
+    """Repositório de notificações"""
+    
+    async def get_user_notifications(self, user_id: UUID, limit: int = 10,
+                                     unread_only: bool = False) -> List[Notification]:
+        """Buscar notificações do usuário (não expiradas)"""
+        query = """
+        SELECT TOP (:limit) NotificationId, UserId, Type, Title, Message, ActionUrl,
+               IsRead, CreatedAt, ReadAt, ExpiresAt
+        FROM Notifications
+        WHERE UserId = :user_id
+          AND (ExpiresAt IS NULL OR ExpiresAt > GETUTCDATE())
+        """
+        
+        if unread_only:
+            query += " AND IsRead = 0"
+        
+        query += " ORDER BY CreatedAt DESC"
+        
+        result = await self.execute_query_async(
+            query, {"user_id": str(user_id), "limit": limit}, read_replica=True, user_id=user_id
+        )
+        
+        return [
+            Notification(
+                notification_id=UUID(str(row["NotificationId"])),
+                user_id=UUID(str(row["UserId"])),
+                type=row["Type"],
+                title=row["Title"],
+                message=row["Message"],
+                action_url=row["ActionUrl"],
+                is_read=row["IsRead"],
+                created_at=row["CreatedAt"],
+                read_at=row["ReadAt"],
+                expires_at=row["ExpiresAt"]
+            )
+            for row in result
+        ]
+    
+    async def mark_notifications(self, user_id: UUID, notification_ids: Sequence[UUID],
+                                 is_read: bool = True) -> int:
+        """Marcar notificações como lidas/não lidas em um único UPDATE
+        
+        Restrito às notificações do usuário; retorna quantas foram alteradas.
+        """
+        if not notification_ids:
+            return 0
+        
+        placeholders, params = expand_in("notification_id", [str(n) for n in notification_ids])
+        query = f"""
+        UPDATE Notifications
+        SET IsRead = :is_read,
+            ReadAt = CASE WHEN :is_read = 1 THEN COALESCE(ReadAt, GETUTCDATE()) ELSE NULL END
+        WHERE UserId = :user_id
+          AND NotificationId IN ({placeholders})
+          AND IsRead <> :is_read
+        """
+        params.update({"user_id": str(user_id), "is_read": 1 if is_read else 0})
+        
+        def update() -> int:
+            with self.get_session() as session:
+                result = session.execute(text(query), params)
+                session.commit()
+                return result.rowcount
+        
+        try:
+            updated = await asyncio.to_thread(update)
+            self.mark_write(user_id)
+            return updated
+        except SQLAlchemyError as e:
+            logger.error(f"Error updating notifications: {e}")
+            raise
+
+
+class UserSkillRepository(SQLRepository):
+    """Repositório de habilidades do usuário"""
+    
+    # Parâmetros por linha do MERGE (UserSkillId, SkillId, ProficiencyLevel, YearsOfExperience, Source)
+    _MERGE_ROW_PARAMS = 5
+    # :user_id aparece duas vezes e o pyodbc envia um parâmetro posicional por ocorrência
+    _MERGE_FIXED_PARAMS = 2
+    
+    @staticmethod
+    def _merge_statement(user_skills: Sequence[UserSkill]) -> Tuple[str, Dict[str, Any]]:
+        """MERGE com as linhas como fonte (VALUES): atualiza existentes e insere as novas"""
+        rows, params = [], {}
+        for i, skill in enumerate(user_skills):
+            rows.append(f"(:id_{i}, :skill_id_{i}, :level_{i}, :years_{i}, :source_{i})")
+            params.update({
+                f"id_{i}": str(skill.user_skill_id),
+                f"skill_id_{i}": str(skill.skill_id),
+                f"level_{i}": skill.proficiency_level,
+                f"years_{i}": skill.years_of_experience,
+                f"source_{i}": skill.source
+            })
+        
+        query = f"""
+        MERGE UserSkills WITH (HOLDLOCK) AS target
+        USING (VALUES {", ".join(rows)})
+            AS source (UserSkillId, SkillId, ProficiencyLevel, YearsOfExperience, Source)
+        ON target.UserId = :user_id AND target.SkillId = source.SkillId
+        WHEN MATCHED THEN
+            UPDATE SET ProficiencyLevel = source.ProficiencyLevel,
+                       YearsOfExperience = source.YearsOfExperience,
+                       Source = source.Source,
+                       LastUpdated = GETUTCDATE()
+        WHEN NOT MATCHED THEN
+            INSERT (UserSkillId, UserId, SkillId, ProficiencyLevel, YearsOfExperience, Source, LastUpdated)
+            VALUES (source.UserSkillId, :user_id, source.SkillId, source.ProficiencyLevel,
+                    source.YearsOfExperience, source.Source, GETUTCDATE());
+        """
+        return query, params
+    
+    @classmethod
+    def _merge_statements(cls, user_id: UUID,
+                          user_skills: Sequence[UserSkill]) -> List[Tuple[str, Dict[str, Any]]]:
+        """MERGEs do upsert em blocos de linhas dentro de MAX_STATEMENT_PARAMS"""
+        # O MERGE falha se a mesma SkillId aparecer duas vezes na fonte; vale a última
+        user_skills = list({skill.skill_id: skill for skill in user_skills}.values())
+        chunk_size = (MAX_STATEMENT_PARAMS - cls._MERGE_FIXED_PARAMS) // cls._MERGE_ROW_PARAMS
+        
+        statements = []
+        for start in range(0, len(user_skills), chunk_size):
+            query, params = cls._merge_statement(user_skills[start:start + chunk_size])
+            params["user_id"] = str(user_id)
+            statements.append((query, params))
+        return statements
+    
+    async def upsert_user_skills(self, user_id: UUID, user_skills: Sequence[UserSkill]) -> int:
+        """Inserir ou atualizar habilidades do usuário (por SkillId) em uma única transação
+        
+        Um MERGE por bloco de linhas, respeitando o limite de parâmetros por comando.
+        """
+        if not user_skills:
+            return 0
+        
+        statements = self._merge_statements(user_id, user_skills)
+        
+        def upsert() -> int:
+            affected = 0
+            with self.get_session() as session:
+                for query, params in statements:
+                    affected += session.execute(text(query), params).rowcount
+                session.commit()
+            return affected
+        
+        try:
+            affected = await asyncio.to_thread(upsert)
+            self.mark_write(user_id)
+            return affected
+        except SQLAlchemyError as e:
+            logger.error(f"Error upserting user skills: {e}")
+            raise
+
+
+class StatisticsRepository(SQLRepository):
+    """Repositório para recálculo das estatísticas pré-calculadas"""
+
+    async def get_user_totals(self, user_id: UUID) -> Dict[str, Any]:
+        """Obter totais e somatórios do usuário a partir das tabelas de origem"""
+        query = """
+        SELECT a.total_analyses, a.completed_analyses, a.failed_analyses,
+               a.score_sum, a.best_score, a.worst_score,
+               a.processing_time_sum, a.processing_time_count,
+               r.total_resumes, cl.total_cover_letters
+        FROM (
+            SELECT COUNT(*) AS total_analyses,
+                   COUNT(CASE WHEN Status = 'completed' THEN 1 END) AS completed_analyses,
+                   COUNT(CASE WHEN Status = 'failed' THEN 1 END) AS failed_analyses,
+                   SUM(CASE WHEN Status = 'completed' THEN MatchScore END) AS score_sum,
+                   MAX(CASE WHEN Status = 'completed' THEN MatchScore END) AS best_score,
+                   MIN(CASE WHEN Status = 'completed' THEN MatchScore END) AS worst_score,
+                   SUM(CASE WHEN Status = 'completed' THEN ProcessingTimeMs END) AS processing_time_sum,
+                   COUNT(CASE WHEN Status = 'completed' THEN ProcessingTimeMs END) AS processing_time_count
+            FROM CompatibilityAnalyses
+            WHERE UserId = :user_id
+        ) a
+        CROSS JOIN (SELECT COUNT(*) AS total_resumes FROM Resumes WHERE UserId = :user_id) r
+        CROSS JOIN (SELECT COUNT(*) AS total_cover_letters FROM CoverLetters WHERE UserId = :user_id) cl
+        """
+
+        result = self.execute_query(query, {"user_id": str(user_id)}, read_replica=True, user_id=user_id)
+        return result[0] if result else {}
+
+    async def get_user_daily_analyses(self, user_id: UUID, since: datetime) -> Dict[str, Dict[str, Any]]:
+        """Obter análises criadas/concluídas por dia desde uma data"""
+        created_query = """
+        SELECT CAST(CreatedAt AS DATE) AS Day, COUNT(*) AS Created
+        FROM CompatibilityAnalyses
+        WHERE UserId = :user_id AND CreatedAt >= :since
+        GROUP BY CAST(CreatedAt AS DATE)
+        """
+
+        completed_query = """
+        SELECT CAST(CompletedAt AS DATE) AS Day, COUNT(*) AS Completed,
+               SUM(MatchScore) AS ScoreSum
+        FROM CompatibilityAnalyses
+        WHERE UserId = :user_id AND Status = 'completed' AND CompletedAt >= :since
+        GROUP BY CAST(CompletedAt AS DATE)
+        """
+
+        params = {"user_id": str(user_id), "since": since}
+        daily: Dict[str, Dict[str, Any]] = {}
+
+        for row in self.execute_query(created_query, params, read_replica=True, user_id=user_id):
+            bucket = daily.setdefault(row["Day"].isoformat(), {})
+            bucket["created"] = row["Created"]
+
+        for row in self.execute_query(completed_query, params, read_replica=True, user_id=user_id):
+            bucket = daily.setdefault(row["Day"].isoformat(), {})
+            bucket["completed"] = row["Completed"]
+            bucket["scoreSum"] = float(row["ScoreSum"] or 0.0)
+
+        return daily
+
+    async def get_active_user_ids(self) -> List[UUID]:
+        """Listar usuários ativos (para reconstrução completa)"""
+        query = """
+        SELECT UserId FROM Users WHERE IsActive = 1
+        """
+
+        return [UUID(str(row["UserId"])) for row in self.execute_query(query, read_replica=True)]
 
 
 class DataLakeRepository(SQLRepository):
@@ -466,11 +1111,57 @@ class DataLakeRepository(SQLRepository):
             with self.get_session() as session:
                 session.execute(text(query), params)
                 session.commit()
-                return file_ref
+            self.mark_write(file_ref.user_id)
+            return file_ref
         except SQLAlchemyError as e:
             logger.error(f"Error creating file reference: {e}")
             raise
     
+    async def get_file_by_id(self, file_id: UUID) -> Optional[DataLakeFile]:
+        """Buscar referência de arquivo por ID"""
+        query = """
+        SELECT FileId, UserId, FileName, FileType, FileSize, MimeType,
+               StoragePath, BucketName, StorageProvider, UploadedAt
+        FROM DataLakeFiles
+        WHERE FileId = :file_id AND IsDeleted = 0
+        """
+        
+        result = await self.execute_query_async(query, {"file_id": str(file_id)})
+        return self._row_to_file(result[0]) if result else None
+    
+    async def get_user_files(self, user_id: UUID, date_from: Optional[datetime] = None,
+                             date_to: Optional[datetime] = None) -> List[DataLakeFile]:
+        """Buscar arquivos ativos do usuário (exportação)"""
+        query = """
+        SELECT FileId, UserId, FileName, FileType, FileSize, MimeType,
+               StoragePath, BucketName, StorageProvider, UploadedAt
+        FROM DataLakeFiles
+        WHERE UserId = :user_id AND IsDeleted = 0
+          AND (:date_from IS NULL OR UploadedAt >= :date_from)
+          AND (:date_to IS NULL OR UploadedAt <= :date_to)
+        ORDER BY UploadedAt
+        """
+        
+        params = {"user_id": str(user_id), "date_from": date_from, "date_to": date_to}
+        result = await self.execute_query_async(query, params, read_replica=True, user_id=user_id)
+        return [self._row_to_file(row) for row in result]
+    
+    @staticmethod
+    def _row_to_file(row: Dict[str, Any]) -> DataLakeFile:
+        """Converter linha de DataLakeFiles em entidade"""
+        return DataLakeFile(
+            file_id=UUID(str(row["FileId"])),
+            user_id=UUID(str(row["UserId"])),
+            filename=row["FileName"],
+            file_type=row["FileType"],
+            file_size=row["FileSize"],
+            mime_type=row["MimeType"],
+            storage_path=row["StoragePath"],
+            bucket_name=row["BucketName"],
+            storage_provider=row["StorageProvider"],
+            uploaded_at=row["UploadedAt"]
+        )
+    
     async def record_file_access(self, file_id: UUID) -> bool:
         """Registrar acesso ao arquivo"""
         query = """
@@ -0,0 +1,277 @@
+"""
+Roteamento de engines SQL
+Primário para escritas e N réplicas de leitura, cada uma com seu próprio pool.
+Leituras passam por uma política (round_robin, least_connections), ficam no primário
+por uma janela curta após uma escrita do usuário (read-your-writes) e voltam ao
+primário quando a réplica falha
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+from contextlib import contextmanager
+import itertools
+import logging
+import threading
+import time
+
+from cachetools import TTLCache
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from core.config import settings, db_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ROUTING_POLICIES = ("round_robin", "least_connections")
+
+
+class ReplicaEngine:
+    """Réplica de leitura: engine próprio, conexões em uso e estado de saúde"""
+    __slots__ = ("name", "engine", "active", "reads", "failures", "failed_until")
+
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.active = 0
+        self.reads = 0
+        self.failures = 0
+        self.failed_until = 0.0
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.failed_until
+
+
+class SQLEngineRouter:
+    """Escolhe o engine de cada operação: escritas no primário, leituras nas réplicas"""
+
+    def __init__(self, primary: Engine, replicas: Sequence[Engine] = (),
+                 policy: str = "round_robin", read_your_writes_seconds: float = 5.0,
+                 replica_retry_seconds: float = 30.0, sticky_max_users: int = 100_000):
+        if policy not in ROUTING_POLICIES:
+            raise ValueError(f"Unknown SQL read policy '{policy}' (expected one of {ROUTING_POLICIES})")
+
+        self.primary = primary
+        self.replicas: List[ReplicaEngine] = [
+            ReplicaEngine(f"replica-{index}", engine) for index, engine in enumerate(replicas)
+        ]
+        self.policy = policy
+        self.replica_retry_seconds = replica_retry_seconds
+        # Usuários com escrita recente; a entrada expira ao fim da janela
+        self._recent_writers: Optional[TTLCache] = (
+            TTLCache(maxsize=sticky_max_users, ttl=read_your_writes_seconds)
+            if read_your_writes_seconds > 0 else None
+        )
+        self._round_robin = itertools.count()
+        self._lock = threading.Lock()
+        self.primary_reads = 0
+        self.sticky_reads = 0
+        self.fallbacks = 0
+
+    @classmethod
+    def from_urls(cls, primary_url: str, replica_urls: Sequence[str] = (),
+                  engine_options: Optional[Dict[str, Any]] = None, **kwargs) -> "SQLEngineRouter":
+        """Criar engines (um pool por URL) e o roteador"""
+        options = engine_options or {}
+        return cls(
+            create_engine(primary_url, **options),
+            [create_engine(url, **options) for url in replica_urls],
+            **kwargs
+        )
+
+    @classmethod
+    def from_settings(cls) -> "SQLEngineRouter":
+        """Primário e réplicas conforme a configuração da aplicação"""
+        return cls.from_urls(
+            settings.sql_connection_string,
+            settings.sql_replica_connection_strings,
+            engine_options={
+                "pool_size": db_settings.SQL_POOL_SIZE,
+                "max_overflow": db_settings.SQL_MAX_OVERFLOW,
+                "pool_timeout": db_settings.SQL_POOL_TIMEOUT,
+                "pool_recycle": db_settings.SQL_POOL_RECYCLE,
+                # executemany do pyodbc em um único round-trip (arrays de parâmetros)
+                "fast_executemany": True,
+                "echo": settings.DEBUG
+            },
+            policy=settings.SQL_READ_POLICY,
+            read_your_writes_seconds=settings.SQL_READ_YOUR_WRITES_SECONDS,
+            replica_retry_seconds=settings.SQL_REPLICA_RETRY_SECONDS
+        )
+
+    def mark_write(self, user_id: Any) -> None:
+        """Registrar escrita do usuário: suas leituras ficam no primário durante a janela"""
+        if self._recent_writers is None or user_id is None:
+            return
+        with self._lock:
+            self._recent_writers[str(user_id)] = True
+
+    def is_sticky(self, user_id: Any) -> bool:
+        if self._recent_writers is None or user_id is None:
+            return False
+        with self._lock:
+            return str(user_id) in self._recent_writers
+
+    def _choose_replica(self) -> Optional[ReplicaEngine]:
+        """Réplica disponível segundo a política (None = usar o primário)"""
+        now = time.monotonic()
+        with self._lock:
+            available = [replica for replica in self.replicas if replica.is_available(now)]
+            if not available:
+                return None
+
+            start = next(self._round_robin) % len(available)
+            ordered = available[start:] + available[:start]
+            if self.policy == "least_connections":
+                # min é estável: empates seguem a ordem do round-robin
+                replica = min(ordered, key=lambda candidate: candidate.active)
+            else:
+                replica = ordered[0]
+
+            replica.active += 1
+            replica.reads += 1
+            return replica
+
+    def _release(self, replica: ReplicaEngine, failed: bool = False) -> None:
+        with self._lock:
+            replica.active -= 1
+            if failed:
+                replica.failures += 1
+                replica.failed_until = time.monotonic() + self.replica_retry_seconds
+
+    def _target(self, user_id: Any) -> Optional[ReplicaEngine]:
+        if not self.replicas:
+            self._count_primary_read()
+            return None
+        if self.is_sticky(user_id):
+            with self._lock:
+                self.sticky_reads += 1
+            return None
+        replica = self._choose_replica()
+        if replica is None:
+            self._count_primary_read()
+        return replica
+
+    def _count_primary_read(self) -> None:
+        with self._lock:
+            self.primary_reads += 1
+
+    def _fall_back(self, replica: ReplicaEngine, error: Exception) -> None:
+        logger.warning(f"Read replica {replica.name} failed, falling back to primary: {error}")
+        with self._lock:
+            self.fallbacks += 1
+
+    def run_read(self, work: Callable[[Connection], T], user_id: Any = None) -> T:
+        """Executar uma leitura completa; se a réplica falhar, repete no primário"""
+        replica = self._target(user_id)
+        if replica is not None:
+            failed = False
+            try:
+                with replica.engine.connect() as connection:
+                    return work(connection)
+            except DBAPIError as e:
+                failed = True
+                self._fall_back(replica, e)
+            finally:
+                self._release(replica, failed)
+
+        with self.primary.connect() as connection:
+            return work(connection)
+
+    @contextmanager
+    def read_connection(self, user_id: Any = None) -> Iterator[Connection]:
+        """Conexão de leitura (para streams); só há fallback se a réplica falhar ao conectar"""
+        replica = self._target(user_id)
+        if replica is not None:
+            try:
+                connection = replica.engine.connect()
+            except DBAPIError as e:
+                self._release(replica, failed=True)
+                self._fall_back(replica, e)
+            else:
+                try:
+                    with connection:
+                        yield connection
+                finally:
+                    self._release(replica)
+                return
+
+        with self.primary.connect() as connection:
+            yield connection
+
+    def warm_up(self, connections: int) -> int:
+        """Abrir `connections` conexões em cada engine e devolvê-las ao pool (warm start)"""
+        opened = 0
+        for engine in (self.primary, *(replica.engine for replica in self.replicas)):
+            held = []
+            try:
+                for _ in range(connections):
+                    held.append(engine.connect())
+                    opened += 1
+            except DBAPIError as e:
+                logger.warning(f"Could not warm up SQL pool for {engine.url.host}: {e}")
+            finally:
+                for connection in held:
+                    connection.close()
+        return opened
+
+    def stats(self) -> Dict[str, Any]:
+        """Distribuição das leituras (para o endpoint de métricas)"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "primary_reads": self.primary_reads,
+                "sticky_reads": self.sticky_reads,
+                "fallbacks": self.fallbacks,
+                "replicas": {
+                    replica.name: {
+                        "reads": replica.reads,
+                        "active": replica.active,
+                        "failures": replica.failures,
+                        "available": replica.is_available(now)
+                    }
+                    for replica in self.replicas
+                }
+            }
+
+    def dispose(self) -> None:
+        """Fechar os pools de todos os engines"""
+        self.primary.dispose()
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+
+_router: Optional[SQLEngineRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_engine_router() -> SQLEngineRouter:
+    """Roteador compartilhado pelos repositórios (criado na primeira chamada)"""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = SQLEngineRouter.from_settings()
+    return _router
+
+
+def warm_up_engine_router(connections: int) -> int:
+    """Criar o roteador compartilhado e pré-abrir as conexões dos pools"""
+    if connections <= 0:
+        return 0
+    return get_engine_router().warm_up(connections)
+
+
+def engine_router_stats() -> Dict[str, Any]:
+    """Estatísticas do roteador, sem criá-lo se ainda não foi usado"""
+    return _router.stats() if _router is not None else {}
+
+
+def dispose_engine_router() -> None:
+    """Encerrar o roteador compartilhado (shutdown da aplicação)"""
+    global _router
+    with _router_lock:
+        if _router is not None:
+            _router.dispose()
+            _router = None
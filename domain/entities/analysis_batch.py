@@ -0,0 +1,171 @@
+"""
+Lote colunar de análises
+Representação para consultas analíticas: uma coluna NumPy por campo em vez de uma
+lista de CompatibilityAnalysis, com agregações vetorizadas
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+from datetime import datetime, timedelta
+from dataclasses import dataclass
+
+import numpy as np
+
+from domain.entities.domain import AnalysisStatus, CompatibilityAnalysis
+
+# Status como códigos int8 (índice nesta tupla); AnalysisStatus é str, então a
+# mesma chave atende o enum e o valor lido do banco
+STATUS_CODES = tuple(AnalysisStatus)
+_STATUS_INDEX = {status.value: code for code, status in enumerate(STATUS_CODES)}
+
+DEFAULT_PERCENTILES = (50, 75, 90, 95, 99)
+
+
+# Conversão de datetime via int64 (np.array sobre objetos datetime é ~5x mais lento)
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NAT = np.datetime64("NaT", "us").astype(np.int64)
+
+
+def _datetime_column(values: Iterable[Optional[datetime]], count: int) -> np.ndarray:
+    return np.fromiter(
+        (_NAT if value is None else (value - _EPOCH) // _MICROSECOND for value in values),
+        dtype=np.int64, count=count
+    ).view("datetime64[us]")
+
+
+@dataclass(slots=True)
+class AnalysisBatch:
+    """Colunas de um conjunto de análises (mesma ordem em todas as colunas)"""
+    match_score: np.ndarray          # float64
+    processing_time_ms: np.ndarray   # float64, NaN quando ausente
+    status: np.ndarray               # int8, índice em STATUS_CODES
+    created_at: np.ndarray           # datetime64[us]
+    completed_at: np.ndarray         # datetime64[us], NaT quando ausente
+
+    @classmethod
+    def empty(cls) -> "AnalysisBatch":
+        return cls(
+            match_score=np.empty(0, dtype=np.float64),
+            processing_time_ms=np.empty(0, dtype=np.float64),
+            status=np.empty(0, dtype=np.int8),
+            created_at=np.empty(0, dtype="datetime64[us]"),
+            completed_at=np.empty(0, dtype="datetime64[us]")
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Mapping[str, Any]]) -> "AnalysisBatch":
+        """Montar colunas a partir de linhas SQL (MatchScore, ProcessingTimeMs, Status, CreatedAt, CompletedAt)"""
+        count = len(rows)
+        return cls(
+            match_score=np.fromiter((row["MatchScore"] or 0.0 for row in rows), dtype=np.float64, count=count),
+            processing_time_ms=np.fromiter(
+                (np.nan if row["ProcessingTimeMs"] is None else row["ProcessingTimeMs"] for row in rows),
+                dtype=np.float64, count=count
+            ),
+            status=np.fromiter((_STATUS_INDEX[row["Status"]] for row in rows), dtype=np.int8, count=count),
+            created_at=_datetime_column((row["CreatedAt"] for row in rows), count),
+            completed_at=_datetime_column((row["CompletedAt"] for row in rows), count)
+        )
+
+    @classmethod
+    def from_entities(cls, analyses: Sequence[CompatibilityAnalysis]) -> "AnalysisBatch":
+        """Montar colunas a partir de entidades já carregadas"""
+        count = len(analyses)
+        return cls(
+            match_score=np.fromiter((a.match_score or 0.0 for a in analyses), dtype=np.float64, count=count),
+            processing_time_ms=np.fromiter(
+                (np.nan if a.processing_time_ms is None else a.processing_time_ms for a in analyses),
+                dtype=np.float64, count=count
+            ),
+            status=np.fromiter((_STATUS_INDEX[a.status] for a in analyses), dtype=np.int8, count=count),
+            created_at=_datetime_column((a.created_at for a in analyses), count),
+            completed_at=_datetime_column((a.completed_at for a in analyses), count)
+        )
+
+    @classmethod
+    def concat(cls, batches: Iterable["AnalysisBatch"]) -> "AnalysisBatch":
+        """Unir lotes parciais (ex.: partições de um stream)"""
+        batches = list(batches)
+        if not batches:
+            return cls.empty()
+        return cls(
+            match_score=np.concatenate([b.match_score for b in batches]),
+            processing_time_ms=np.concatenate([b.processing_time_ms for b in batches]),
+            status=np.concatenate([b.status for b in batches]),
+            created_at=np.concatenate([b.created_at for b in batches]),
+            completed_at=np.concatenate([b.completed_at for b in batches])
+        )
+
+    def __len__(self) -> int:
+        return len(self.match_score)
+
+    def status_mask(self, status: AnalysisStatus) -> np.ndarray:
+        return self.status == _STATUS_INDEX[status]
+
+    def status_counts(self) -> Dict[str, int]:
+        """Quantidade de análises por status"""
+        counts = np.bincount(self.status, minlength=len(STATUS_CODES))
+        return {status.value: int(counts[code]) for code, status in enumerate(STATUS_CODES)}
+
+    def completed_scores(self) -> np.ndarray:
+        return self.match_score[self.status_mask(AnalysisStatus.COMPLETED)]
+
+    def average_score(self, completed_only: bool = True) -> float:
+        scores = self.completed_scores() if completed_only else self.match_score
+        return float(scores.mean()) if scores.size else 0.0
+
+    def score_distribution(self, bucket_size: int = 10) -> List[Dict[str, Any]]:
+        """Histograma dos scores concluídos (formato de match_score_distribution)"""
+        scores = self.completed_scores()
+        if not scores.size:
+            return []
+        # Mesmo critério do SQL: 100 entra na última faixa
+        buckets = np.minimum(scores // bucket_size, 100 // bucket_size - 1).astype(np.int64)
+        counts = np.bincount(buckets, minlength=100 // bucket_size)
+        return [
+            {"range": f"{bucket * bucket_size}-{(bucket + 1) * bucket_size}", "count": int(count)}
+            for bucket, count in enumerate(counts) if count
+        ]
+
+    def score_percentiles(self, percentiles: Sequence[int] = DEFAULT_PERCENTILES) -> Dict[str, Optional[float]]:
+        """Percentis dos scores concluídos"""
+        return self._percentiles(self.completed_scores(), percentiles)
+
+    def processing_time_percentiles(self, percentiles: Sequence[int] = DEFAULT_PERCENTILES) -> Dict[str, Optional[float]]:
+        """Percentis do tempo de processamento (ms) das análises concluídas"""
+        times = self.processing_time_ms[self.status_mask(AnalysisStatus.COMPLETED)]
+        return self._percentiles(times[~np.isnan(times)], percentiles)
+
+    def daily_trend(self) -> List[Dict[str, Any]]:
+        """Criadas/concluídas e score médio por dia (formato de analysis_trend)"""
+        created_days = self.created_at.astype("datetime64[D]")
+        completed = self.status_mask(AnalysisStatus.COMPLETED) & ~np.isnat(self.completed_at)
+        completed_days = self.completed_at[completed].astype("datetime64[D]")
+
+        days, created_counts = np.unique(created_days, return_counts=True)
+        done_days, done_index, done_counts = np.unique(completed_days, return_inverse=True, return_counts=True)
+        score_sums = np.bincount(done_index, weights=self.match_score[completed], minlength=len(done_days))
+
+        all_days = np.union1d(days, done_days)
+        created_by_day = dict(zip(days.tolist(), created_counts.tolist()))
+        completed_by_day = {
+            day: (int(count), float(score_sum))
+            for day, count, score_sum in zip(done_days.tolist(), done_counts.tolist(), score_sums.tolist())
+        }
+
+        trend = []
+        for day in all_days.tolist():
+            count, score_sum = completed_by_day.get(day, (0, 0.0))
+            trend.append({
+                "date": day.isoformat(),
+                "created": created_by_day.get(day, 0),
+                "completed": count,
+                "averageScore": score_sum / count if count else None
+            })
+        return trend
+
+    @staticmethod
+    def _percentiles(values: np.ndarray, percentiles: Sequence[int]) -> Dict[str, Optional[float]]:
+        if not values.size:
+            return {f"p{p}": None for p in percentiles}
+        results = np.percentile(values, percentiles)
+        return {f"p{p}": float(value) for p, value in zip(percentiles, results)}
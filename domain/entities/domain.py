@@ -1,12 +1,15 @@
 """
 Modelos de domínio do SkillSync
 Representam as entidades principais do negócio
+
+Entidades usam __slots__ (sem __dict__ por instância): cargas em lote criam milhões delas.
+Não são frozen: factories e serviços atualizam as entidades, e frozen dobra o custo de construção.
 """
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from enum import Enum
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 
 
 class SubscriptionType(str, Enum):
@@ -56,8 +59,27 @@ class NotificationType(str, Enum):
     ERROR = "error"
 
 
-@dataclass
-class User:
+class Updatable:
+    """Atualização parcial de entidades a partir de qualquer DTO (dict ou objeto)"""
+    __slots__ = ()  # sem __slots__ vazio, a base reintroduziria o __dict__ nas subclasses
+
+    # Identificadores e auditoria não são alterados por DTOs
+    IMMUTABLE_FIELDS = frozenset({"user_id", "created_at", "password_hash"})
+
+    def aplicar_atualizacao_from_any(self, dto: Any) -> None:
+        """Aplicar os campos presentes (não nulos) no DTO"""
+        primary_key = fields(self)[0].name
+        for entity_field in fields(self):
+            name = entity_field.name
+            if name == primary_key or name in self.IMMUTABLE_FIELDS:
+                continue
+            value = dto.get(name) if isinstance(dto, dict) else getattr(dto, name, None)
+            if value is not None:
+                setattr(self, name, value)
+
+
+@dataclass(slots=True)
+class User(Updatable):
     """Entidade Usuário"""
     user_id: UUID
     email: str
@@ -74,8 +96,8 @@ class User:
     two_factor_enabled: bool = False
 
 
-@dataclass
-class Resume:
+@dataclass(slots=True)
+class Resume(Updatable):
     """Entidade Currículo"""
     resume_id: UUID
     user_id: UUID
@@ -93,7 +115,7 @@ class Resume:
     average_match_score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Company:
     """Entidade Empresa"""
     company_id: UUID
@@ -107,7 +129,7 @@ class Company:
     is_active: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class JobDescription:
     """Entidade Descrição de Vaga"""
     job_id: UUID
@@ -127,8 +149,8 @@ class JobDescription:
     application_count: int = 0
 
 
-@dataclass
-class CompatibilityAnalysis:
+@dataclass(slots=True)
+class CompatibilityAnalysis(Updatable):
     """Entidade Análise de Compatibilidade"""
     analysis_id: UUID
     user_id: UUID
@@ -143,7 +165,7 @@ class CompatibilityAnalysis:
     mongo_analysis_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CoverLetter:
     """Entidade Carta de Apresentação"""
     cover_letter_id: UUID
@@ -159,7 +181,7 @@ class CoverLetter:
     mongo_content_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Skill:
     """Entidade Habilidade"""
     skill_id: UUID
@@ -170,7 +192,7 @@ class Skill:
     created_at: datetime = field(default_factory=datetime.utcnow)
 
 
-@dataclass
+@dataclass(slots=True)
 class UserSkill:
     """Entidade Habilidade do Usuário"""
     user_skill_id: UUID
@@ -182,7 +204,7 @@ class UserSkill:
     source: str = "manual"  # manual, resume_analysis, linkedin_import
 
 
-@dataclass
+@dataclass(slots=True)
 class Notification:
     """Entidade Notificação"""
     notification_id: UUID
@@ -197,7 +219,7 @@ class Notification:
     expires_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class UserSession:
     """Entidade Sessão do Usuário"""
     session_id: UUID
@@ -211,7 +233,7 @@ class UserSession:
     is_active: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class DataLakeFile:
     """Entidade Arquivo do Data Lake"""
     file_id: UUID
@@ -233,7 +255,7 @@ class DataLakeFile:
 
 # ===== MODELOS MONGODB (Documentos) =====
 
-@dataclass
+@dataclass(slots=True)
 class SkillExtraction:
     """Habilidade extraída do currículo"""
     name: str
@@ -242,7 +264,7 @@ class SkillExtraction:
     category: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ExperienceItem:
     """Item de experiência profissional"""
     company: str
@@ -252,7 +274,7 @@ class ExperienceItem:
     relevance_score: float
 
 
-@dataclass
+@dataclass(slots=True)
 class EducationItem:
     """Item de educação"""
     institution: str
@@ -261,7 +283,7 @@ class EducationItem:
     year: str
 
 
-@dataclass
+@dataclass(slots=True)
 class JobAnalysis:
     """Análise da vaga"""
     key_requirements: List[str]
@@ -272,7 +294,7 @@ class JobAnalysis:
     company_info: Dict[str, str]
 
 
-@dataclass
+@dataclass(slots=True)
 class ResumeAnalysis:
     """Análise do currículo"""
     extracted_skills: List[SkillExtraction]
@@ -282,7 +304,7 @@ class ResumeAnalysis:
     certifications: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class CategoryScores:
     """Scores por categoria"""
     skills: float
@@ -291,7 +313,7 @@ class CategoryScores:
     cultural: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ImprovementArea:
     """Área de melhoria"""
     area: str
@@ -299,7 +321,7 @@ class ImprovementArea:
     suggestions: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class CompatibilityReport:
     """Relatório de compatibilidade"""
     overall_score: float
@@ -310,7 +332,7 @@ class CompatibilityReport:
     improvement_areas: List[ImprovementArea]
 
 
-@dataclass
+@dataclass(slots=True)
 class DetailedAnalysis:
     """Análise detalhada (MongoDB)"""
     analysis_id: str
@@ -328,7 +350,7 @@ class DetailedAnalysis:
     updated_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class CoverLetterContent:
     """Conteúdo da carta de apresentação"""
     subject: str
@@ -340,7 +362,7 @@ class CoverLetterContent:
     full_text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CoverLetterCustomization:
     """Personalização da carta"""
     tone: str  # formal, casual, enthusiastic
@@ -349,7 +371,7 @@ class CoverLetterCustomization:
     company_research: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class EditHistoryItem:
     """Item do histórico de edições"""
     version: int
@@ -358,7 +380,7 @@ class EditHistoryItem:
     edited_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class CoverLetterDocument:
     """Documento da carta (MongoDB)"""
     cover_letter_id: str
@@ -376,7 +398,7 @@ class CoverLetterDocument:
     updated_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class UserPreferences:
     """Preferências do usuário (MongoDB)"""
     user_id: str
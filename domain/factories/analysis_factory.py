@@ -101,8 +101,8 @@ class AnalysisFactory:
             Análise atualizada
         """
         # Aplicar atualizações usando método da entidade
+        # CompatibilityAnalysis não tem updated_at (entidade com __slots__)
         existing_analysis.aplicar_atualizacao_from_any(dto)
-        existing_analysis.updated_at = datetime.utcnow()
         
         return existing_analysis
     
@@ -1,7 +1,7 @@
 """
 Helpers globais para a arquitetura IT Valley
 """
-from .data_helpers import _get, email_from, id_from, name_from
+from .data_helpers import _get, email_from, id_from, name_from, phone_from, status_from
 from .validation_helpers import validate_required_fields, validate_email_format
 
 __all__ = [
@@ -9,6 +9,8 @@ __all__ = [
     "email_from", 
     "id_from",
     "name_from",
+    "phone_from",
+    "status_from",
     "validate_required_fields",
     "validate_email_format"
 ]
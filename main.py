@@ -6,14 +6,32 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 from datetime import datetime
 
 from core.config import settings
-from api import auth
+from core.responses import FastJSONResponse, warm_up_serializers
+from core.middleware import CompressionMiddleware
+from core.process_metrics import ProcessMetricsWriter, aggregate_process_metrics
+from core.container import container
+from core.dependencies import register_services
+from api import auth, dashboard, export, analysis, cover_letters
+from data.activity_log_buffer import activity_logger
+from data.query_registry import query_registry
+from data.sql_router import engine_router_stats, dispose_engine_router, warm_up_engine_router
+from data.mongo_repository import ensure_mongo_indexes, audit_query_shapes
+from services.export_job_service import export_jobs
+from services.ai_retry import ai_executor
+from services.ai_routing import model_router
+from services.ai_transport import ai_transport
 # from data.mongo_repository import MongoRepository
 from schemas.responses.responses import ErrorResponse, HealthCheckResponse
+from schemas.responses.responses import (
+    DashboardResponse, DetailedAnalysisResponse, CursorPaginatedResponse,
+    RecentActivityResponse, ExportResponse
+)
 
 # Configurar logging
 logging.basicConfig(
@@ -26,6 +44,21 @@ logger = logging.getLogger(__name__)
 # mongo_repo = MongoRepository()
 
 
+def collect_metrics():
+    """Contadores deste processo (também gravados no snapshot para agregação entre workers)"""
+    return {
+        "activity_log": {**activity_logger.stats, "pending": activity_logger.pending},
+        "sql_queries": query_registry.stats(),
+        "sql_routing": engine_router_stats(),
+        "ai_transport": ai_transport.stats(),
+        "ai_requests": ai_executor.stats(),
+        "ai_models": model_router.stats()
+    }
+
+
+metrics_writer = ProcessMetricsWriter("web", collect_metrics)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gerenciar ciclo de vida da aplicação"""
@@ -37,6 +70,40 @@ async def lifespan(app: FastAPI):
         # await mongo_repo.connect()
         # logger.info("Connected to MongoDB")
         
+        # Índices do MongoDB (idempotente); em segundo plano para não atrasar o startup
+        app.state.mongo_index_task = None
+        if settings.MONGO_ENSURE_INDEXES:
+            app.state.mongo_index_task = asyncio.create_task(ensure_mongo_indexes())
+        
+        # Desenvolvimento: explain() de cada consulta dos repositórios ("strict" falha com COLLSCAN)
+        if settings.MONGO_QUERY_AUDIT != "off":
+            if app.state.mongo_index_task:
+                await app.state.mongo_index_task
+            await audit_query_shapes(strict=settings.MONGO_QUERY_AUDIT == "strict")
+        
+        # Warm start: pools SQL conectados antes de o worker aceitar requisições
+        try:
+            opened = await asyncio.to_thread(warm_up_engine_router, settings.SQL_WARM_CONNECTIONS)
+            logger.info(f"SQL pools warmed up ({opened} connections)")
+        except Exception as e:
+            logger.warning(f"SQL pool warm-up skipped: {e}")
+        
+        # Serviços compartilhados entre as requisições (injetados via Depends)
+        register_services()
+        
+        # Iniciar gravação em lote dos logs de atividade
+        activity_logger.start()
+        
+        # Snapshot das métricas do processo (agregado entre workers no /metrics)
+        metrics_writer.start()
+        
+        # Compilar serializadores das respostas mais pesadas
+        if settings.FAST_JSON_RESPONSES:
+            warm_up_serializers(
+                DashboardResponse, DetailedAnalysisResponse,
+                CursorPaginatedResponse[RecentActivityResponse], ExportResponse
+            )
+        
         # Outras inicializações aqui
         logger.info("SkillSync API started successfully")
         
@@ -50,6 +117,30 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down SkillSync API...")
     
     try:
+        await metrics_writer.stop()
+        
+        # Criação de índices ainda em andamento é interrompida (é idempotente no próximo startup)
+        index_task = getattr(app.state, "mongo_index_task", None)
+        if index_task is not None:
+            index_task.cancel()
+            await asyncio.gather(index_task, return_exceptions=True)
+        
+        # Interromper jobs de exportação em andamento
+        await export_jobs.shutdown()
+        
+        # Fechar os clientes mantidos pelos serviços
+        await container.close()
+        
+        # Fechar o pool de conexões da OpenAI
+        await ai_transport.close()
+        
+        # Gravar logs de atividade pendentes antes de encerrar
+        await activity_logger.stop()
+        logger.info(f"Activity log buffer flushed: {activity_logger.stats}")
+        
+        # Fechar os pools do primário e das réplicas SQL
+        dispose_engine_router()
+        
         # Desconectar do MongoDB (comentado por enquanto)
         # await mongo_repo.disconnect()
         # logger.info("Disconnected from MongoDB")
@@ -67,6 +158,7 @@ app = FastAPI(
     description="API para análise de currículos e compatibilidade com vagas",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=FastJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse,
     lifespan=lifespan
 )
 
@@ -79,6 +171,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Middleware de compressão (gzip/brotli)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+)
+
 # Middleware de hosts confiáveis
 if not settings.DEBUG:
     app.add_middleware(
@@ -159,6 +259,10 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 # Incluir routers
 app.include_router(auth.router, prefix=settings.API_V1_STR)
+app.include_router(dashboard.router, prefix=settings.API_V1_STR)
+app.include_router(export.router, prefix=settings.API_V1_STR)
+app.include_router(analysis.router, prefix=settings.API_V1_STR)
+app.include_router(cover_letters.router, prefix=settings.API_V1_STR)
 
 
 # Endpoints básicos
@@ -239,7 +343,10 @@ async def get_metrics():
         "active_users": 0,
         "database_connections": 0,
         "memory_usage_mb": 0.0,
-        "cpu_usage_percentage": 0.0
+        "cpu_usage_percentage": 0.0,
+        **collect_metrics(),
+        # Todos os processos do launcher (server.py), quando METRICS_DIR está configurado
+        "workers": aggregate_process_metrics()
     }
 
 
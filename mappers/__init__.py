@@ -5,9 +5,11 @@ Seguindo padrão IT Valley
 from .user_mapper import UserMapper
 from .resume_mapper import ResumeMapper
 from .analysis_mapper import AnalysisMapper
+from .cover_letter_mapper import CoverLetterMapper
 
 __all__ = [
     "UserMapper",
     "ResumeMapper",
-    "AnalysisMapper"
+    "AnalysisMapper",
+    "CoverLetterMapper"
 ]
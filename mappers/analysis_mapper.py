@@ -2,16 +2,52 @@
 Mapper para análises
 Seguindo padrão IT Valley
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Mapping, Iterable, Type
 from datetime import datetime
 
-from domain.entities.domain import CompatibilityAnalysis
+from pydantic import BaseModel
+
+from domain.entities.domain import CompatibilityAnalysis, AnalysisStatus
 from schemas.responses.analysis_responses import AnalysisResponse, DetailedAnalysisResponse
+from mappers.row_mapper import RowMapper
+
+ANALYSIS_UUID_COLUMNS = ("AnalysisId", "UserId", "ResumeId", "JobId")
 
 
 class AnalysisMapper:
     """Mapper para conversão de análises"""
     
+    # Mapas pré-calculados para conversão em lote (linhas de CompatibilityAnalyses)
+    LIST_ITEM_ROWS = RowMapper([
+        ("analysis_id", "AnalysisId"),
+        ("user_id", "UserId"),
+        ("resume_id", "ResumeId"),
+        ("job_id", "JobId"),
+        ("match_score", "MatchScore"),
+        ("status", "Status"),
+        ("analysis_type", "AnalysisType"),
+        ("processing_time_ms", "ProcessingTimeMs"),
+        ("created_at", "CreatedAt"),
+        ("completed_at", "CompletedAt")
+    ], uuid_columns=ANALYSIS_UUID_COLUMNS)
+    
+    DASHBOARD_ITEM_ROWS = RowMapper([
+        ("analysis_id", "AnalysisId"),
+        ("match_score", "MatchScore"),
+        ("status", "Status"),
+        ("job_title", "JobTitle"),
+        ("created_at", "CreatedAt"),
+        ("completed_at", "CompletedAt"),
+        ("processing_time", "ProcessingTimeMs")
+    ], uuid_columns=ANALYSIS_UUID_COLUMNS, defaults={"job_title": "Análise Ad-hoc"})
+    
+    SEARCH_RESULT_ROWS = RowMapper([
+        ("id", "AnalysisId"),
+        ("analysis_type", "AnalysisType"),
+        ("score", "MatchScore"),
+        ("created_at", "CreatedAt")
+    ], uuid_columns=ANALYSIS_UUID_COLUMNS)
+    
     @staticmethod
     def to_public(analysis: CompatibilityAnalysis) -> AnalysisResponse:
         """
@@ -231,11 +267,80 @@ class AnalysisMapper:
         Returns:
             Resultado em lote
         """
+        # Contagens e média vetorizadas sobre as colunas do lote (NumPy carregado só aqui)
+        from domain.entities.analysis_batch import AnalysisBatch
+        
+        batch = AnalysisBatch.from_entities(analyses)
+        status_counts = batch.status_counts()
+        
         return {
-            "total_analyses": len(analyses),
-            "completed_analyses": len([a for a in analyses if a.status.value == "completed"]),
-            "pending_analyses": len([a for a in analyses if a.status.value == "pending"]),
-            "failed_analyses": len([a for a in analyses if a.status.value == "failed"]),
-            "average_score": sum(a.match_score for a in analyses) / len(analyses) if analyses else 0.0,
+            "total_analyses": len(batch),
+            "completed_analyses": status_counts[AnalysisStatus.COMPLETED.value],
+            "pending_analyses": status_counts[AnalysisStatus.PENDING.value],
+            "failed_analyses": status_counts[AnalysisStatus.FAILED.value],
+            "average_score": batch.average_score(completed_only=False),
             "analyses": [AnalysisMapper.to_list_item(a) for a in analyses]
         }
+    
+    # ===== CONVERSÃO EM LOTE (linhas cruas do banco) =====
+    
+    @staticmethod
+    def rows_to_list_items(rows: Iterable[Mapping[str, Any]]) -> List[dict]:
+        """
+        Converte linhas de CompatibilityAnalyses em itens de lista (mesmo formato de to_list_item)
+        
+        Args:
+            rows: Linhas cruas (row._mapping)
+            
+        Returns:
+            Itens de lista
+        """
+        return AnalysisMapper.LIST_ITEM_ROWS.to_dicts(rows)
+    
+    @staticmethod
+    def rows_to_responses(rows: Iterable[Mapping[str, Any]],
+                          model: Type[BaseModel] = AnalysisResponse) -> List[BaseModel]:
+        """
+        Converte linhas de CompatibilityAnalyses em respostas pydantic (validação em lote)
+        
+        Args:
+            rows: Linhas cruas (row._mapping)
+            model: Modelo de resposta com os campos de AnalysisResponse
+            
+        Returns:
+            Lista de respostas
+        """
+        return AnalysisMapper.LIST_ITEM_ROWS.to_models(rows, model)
+    
+    @staticmethod
+    def rows_to_dashboard_items(rows: Iterable[Mapping[str, Any]]) -> List[dict]:
+        """
+        Converte linhas (com JobTitle) em itens do dashboard (mesmo formato de to_dashboard_item)
+        
+        Args:
+            rows: Linhas cruas (row._mapping)
+            
+        Returns:
+            Itens do dashboard
+        """
+        return AnalysisMapper.DASHBOARD_ITEM_ROWS.to_dicts(rows)
+    
+    @staticmethod
+    def rows_to_search_results(rows: Iterable[Mapping[str, Any]]) -> List[dict]:
+        """
+        Converte linhas em resultados de busca (mesmo formato de to_search_result)
+        
+        Args:
+            rows: Linhas cruas (row._mapping)
+            
+        Returns:
+            Resultados de busca
+        """
+        results = AnalysisMapper.SEARCH_RESULT_ROWS.to_dicts(rows)
+        for result in results:
+            score = result["score"]
+            result["type"] = "analysis"
+            result["title"] = f"Análise {result.pop('analysis_type')}"
+            result["description"] = f"Score: {score}%"
+            result["highlight"] = f"Compatibilidade: {score}%"
+        return results
@@ -0,0 +1,39 @@
+"""
+Mapper para cartas de apresentação
+Seguindo padrão IT Valley
+"""
+from typing import Dict, Any
+from datetime import datetime
+
+
+class CoverLetterMapper:
+    """Mapper para conversão de cartas de apresentação"""
+    
+    @staticmethod
+    def to_export(document: Dict[str, Any]) -> dict:
+        """
+        Converte documento de carta (MongoDB) para exportação
+        
+        Args:
+            document: Documento da coleção cover_letters
+            
+        Returns:
+            Dados para exportação
+        """
+        content = document.get("content") or {}
+        created_at = document.get("createdAt")
+        updated_at = document.get("updatedAt")
+        
+        return {
+            "id": str(document.get("coverLetterId") or document.get("_id")),
+            "user_id": document.get("userId"),
+            "resume_id": document.get("resumeId"),
+            "job_id": document.get("jobId"),
+            "language": document.get("language"),
+            "word_count": document.get("wordCount"),
+            "generated_by": document.get("generatedBy"),
+            "ai_model": document.get("aiModel"),
+            "content": (content.get("fullText") or content.get("full_text")) if isinstance(content, dict) else content,
+            "created_at": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+            "updated_at": updated_at.isoformat() if isinstance(updated_at, datetime) else updated_at
+        }
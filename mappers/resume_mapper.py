@@ -2,16 +2,42 @@
 Mapper para currículos
 Seguindo padrão IT Valley
 """
-from typing import Optional
+from typing import Optional, List, Any, Mapping, Iterable
 from datetime import datetime
 
 from domain.entities.domain import Resume
 from schemas.responses.resume_responses import ResumeResponse, ResumeListResponse
+from mappers.row_mapper import RowMapper
+
+RESUME_UUID_COLUMNS = ("ResumeId", "UserId", "DataLakeFileId")
 
 
 class ResumeMapper:
     """Mapper para conversão de currículos"""
     
+    # Mapas pré-calculados para conversão em lote (linhas de Resumes)
+    LIST_ITEM_ROWS = RowMapper([
+        ("resume_id", "ResumeId"),
+        ("title", "Title"),
+        ("version", "Version"),
+        ("status", "Status"),
+        ("file_type", "FileType"),
+        ("file_size", "FileSize"),
+        ("analysis_count", "AnalysisCount"),
+        ("average_match_score", "AverageMatchScore"),
+        ("created_at", "CreatedAt"),
+        ("updated_at", "UpdatedAt"),
+        ("last_analyzed_at", "LastAnalyzedAt")
+    ], uuid_columns=RESUME_UUID_COLUMNS)
+    
+    SEARCH_RESULT_ROWS = RowMapper([
+        ("id", "ResumeId"),
+        ("title", "Title"),
+        ("version", "Version"),
+        ("score", "AverageMatchScore"),
+        ("created_at", "CreatedAt")
+    ], uuid_columns=RESUME_UUID_COLUMNS)
+    
     @staticmethod
     def to_public(resume: Resume) -> ResumeResponse:
         """
@@ -213,3 +239,36 @@ class ResumeMapper:
             "created_at": resume.created_at,
             "highlight": None  # Será preenchido pelo service de busca
         }
+    
+    # ===== CONVERSÃO EM LOTE (linhas cruas do banco) =====
+    
+    @staticmethod
+    def rows_to_list_items(rows: Iterable[Mapping[str, Any]]) -> List[dict]:
+        """
+        Converte linhas de Resumes em itens de lista (mesmo formato de to_list_item)
+        
+        Args:
+            rows: Linhas cruas (row._mapping)
+            
+        Returns:
+            Itens de lista
+        """
+        return ResumeMapper.LIST_ITEM_ROWS.to_dicts(rows)
+    
+    @staticmethod
+    def rows_to_search_results(rows: Iterable[Mapping[str, Any]]) -> List[dict]:
+        """
+        Converte linhas de Resumes em resultados de busca (mesmo formato de to_search_result)
+        
+        Args:
+            rows: Linhas cruas (row._mapping)
+            
+        Returns:
+            Resultados de busca
+        """
+        results = ResumeMapper.SEARCH_RESULT_ROWS.to_dicts(rows)
+        for result in results:
+            result["type"] = "resume"
+            result["description"] = f"Currículo {result.pop('version')}"
+            result["highlight"] = None
+        return results
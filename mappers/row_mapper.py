@@ -0,0 +1,68 @@
+"""
+Mapeamento em lote de linhas do banco
+Converte linhas cruas (row._mapping) direto em dicts de resposta ou modelos pydantic,
+sem criar entidades de domínio intermediárias
+"""
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
+from functools import lru_cache
+from operator import itemgetter
+
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Validador compilado de List[model] (uma chamada ao pydantic-core por lote)"""
+    return TypeAdapter(List[model])
+
+
+def _canonical_uuid(value: Any) -> str:
+    return str(value).lower()
+
+
+class RowMapper:
+    """Mapa de campos pré-calculado: campo da resposta -> coluna SQL"""
+    __slots__ = ("keys", "_getter", "_uuid_positions", "_defaults")
+
+    def __init__(self, fields: Sequence[Tuple[str, str]], uuid_columns: Iterable[str] = (),
+                 defaults: Optional[Dict[str, Any]] = None):
+        columns = [column for _, column in fields]
+        uuid_columns = set(uuid_columns)
+
+        self.keys = tuple(key for key, _ in fields)
+        # itemgetter com vários campos devolve a tupla de valores em uma única chamada C
+        self._getter = itemgetter(*columns) if len(columns) > 1 else (lambda row: (row[columns[0]],))
+        # uniqueidentifier chega como str maiúscula; a resposta usa a forma canônica (minúscula)
+        self._uuid_positions = tuple(i for i, column in enumerate(columns) if column in uuid_columns)
+        self._defaults = tuple((defaults or {}).items())
+
+    def to_dicts(self, rows: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        """Converter linhas em dicts com as chaves da resposta"""
+        return self._convert(rows, _canonical_uuid)
+
+    def to_models(self, rows: Iterable[Mapping[str, Any]], model: Type[BaseModel]) -> List[BaseModel]:
+        """Converter linhas em modelos pydantic validando o lote inteiro de uma vez"""
+        # UUIDs seguem como vieram: o pydantic-core os converte mais rápido que UUID() em Python
+        return _list_adapter(model).validate_python(self._convert(rows, None))
+
+    def _convert(self, rows: Iterable[Mapping[str, Any]],
+                 convert_uuid: Optional[Callable[[Any], Any]]) -> List[Dict[str, Any]]:
+        keys, getter = self.keys, self._getter
+        uuid_positions = self._uuid_positions if convert_uuid else ()
+
+        if not uuid_positions and not self._defaults:
+            return [dict(zip(keys, getter(row))) for row in rows]
+
+        items = []
+        for row in rows:
+            values = list(getter(row))
+            for position in uuid_positions:
+                value = values[position]
+                if value is not None:
+                    values[position] = convert_uuid(value)
+            item = dict(zip(keys, values))
+            for key, default in self._defaults:
+                if item[key] is None:
+                    item[key] = default
+            items.append(item)
+        return items
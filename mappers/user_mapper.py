@@ -2,16 +2,28 @@
 Mapper para usuários
 Seguindo padrão IT Valley
 """
-from typing import Optional
+from typing import Optional, List, Any, Mapping, Iterable
 from datetime import datetime
 
 from domain.entities.domain import User
 from schemas.responses.user_responses import UserProfileResponse, UserResponse
+from mappers.row_mapper import RowMapper
 
 
 class UserMapper:
     """Mapper para conversão de usuários"""
     
+    # Mapa pré-calculado para conversão em lote (linhas de Users)
+    LIST_ITEM_ROWS = RowMapper([
+        ("user_id", "UserId"),
+        ("full_name", "FullName"),
+        ("email", "Email"),
+        ("subscription_type", "SubscriptionType"),
+        ("is_active", "IsActive"),
+        ("created_at", "CreatedAt"),
+        ("last_login_at", "LastLoginAt")
+    ], uuid_columns=("UserId",))
+    
     @staticmethod
     def to_public(user: User) -> UserProfileResponse:
         """
@@ -185,3 +197,18 @@ class UserMapper:
             "timestamp": datetime.utcnow(),
             "details": details or {}
         }
+    
+    # ===== CONVERSÃO EM LOTE (linhas cruas do banco) =====
+    
+    @staticmethod
+    def rows_to_list_items(rows: Iterable[Mapping[str, Any]]) -> List[dict]:
+        """
+        Converte linhas de Users em itens de lista (mesmo formato de to_list_item)
+        
+        Args:
+            rows: Linhas cruas (row._mapping)
+            
+        Returns:
+            Itens de lista
+        """
+        return UserMapper.LIST_ITEM_ROWS.to_dicts(rows)
@@ -0,0 +1,10 @@
+-- Lease da fila de análises (CompatibilityAnalyses.ClaimedAt)
+-- Momento da última reserva da análise por um worker (ou do início do processamento na web).
+-- Análises em 'processing' com ClaimedAt vencido (ANALYSIS_CLAIM_LEASE_SECONDS) ou nulo voltam
+-- a ser reservadas pelos workers. Idempotente: pode ser executada mais de uma vez.
+--
+-- Uso: sqlcmd -S localhost -d SkillSync -i migrations/sqlserver/001_compatibility_analyses_claimed_at.sql
+
+IF COL_LENGTH('CompatibilityAnalyses', 'ClaimedAt') IS NULL
+    ALTER TABLE CompatibilityAnalyses ADD ClaimedAt DATETIME2 NULL;
+GO
@@ -289,6 +289,13 @@ class JobSearchRequest(BaseModel):
     page_size: int = Field(default=20, ge=1, le=100)
 
 
+class CursorPaginationRequest(BaseModel):
+    """DTO para paginação por cursor"""
+    cursor: Optional[str] = Field(None, max_length=512)
+    limit: int = Field(default=20, ge=1, le=100)
+    include_total: bool = False
+
+
 # ===== DASHBOARD DTOs =====
 
 class DashboardStatsRequest(BaseModel):
@@ -306,6 +313,7 @@ class DataExportRequest(BaseModel):
     date_from: Optional[datetime] = None
     date_to: Optional[datetime] = None
     include_files: bool = False
+    compress: bool = False  # gzip aplicado durante o streaming
 
 
 # ===== FEEDBACK DTOs =====
@@ -51,6 +51,26 @@ class PaginatedResponse(BaseResponse, Generic[T]):
         )
 
 
+class CursorPaginatedResponse(BaseResponse, Generic[T]):
+    """Resposta paginada por cursor"""
+    data: List[T]
+    pagination: Dict[str, Any]
+    
+    @classmethod
+    def create(cls, data: List[T], limit: int, next_cursor: Optional[str] = None,
+               total: Optional[int] = None, total_capped: bool = False):
+        pagination = {
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "has_next": next_cursor is not None
+        }
+        if total is not None:
+            # Total aproximado: quando total_capped, o valor real é maior ou igual
+            pagination["total"] = total
+            pagination["total_capped"] = total_capped
+        return cls(data=data, pagination=pagination)
+
+
 # ===== AUTH DTOs =====
 
 class TokenResponse(BaseResponse):
@@ -194,15 +214,13 @@ class DetailedAnalysisResponse(BaseModel):
     match_score: float
     status: AnalysisStatus
     
-    # Análise da vaga
-    job_analysis: Dict[str, Any]
-    
-    # Análise do currículo
-    extracted_skills: List[SkillMatchResponse]
-    experience_matches: List[ExperienceMatchResponse]
-    education: List[Dict[str, str]]
-    languages: List[str]
-    certifications: List[str]
+    # Análise da vaga e do currículo: None quando o relatório completo não foi pedido (full_report)
+    job_analysis: Optional[Dict[str, Any]] = None
+    extracted_skills: Optional[List[SkillMatchResponse]] = None
+    experience_matches: Optional[List[ExperienceMatchResponse]] = None
+    education: Optional[List[Dict[str, str]]] = None
+    languages: Optional[List[str]] = None
+    certifications: Optional[List[str]] = None
     
     # Relatório de compatibilidade
     compatibility_scores: CompatibilityScoresResponse
@@ -356,6 +374,7 @@ class DashboardResponse(BaseModel):
     recent_activities: List[RecentActivityResponse]
     recent_analyses: List[AnalysisResponse]
     notifications: List[NotificationResponse]
+    missing_sections: List[str] = Field(default_factory=list)  # Seções indisponíveis (resposta parcial)
 
 
 # ===== SEARCH DTOs =====
@@ -413,6 +432,7 @@ class ExportResponse(BaseResponse):
     download_url: Optional[str] = None
     expires_at: Optional[datetime] = None
     file_size: Optional[int] = None
+    progress: Optional[Dict[str, Any]] = None
 
 
 # ===== HEALTH & STATUS DTOs =====
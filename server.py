@@ -0,0 +1,141 @@
+"""
+Launcher de produção SkillSync API
+N processos web (uvicorn, um event loop por núcleo, socket compartilhado) e um pool separado de
+workers de análise consumindo a fila de análises pendentes
+
+Cada worker web só passa a aceitar conexões depois do lifespan (pools SQL conectados,
+serializadores compilados). Sinais para o processo do launcher:
+- SIGHUP: reinício gradual dos workers web (um por vez, cada um encerra suas requisições)
+- SIGUSR1: reinício gradual dos workers de análise (cada um conclui o lote atual)
+- SIGTTIN/SIGTTOU: mais/menos um worker web
+- SIGTERM/SIGINT: encerramento
+
+Uso: python server.py [--workers 4] [--analysis-workers 2]
+"""
+from typing import List
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+
+import uvicorn
+
+from core.config import settings
+
+logger = logging.getLogger("server")
+
+# Um worker que morre logo após iniciar (ex.: banco inacessível) só é reposto após este intervalo
+RESPAWN_BACKOFF_SECONDS = 5.0
+
+
+def _spawn_analysis_worker(index: int) -> multiprocessing.Process:
+    from services.analysis_worker import run_analysis_worker
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_analysis_worker, args=(index,), name=f"analysis-worker-{index}", daemon=False
+    )
+    process.start()
+    return process
+
+
+class AnalysisWorkerPool:
+    """Supervisor dos workers de análise: repõe processos que morrem e recicla sob SIGUSR1"""
+
+    def __init__(self, size: int, shutdown_timeout: float = settings.WORKER_SHUTDOWN_TIMEOUT):
+        self.size = size
+        self.shutdown_timeout = shutdown_timeout
+        self.processes: List[multiprocessing.Process] = []
+        self._started_at: List[float] = []
+        self._stopping = threading.Event()
+        self._restart_requested = threading.Event()
+        self._monitor = threading.Thread(target=self._supervise, name="analysis-pool", daemon=True)
+
+    def start(self) -> None:
+        if self.size <= 0:
+            return
+        for index in range(self.size):
+            self.processes.append(_spawn_analysis_worker(index))
+            self._started_at.append(time.monotonic())
+        self._monitor.start()
+
+    def _respawn(self, index: int) -> None:
+        self.processes[index] = _spawn_analysis_worker(index)
+        self._started_at[index] = time.monotonic()
+
+    def _stop_process(self, process: multiprocessing.Process) -> None:
+        process.terminate()
+        process.join(self.shutdown_timeout)
+        if process.is_alive():
+            logger.warning(f"{process.name} did not stop in {self.shutdown_timeout}s, killing")
+            process.kill()
+            process.join()
+
+    def restart_all(self) -> None:
+        """Reinício gradual: um worker por vez, os demais continuam consumindo a fila"""
+        self._restart_requested.set()
+
+    def _supervise(self) -> None:
+        while not self._stopping.wait(1.0):
+            if self._restart_requested.is_set():
+                self._restart_requested.clear()
+                logger.info("Restarting analysis workers")
+                for index in range(len(self.processes)):
+                    if self._stopping.is_set():
+                        return
+                    self._stop_process(self.processes[index])
+                    self._respawn(index)
+
+            now = time.monotonic()
+            for index, process in enumerate(self.processes):
+                if process.is_alive() or self._stopping.is_set():
+                    continue
+                if now - self._started_at[index] < RESPAWN_BACKOFF_SECONDS:
+                    continue
+                logger.warning(f"{process.name} exited with code {process.exitcode}, respawning")
+                self._respawn(index)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._monitor.is_alive():
+            self._monitor.join()
+        for process in self.processes:
+            self._stop_process(process)
+
+
+def run(workers: int, analysis_workers: int) -> None:
+    logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL), format=settings.LOG_FORMAT)
+
+    # Repassado aos processos filhos pelo ambiente (as configurações são lidas na importação);
+    # com um único worker web o app roda neste processo e usa `settings` diretamente
+    settings.ANALYSIS_WORKERS = analysis_workers
+    settings.METRICS_DIR = settings.METRICS_DIR or tempfile.mkdtemp(prefix="skillsync-metrics-")
+    os.environ["ANALYSIS_WORKERS"] = str(analysis_workers)
+    os.environ["METRICS_DIR"] = settings.METRICS_DIR
+
+    pool = AnalysisWorkerPool(analysis_workers)
+    pool.start()
+    signal.signal(signal.SIGUSR1, lambda sig, frame: pool.restart_all())
+
+    try:
+        uvicorn.run(
+            "main:app",
+            host=settings.HOST,
+            port=settings.PORT,
+            workers=workers,
+            timeout_graceful_shutdown=settings.WORKER_SHUTDOWN_TIMEOUT,
+            log_level=settings.LOG_LEVEL.lower()
+        )
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS)
+    parser.add_argument("--analysis-workers", type=int, default=settings.ANALYSIS_WORKERS)
+    args = parser.parse_args()
+    run(args.workers, args.analysis_workers)
@@ -0,0 +1,192 @@
+"""
+Controle de carga das chamadas à IA
+Limite de concorrência adaptativo (AIMD: sobe +1 a cada "janela" de chamadas rápidas, cai
+multiplicativamente com latência crescente, 429 ou timeout) e circuit breaker que corta as
+chamadas enquanto a API está falhando, para os serviços usarem os fallbacks locais. Fila do
+limitador esgotada (AIBackpressureError) é só lentidão: os workers adiam a análise em vez de degradar
+"""
+from typing import Any, Deque, Dict, Optional
+from collections import deque
+import asyncio
+import time
+
+from core.config import settings
+
+
+class AIUnavailableError(Exception):
+    """Chamada recusada localmente (circuito aberto ou fila do limitador esgotada)"""
+
+
+class AIBackpressureError(AIUnavailableError):
+    """Fila do limitador esgotada: a API está lenta, não fora do ar (vale adiar, não degradar)"""
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limite de chamadas simultâneas ajustado pela latência observada e pelas respostas 429"""
+
+    def __init__(self, initial_limit: int = settings.AI_LIMITER_INITIAL_LIMIT,
+                 min_limit: int = settings.AI_LIMITER_MIN_LIMIT,
+                 max_limit: int = settings.OPENAI_MAX_CONCURRENT_REQUESTS,
+                 queue_timeout: float = settings.AI_LIMITER_QUEUE_TIMEOUT,
+                 latency_tolerance: float = settings.AI_LIMITER_LATENCY_TOLERANCE,
+                 backoff_ratio: float = 0.9, overload_backoff_ratio: float = 0.5):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(initial_limit, min_limit), self.max_limit))
+        self.queue_timeout = queue_timeout
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.overload_backoff_ratio = overload_backoff_ratio
+        self.in_flight = 0
+        self.latency_ms: Optional[float] = None   # média móvel curta
+        self.baseline_ms: Optional[float] = None  # média móvel longa (referência de "normal")
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._stats = {
+            "rejections": 0,
+            "decreases": 0
+        }
+
+    @property
+    def available(self) -> int:
+        """Vagas livres no limite atual"""
+        return max(int(self.limit) - self.in_flight, 0)
+
+    async def acquire(self) -> None:
+        """Reservar uma vaga; AIBackpressureError se nenhuma abrir em `queue_timeout`"""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._stats["rejections"] += 1
+            raise AIBackpressureError(
+                f"AI concurrency limit ({int(self.limit)}) busy for {self.queue_timeout}s"
+            )
+        except BaseException:
+            # Cancelada depois de receber a vaga: devolvê-la
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self._wake_waiters()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self, latency_ms: Optional[float] = None, overloaded: bool = False) -> None:
+        """Liberar a vaga e ajustar o limite (sem latência nem sobrecarga: não ajusta)"""
+        if overloaded:
+            self._decrease(self.overload_backoff_ratio)
+        elif latency_ms is not None:
+            self._observe(latency_ms)
+
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Passar as vagas livres aos primeiros da fila (a vaga já sai reservada)"""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _observe(self, latency_ms: float) -> None:
+        if self.baseline_ms is None:
+            self.latency_ms = self.baseline_ms = latency_ms
+            return
+        self.latency_ms = 0.8 * self.latency_ms + 0.2 * latency_ms
+        self.baseline_ms = 0.99 * self.baseline_ms + 0.01 * latency_ms
+
+        if self.latency_ms > self.baseline_ms * self.latency_tolerance:
+            self._decrease(self.backoff_ratio)
+        else:
+            # +1 a cada `limit` chamadas rápidas (aumento aditivo por janela)
+            self.limit = min(self.limit + 1 / self.limit, float(self.max_limit))
+
+    def _decrease(self, ratio: float) -> None:
+        # Chamadas que já estavam em andamento refletem a mesma sobrecarga: no máximo uma
+        # redução por intervalo de latência típica
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency_ms or 0) / 1000:
+            return
+        self._last_decrease = now
+        self.limit = max(self.limit * ratio, float(self.min_limit))
+        self._stats["decreases"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "latency_ms": round(self.latency_ms or 0, 2),
+            "baseline_ms": round(self.baseline_ms or 0, 2)
+        }
+
+
+class CircuitBreaker:
+    """Abre após falhas transitórias consecutivas; depois de `reset_seconds` deixa passar uma
+    chamada de teste (half-open) que fecha o circuito se tiver sucesso"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = settings.AI_BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = settings.AI_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._stats = {
+            "opens": 0,
+            "rejections": 0
+        }
+
+    @property
+    def is_open(self) -> bool:
+        """Circuito aberto e ainda sem chamada de teste liberada"""
+        return self.state == self.OPEN and time.monotonic() - self._opened_at < self.reset_seconds
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self._stats["rejections"] += 1
+        return False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self._stats["opens"] += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Chamada permitida que terminou sem indicar a saúde da API (ex.: erro 400)"""
+        self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "state": self.state,
+            "open": int(self.state != self.CLOSED),
+            "consecutive_failures": self.consecutive_failures
+        }
@@ -0,0 +1,212 @@
+"""
+Retry e hedge das chamadas à IA
+Cada operação (análise de currículo, compatibilidade, carta...) tem sua política em
+AISettings.RETRY_POLICIES: falhas transitórias são repetidas com backoff exponencial e jitter,
+respeitando Retry-After; com hedge, uma segunda chamada idêntica sai quando a primeira passa do
+p95 observado da operação e vale a que responder primeiro (a outra é cancelada). Os tokens
+estimados dos hedges ficam limitados a uma fração dos tokens gastos (AI_HEDGE_TOKEN_BUDGET)
+"""
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import asyncio
+import logging
+import random
+import time
+
+from core.config import settings, ai_settings
+from services.ai_limiter import AIUnavailableError
+from services.ai_transport import AITransport, ChatResult, ai_transport, is_transient_error
+
+logger = logging.getLogger(__name__)
+
+# Uma tentativa: recebe o timeout da política e devolve a resposta
+ChatCall = Callable[[Optional[float]], Awaitable[ChatResult]]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Política de uma operação"""
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    max_retry_after: float = 30.0  # Retry-After maior que isto: desiste (fallback)
+    timeout: Optional[float] = None
+    hedge: bool = False
+
+    @classmethod
+    def for_operation(cls, operation: str) -> "RetryPolicy":
+        policies = ai_settings.RETRY_POLICIES
+        return cls(**{**policies.get("default", {}), **policies.get(operation, {})})
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Espera antes da tentativa seguinte (full jitter, nunca menos que o Retry-After)"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Retry-After (ou retry-after-ms) da resposta de erro, em segundos"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        if value.replace(".", "", 1).isdigit():
+            return float(value)
+        retry_at = parsedate_to_datetime(value)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class OperationStats:
+    """Janela de latências e média de tokens das chamadas bem-sucedidas de uma operação"""
+
+    def __init__(self, window: int = settings.AI_LATENCY_WINDOW):
+        self.latencies_ms: Deque[float] = deque(maxlen=window)
+        self.avg_tokens = 0.0
+
+    def record(self, latency_ms: float, tokens: int) -> None:
+        self.latencies_ms.append(latency_ms)
+        self.avg_tokens = tokens if len(self.latencies_ms) == 1 else 0.9 * self.avg_tokens + 0.1 * tokens
+
+    def record_censored(self, latency_ms: float) -> None:
+        """Chamada cancelada pelo hedge: só se sabe que levaria ao menos `latency_ms` (sem tokens)"""
+        self.latencies_ms.append(latency_ms)
+
+    def p95_ms(self, min_samples: int = settings.AI_HEDGE_MIN_SAMPLES) -> Optional[float]:
+        if len(self.latencies_ms) < min_samples:
+            return None
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+
+class AIRequestExecutor:
+    """Executa as chamadas de uma operação segundo sua RetryPolicy"""
+
+    def __init__(self, transport: AITransport = ai_transport,
+                 hedge_token_budget: float = settings.AI_HEDGE_TOKEN_BUDGET):
+        self.transport = transport
+        self.hedge_token_budget = hedge_token_budget
+        self.operations: Dict[str, OperationStats] = {}
+        self._stats = {
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "hedges_skipped": 0,
+            "tokens": 0,
+            "hedge_tokens": 0.0
+        }
+
+    def _operation(self, operation: str) -> OperationStats:
+        stats = self.operations.get(operation)
+        if stats is None:
+            stats = self.operations[operation] = OperationStats()
+        return stats
+
+    async def execute(self, operation: str, call: ChatCall) -> ChatResult:
+        """Resposta da operação; a última falha é propagada quando as tentativas acabam"""
+        policy = RetryPolicy.for_operation(operation)
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(operation, policy, call)
+            except AIUnavailableError:
+                raise
+            except Exception as e:
+                attempt += 1
+                if not is_transient_error(e) or attempt >= policy.max_attempts:
+                    raise
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None and retry_after > policy.max_retry_after:
+                    raise
+                delay = policy.backoff(attempt - 1, retry_after)
+                self._stats["retries"] += 1
+                logger.warning(f"AI {operation} attempt {attempt} failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _timed(self, operation: str, policy: RetryPolicy, call: ChatCall) -> ChatResult:
+        started = time.perf_counter()
+        result = await call(policy.timeout)
+        self._operation(operation).record((time.perf_counter() - started) * 1000, result.total_tokens)
+        self._stats["tokens"] += result.total_tokens
+        return result
+
+    def _hedge_allowed(self, estimated_tokens: float) -> bool:
+        """Orçamento de tokens e vaga livre no limitador (um hedge na fila não ajudaria)"""
+        budget = self.hedge_token_budget * self._stats["tokens"]
+        return (self._stats["hedge_tokens"] + estimated_tokens <= budget
+                and self.transport.limiter.available > 0)
+
+    async def _attempt(self, operation: str, policy: RetryPolicy, call: ChatCall) -> ChatResult:
+        cutoff_ms = self._operation(operation).p95_ms() if policy.hedge else None
+        if cutoff_ms is None:
+            return await self._timed(operation, policy, call)
+
+        primary_started = time.perf_counter()
+        primary = asyncio.create_task(self._timed(operation, policy, call))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=cutoff_ms / 1000)
+        except BaseException:
+            primary.cancel()
+            await asyncio.gather(primary, return_exceptions=True)
+            raise
+        if done:
+            return primary.result()
+
+        estimated_tokens = self._operation(operation).avg_tokens
+        if not self._hedge_allowed(estimated_tokens):
+            self._stats["hedges_skipped"] += 1
+            return await primary
+
+        self._stats["hedges"] += 1
+        self._stats["hedge_tokens"] += estimated_tokens
+        hedge = asyncio.create_task(self._timed(operation, policy, call))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        # Cancelada por fora (ex.: encerramento): vale o erro da outra, se houver
+                        error = error or asyncio.CancelledError()
+                        continue
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if primary in pending:
+                # Sem a amostra da principal (a mais lenta), o p95 encolheria a cada hedge vencedor
+                elapsed_ms = (time.perf_counter() - primary_started) * 1000
+                self._operation(operation).record_censored(max(elapsed_ms, cutoff_ms))
+            # Esperar a limpeza das perdedoras (vaga do limitador liberada antes de retornar)
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores e p95 por operação (para o endpoint de métricas)"""
+        return {
+            **self._stats,
+            "hedge_tokens": round(self._stats["hedge_tokens"]),
+            "p95_ms": {
+                operation: round(stats.p95_ms(1) or 0, 2)
+                for operation, stats in self.operations.items()
+            }
+        }
+
+
+# Instância global (janelas de latência compartilhadas pelos serviços do processo)
+ai_executor = AIRequestExecutor()
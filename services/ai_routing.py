@@ -0,0 +1,127 @@
+"""
+Roteamento de modelos da IA
+Cada operação usa o modelo de AISettings.MODEL_ROUTES (extração estruturada num modelo menor e
+mais rápido, raciocínio no OPENAI_MODEL). A saída é validada contra o schema da operação e, se
+falhar no modelo roteado, é refeita no modelo principal. Latência, tokens e custo são contados
+por operação e modelo, para ajustar a tabela de rotas com dados
+"""
+from typing import Any, Dict
+import logging
+import threading
+
+from core.config import settings, ai_settings
+from services.ai_transport import ChatResult
+
+logger = logging.getLogger(__name__)
+
+# Formato mínimo esperado de cada operação: tipo, {chave: schema} ou [schema dos itens]
+OUTPUT_SCHEMAS: Dict[str, Any] = {
+    "resume": {"extractedSkills": [{"name": str}], "experience": list, "education": list},
+    "job": {"keyRequirements": [str], "requiredSkills": [str], "experienceLevel": str},
+    "compatibility": {
+        "overallScore": (int, float),
+        "categoryScores": dict,
+        "strengths": list,
+        "weaknesses": list,
+        "recommendations": list
+    },
+    "cover_letter": {"fullText": str},
+    "skills": {"skills": [{"name": str}]},
+    "improvements": {"suggestions": [str]}
+}
+
+
+def matches_schema(value: Any, schema: Any) -> bool:
+    """Validar `value` contra o schema (chaves extras são permitidas)"""
+    if isinstance(schema, dict):
+        return isinstance(value, dict) and all(
+            key in value and matches_schema(value[key], item) for key, item in schema.items()
+        )
+    if isinstance(schema, list):
+        return isinstance(value, list) and all(matches_schema(item, schema[0]) for item in value)
+    if schema in (int, float, (int, float)) and isinstance(value, bool):
+        return False
+    return isinstance(value, schema)
+
+
+def validate_output(operation: str, result: Any) -> bool:
+    """Operações sem schema registrado são aceitas"""
+    schema = OUTPUT_SCHEMAS.get(operation)
+    return schema is None or matches_schema(result, schema)
+
+
+def token_cost(model: str, result: ChatResult) -> float:
+    """Custo em USD da chamada (0 para modelos sem preço em AISettings.MODEL_PRICES)"""
+    prompt_price, completion_price = ai_settings.MODEL_PRICES.get(model, (0.0, 0.0))
+    return (result.prompt_tokens * prompt_price + result.completion_tokens * completion_price) / 1000
+
+
+class ModelRouter:
+    """Modelo de cada operação e contadores por operação e modelo"""
+
+    def __init__(self, default_model: str = settings.OPENAI_MODEL):
+        self.default_model = default_model
+        self._usage: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def model_for(self, operation: str) -> str:
+        return ai_settings.MODEL_ROUTES.get(operation, self.default_model)
+
+    def _counters(self, operation: str, model: str) -> Dict[str, float]:
+        models = self._usage.setdefault(operation, {})
+        counters = models.get(model)
+        if counters is None:
+            counters = models[model] = {
+                "calls": 0,
+                "errors": 0,
+                "schema_failures": 0,
+                "escalations": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost_usd": 0.0,
+                "total_ms": 0.0,
+                "max_ms": 0.0
+            }
+        return counters
+
+    def record_call(self, operation: str, model: str, latency_ms: float, result: ChatResult) -> None:
+        with self._lock:
+            counters = self._counters(operation, model)
+            counters["calls"] += 1
+            counters["prompt_tokens"] += result.prompt_tokens
+            counters["completion_tokens"] += result.completion_tokens
+            counters["cost_usd"] += token_cost(model, result)
+            counters["total_ms"] += latency_ms
+            counters["max_ms"] = max(counters["max_ms"], latency_ms)
+
+    def record_error(self, operation: str, model: str) -> None:
+        with self._lock:
+            self._counters(operation, model)["errors"] += 1
+
+    def record_schema_failure(self, operation: str, model: str, escalated: bool) -> None:
+        """Saída de `model` reprovada no schema (refeita no modelo principal se `escalated`)"""
+        with self._lock:
+            counters = self._counters(operation, model)
+            counters["schema_failures"] += 1
+            counters["escalations"] += int(escalated)
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Contadores por operação e modelo (para o endpoint de métricas)"""
+        with self._lock:
+            return {
+                operation: {
+                    model: {
+                        **counters,
+                        "cost_usd": round(counters["cost_usd"], 6),
+                        "total_ms": round(counters["total_ms"], 2),
+                        "max_ms": round(counters["max_ms"], 2),
+                        "avg_ms": round(counters["total_ms"] / counters["calls"], 2) if counters["calls"] else 0.0
+                    }
+                    for model, counters in models.items()
+                }
+                for operation, models in self._usage.items()
+            }
+
+
+# Instância global
+model_router = ModelRouter()
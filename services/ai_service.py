@@ -2,28 +2,48 @@
 Serviço de IA
 Integração com OpenAI e outros serviços de IA
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import json
-import openai
 import logging
+import re
+import time
 from datetime import datetime
 
 from core.config import settings, ai_settings
+from services.ai_limiter import AIBackpressureError, AIUnavailableError
+from services.ai_retry import AIRequestExecutor, ai_executor
+from services.ai_routing import ModelRouter, model_router, validate_output
+from services.ai_transport import AITransport, ai_transport
 
 logger = logging.getLogger(__name__)
 
+# Score local (fallback sem IA): termos da vaga encontrados no currículo
+_TERM_PATTERN = re.compile(r"[a-zà-ÿ0-9][a-zà-ÿ0-9+#.]{2,}")
+_STOPWORDS = frozenset("""
+    para com como uma dos das nos nas que por mais sua seu são ser ter tem será entre sobre
+    anos ano experiência conhecimento conhecimentos desejável vaga empresa trabalho área
+    the and for with you are our will your from have this that years experience
+""".split())
+
 
 class AIService:
     """Serviço de integração com IA"""
     
-    def __init__(self):
-        openai.api_key = settings.OPENAI_API_KEY
+    def __init__(self, transport: Optional[AITransport] = None):
+        self.transport = transport or ai_transport
+        self.executor = ai_executor if self.transport is ai_transport else AIRequestExecutor(self.transport)
         self.model = settings.OPENAI_MODEL
+        self.router = model_router if self.model == model_router.default_model else ModelRouter(self.model)
         self.max_tokens = ai_settings.MAX_TOKENS
         self.temperature = ai_settings.TEMPERATURE
     
+    @property
+    def unavailable(self) -> bool:
+        """Circuito da IA aberto: as chamadas seriam recusadas sem ir à API"""
+        return self.transport.breaker.is_open
+    
     async def analyze_resume(self, resume_content: str) -> Dict[str, Any]:
-        """Analisar currículo usando IA"""
+        """Analisar currículo usando IA (`aiModel`: modelo que gerou a resposta)"""
         try:
             prompt = f"""
             {ai_settings.RESUME_ANALYSIS_PROMPT}
@@ -63,15 +83,21 @@ class AIService:
             }}
             """
             
-            response = await self._call_openai(prompt)
-            return self._parse_json_response(response, "resume analysis")
+            result, model = await self._call_structured(prompt, "resume", "resume analysis")
+            return {**result, "aiModel": model}
             
+        except AIBackpressureError:
+            # Fila cheia: quem chama decide entre adiar a análise e o fallback local
+            raise
+        except AIUnavailableError as e:
+            logger.warning(f"AI unavailable, using default resume analysis: {e}")
+            return {**self._get_default_resume_analysis(), "fallback": True}
         except Exception as e:
             logger.error(f"Error analyzing resume: {e}")
             return self._get_default_resume_analysis()
     
     async def analyze_job_description(self, job_content: str) -> Dict[str, Any]:
-        """Analisar descrição da vaga usando IA"""
+        """Analisar descrição da vaga usando IA (`aiModel`: modelo que gerou a resposta)"""
         try:
             prompt = f"""
             Analise a seguinte descrição de vaga e extraia as informações estruturadas:
@@ -94,16 +120,21 @@ class AIService:
             }}
             """
             
-            response = await self._call_openai(prompt)
-            return self._parse_json_response(response, "job analysis")
+            result, model = await self._call_structured(prompt, "job", "job analysis")
+            return {**result, "aiModel": model}
             
+        except AIBackpressureError:
+            raise
+        except AIUnavailableError as e:
+            logger.warning(f"AI unavailable, using default job analysis: {e}")
+            return {**self._get_default_job_analysis(), "fallback": True}
         except Exception as e:
             logger.error(f"Error analyzing job description: {e}")
             return self._get_default_job_analysis()
     
     async def analyze_compatibility(self, resume_analysis: Dict[str, Any], 
                                   job_analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Analisar compatibilidade entre currículo e vaga"""
+        """Analisar compatibilidade entre currículo e vaga (`aiModel`: modelo que gerou a resposta)"""
         try:
             prompt = f"""
             {ai_settings.COMPATIBILITY_ANALYSIS_PROMPT}
@@ -145,9 +176,14 @@ class AIService:
             }}
             """
             
-            response = await self._call_openai(prompt)
-            return self._parse_json_response(response, "compatibility analysis")
+            result, model = await self._call_structured(prompt, "compatibility", "compatibility analysis")
+            return {**result, "aiModel": model}
             
+        except AIBackpressureError:
+            raise
+        except AIUnavailableError as e:
+            logger.warning(f"AI unavailable, using default compatibility analysis: {e}")
+            return {**self._get_default_compatibility_analysis(), "fallback": True}
         except Exception as e:
             logger.error(f"Error analyzing compatibility: {e}")
             return self._get_default_compatibility_analysis()
@@ -191,8 +227,8 @@ class AIService:
             }}
             """
             
-            response = await self._call_openai(prompt)
-            return self._parse_json_response(response, "cover letter generation")
+            result, _ = await self._call_structured(prompt, "cover_letter", "cover letter generation")
+            return result
             
         except Exception as e:
             logger.error(f"Error generating cover letter: {e}")
@@ -223,8 +259,7 @@ class AIService:
             }}
             """
             
-            response = await self._call_openai(prompt)
-            result = self._parse_json_response(response, "skill extraction")
+            result, _ = await self._call_structured(prompt, "skills", "skill extraction")
             return result.get("skills", [])
             
         except Exception as e:
@@ -251,39 +286,75 @@ class AIService:
             }}
             """
             
-            response = await self._call_openai(prompt)
-            result = self._parse_json_response(response, "improvement suggestions")
+            result, _ = await self._call_structured(prompt, "improvements", "improvement suggestions")
             return result.get("suggestions", [])
             
         except Exception as e:
             logger.error(f"Error suggesting improvements: {e}")
             return []
     
-    async def _call_openai(self, prompt: str) -> str:
-        """Chamar API do OpenAI"""
+    async def _call_structured(self, prompt: str, operation: str,
+                               description: str) -> Tuple[Dict[str, Any], str]:
+        """(JSON da operação, modelo que o gerou) no modelo roteado; saída inválida (JSON ou
+        schema) de um modelo diferente do principal é refeita no OPENAI_MODEL"""
+        model = self.router.model_for(operation)
+        response = await self._call_openai(prompt, operation, model)
         try:
-            response = await openai.ChatCompletion.acreate(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Você é um especialista em análise de currículos e recrutamento. Sempre retorne respostas em JSON válido."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            result = self._parse_json_response(response, description)
+            if validate_output(operation, result):
+                return result, model
+        except ValueError:
+            if model == self.model:
+                raise
+            result = None
+        
+        escalate = model != self.model
+        self.router.record_schema_failure(operation, model, escalate)
+        if not escalate:
+            logger.warning(f"AI output for {description} does not match the expected schema")
+            return result, model
+        
+        logger.warning(f"AI output for {description} from {model} rejected, retrying with {self.model}")
+        response = await self._call_openai(prompt, operation, self.model)
+        return self._parse_json_response(response, description), self.model
+    
+    async def _call_openai(self, prompt: str, operation: str = "default",
+                           model: Optional[str] = None) -> str:
+        """Chamar API do OpenAI (retry e hedge conforme a política da operação)"""
+        model = model or self.model
+        messages = [
+            {
+                "role": "system",
+                "content": "Você é um especialista em análise de currículos e recrutamento. Sempre retorne respostas em JSON válido."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        
+        def call(timeout: Optional[float]):
+            return self.transport.chat(
+                model=model,
+                messages=messages,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
-                top_p=ai_settings.TOP_P
+                top_p=ai_settings.TOP_P,
+                timeout=timeout
             )
-            
-            return response.choices[0].message.content.strip()
-            
+        
+        started = time.perf_counter()
+        try:
+            result = await self.executor.execute(operation, call)
+        except AIUnavailableError:
+            raise
         except Exception as e:
+            self.router.record_error(operation, model)
             logger.error(f"Error calling OpenAI API: {e}")
             raise
+        
+        self.router.record_call(operation, model, (time.perf_counter() - started) * 1000, result)
+        return result.content
     
     def _parse_json_response(self, response: str, operation: str) -> Dict[str, Any]:
         """Parsear resposta JSON da IA"""
@@ -350,6 +421,29 @@ class AIService:
             "improvementAreas": []
         }
     
+    def score_locally(self, resume_content: str, job_content: str) -> Dict[str, Any]:
+        """Compatibilidade estimada sem IA: fração dos termos da vaga presentes no currículo"""
+        job_terms = set(_TERM_PATTERN.findall(job_content.lower())) - _STOPWORDS
+        resume_terms = set(_TERM_PATTERN.findall(resume_content.lower()))
+        matched = sorted(job_terms & resume_terms)
+        missing = sorted(job_terms - resume_terms)
+        score = round(100 * len(matched) / len(job_terms), 1) if job_terms else 0.0
+        
+        return {
+            "overallScore": score,
+            "categoryScores": {
+                "skills": score,
+                "experience": 0.0,
+                "education": 0.0,
+                "cultural": 0.0
+            },
+            "strengths": [f"Termos da vaga no currículo: {', '.join(matched[:15])}"] if matched else [],
+            "weaknesses": [f"Termos da vaga ausentes: {', '.join(missing[:15])}"] if missing else [],
+            "recommendations": ["Score estimado por palavras-chave; a análise detalhada está indisponível no momento"],
+            "improvementAreas": [],
+            "scoredBy": "local"
+        }
+    
     def _get_default_cover_letter(self) -> Dict[str, Any]:
         """Carta padrão em caso de erro"""
         return {
@@ -396,8 +490,8 @@ class AIService:
             }}
             """
             
-            response = await self._call_openai(prompt)
-            return self._parse_json_response(response, "market trends analysis")
+            result, _ = await self._call_structured(prompt, "market_trends", "market trends analysis")
+            return result
             
         except Exception as e:
             logger.error(f"Error analyzing market trends: {e}")
@@ -440,8 +534,7 @@ class AIService:
             }}
             """
             
-            response = await self._call_openai(prompt)
-            result = self._parse_json_response(response, "interview questions")
+            result, _ = await self._call_structured(prompt, "interview_questions", "interview questions")
             return result.get("questions", [])
             
         except Exception as e:
@@ -0,0 +1,183 @@
+"""
+Transporte da IA
+Um cliente OpenAI por processo sobre um httpx.AsyncClient compartilhado: conexões mantidas entre
+chamadas (keep-alive), limite de conexões e de requisições simultâneas, HTTP/2 quando o pacote h2
+está instalado e timeout por requisição. OPENAI_BASE_URL aponta o cliente para um servidor local
+compatível (mock) em testes e benchmarks. As chamadas passam pelo limitador adaptativo e pelo
+circuit breaker de services/ai_limiter.py
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, TYPE_CHECKING
+import asyncio
+import importlib.util
+import logging
+import time
+
+from core.config import settings
+from services.ai_limiter import AIUnavailableError, AdaptiveConcurrencyLimiter, CircuitBreaker
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+
+class ChatResult(NamedTuple):
+    """Texto da resposta e tokens cobrados"""
+    content: str
+    total_tokens: int
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+def http2_available() -> bool:
+    """HTTP/2 no httpx depende do extra `httpx[http2]` (pacote h2)"""
+    return importlib.util.find_spec("h2") is not None
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Falhas que indicam API sobrecarregada ou fora do ar (429, 5xx, timeout, conexão)"""
+    import openai
+
+    return isinstance(error, (
+        openai.RateLimitError, openai.InternalServerError,
+        openai.APITimeoutError, openai.APIConnectionError, asyncio.TimeoutError
+    ))
+
+
+class AITransport:
+    """Cliente OpenAI compartilhado, criado na primeira chamada (SDK e httpx importados só então)"""
+
+    def __init__(self, base_url: str = settings.OPENAI_BASE_URL,
+                 api_key: str = settings.OPENAI_API_KEY,
+                 max_connections: int = settings.OPENAI_MAX_CONNECTIONS,
+                 max_keepalive_connections: int = settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = settings.OPENAI_KEEPALIVE_EXPIRY,
+                 limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 timeout: float = settings.OPENAI_TIMEOUT,
+                 connect_timeout: float = settings.OPENAI_CONNECT_TIMEOUT,
+                 http2: bool = settings.OPENAI_HTTP2,
+                 max_retries: int = settings.OPENAI_MAX_RETRIES):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.limiter = limiter or AdaptiveConcurrencyLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.http2 = http2
+        self.max_retries = max_retries
+        self._client: Optional["AsyncOpenAI"] = None
+        self._stats = {
+            "requests": 0,
+            "errors": 0,
+            "tokens": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0
+        }
+
+    @property
+    def client(self) -> "AsyncOpenAI":
+        if self._client is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            http2 = self.http2 and http2_available()
+            if self.http2 and not http2:
+                logger.info("Package h2 not installed, OpenAI transport using HTTP/1.1")
+
+            timeout = httpx.Timeout(self.timeout, connect=self.connect_timeout)
+            http_client = httpx.AsyncClient(
+                http2=http2,
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                )
+            )
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url or None,
+                http_client=http_client,
+                timeout=timeout,
+                max_retries=self.max_retries
+            )
+        return self._client
+
+    async def chat(self, messages: List[Dict[str, str]], model: str, max_tokens: int,
+                   temperature: float, top_p: float, timeout: Optional[float] = None) -> ChatResult:
+        """Chat completion; `timeout` substitui o padrão só nesta requisição.
+        AIUnavailableError quando o circuito está aberto ou o limitador não libera vaga"""
+        client = self.client
+        options: Dict[str, Any] = {}
+        if timeout is not None:
+            options["timeout"] = timeout
+
+        await self.limiter.acquire()
+        if not self.breaker.allow():
+            self.limiter.release()
+            raise AIUnavailableError("AI circuit breaker is open")
+
+        started = time.perf_counter()
+        try:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                **options
+            )
+        except Exception as e:
+            self._stats["errors"] += 1
+            if is_transient_error(e):
+                self.breaker.record_failure()
+                self.limiter.release(overloaded=True)
+            else:
+                self.breaker.release()
+                self.limiter.release()
+            raise
+        except BaseException:
+            # Cancelada (ex.: timeout do chamador): libera a vaga sem ajustar o limite
+            self.breaker.release()
+            self.limiter.release()
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._stats["requests"] += 1
+            self._stats["total_ms"] += elapsed_ms
+            self._stats["max_ms"] = max(self._stats["max_ms"], elapsed_ms)
+
+        self.breaker.record_success()
+        self.limiter.release(elapsed_ms)
+
+        usage = response.usage
+        total_tokens = usage.total_tokens if usage else 0
+        self._stats["tokens"] += total_tokens
+        return ChatResult(
+            (response.choices[0].message.content or "").strip(), total_tokens,
+            usage.prompt_tokens if usage else 0, usage.completion_tokens if usage else 0
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores das chamadas (para o endpoint de métricas)"""
+        stats = dict(self._stats)
+        stats["avg_ms"] = round(stats["total_ms"] / stats["requests"], 2) if stats["requests"] else 0.0
+        stats["total_ms"] = round(stats["total_ms"], 2)
+        stats["max_ms"] = round(stats["max_ms"], 2)
+        stats["limiter"] = self.limiter.stats()
+        stats["breaker"] = self.breaker.stats()
+        return stats
+
+    async def close(self) -> None:
+        """Fechar as conexões do pool (shutdown); uma nova chamada recria o cliente"""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.close()
+
+
+# Instância global (uma por processo)
+ai_transport = AITransport()
@@ -2,21 +2,31 @@
 Serviço de Análise
 Lógica de negócio para análises de compatibilidade
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID, uuid4
 from datetime import datetime
+from functools import cached_property
+import asyncio
 import json
 import hashlib
 import logging
 
-from app.core.config import settings, ai_settings
-from app.models.domain import CompatibilityAnalysis, AnalysisStatus
-from app.dto.requests import AnalysisCreateRequest
-from app.dto.responses import AnalysisResponse, DetailedAnalysisResponse
-from app.data.sql_repository import AnalysisRepository, ResumeRepository
-from app.data.mongo_repository import AnalysisMongoRepository, AIAnalysisCacheRepository, ActivityLogMongoRepository
-from app.services.ai_service import AIService
-from app.services.file_service import FileService
+from core.config import settings, ai_settings
+from core.container import container
+from core.responses import make_etag
+from core.events import event_bus, ANALYSIS_CREATED, ANALYSIS_COMPLETED, ANALYSIS_FAILED
+from domain.entities.domain import CompatibilityAnalysis, AnalysisStatus
+from domain.factories.analysis_factory import AnalysisFactory
+from schemas.requests.requests import AnalysisCreateRequest, BulkAnalysisRequest, CursorPaginationRequest
+from schemas.responses.responses import AnalysisResponse, DetailedAnalysisResponse, CursorPaginatedResponse
+from data.sql_repository import AnalysisRepository, ResumeRepository
+from data.mongo_repository import AnalysisMongoRepository, AIAnalysisCacheRepository
+from data.activity_log_buffer import activity_logger
+from mappers import AnalysisMapper
+from services.ai_limiter import AIBackpressureError
+from services.ai_service import AIService
+from services.statistics_service import StatisticsService
+from services.file_service import FileService
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +37,46 @@ class AnalysisService:
     def __init__(self):
         self.analysis_repo = AnalysisRepository()
         self.resume_repo = ResumeRepository()
-        self.mongo_repo = AnalysisMongoRepository()
-        self.cache_repo = AIAnalysisCacheRepository()
-        self.activity_repo = ActivityLogMongoRepository()
-        self.ai_service = AIService()
-        self.file_service = FileService()
+        self.activity_logger = activity_logger
+        self.statistics_service = container.get(StatisticsService)
+        # Processamento em segundo plano quando não há workers de análise
+        self._processing_tasks: set = set()
+        self._processing_slots: Optional[asyncio.Semaphore] = None
+    
+    # Instância única do container; dependências usadas só em alguns caminhos (processamento,
+    # detalhe, cache de IA) são criadas no primeiro acesso e compartilhadas por todas as
+    # requisições e análises simultâneas do processo: precisam ser seguras para uso concorrente
+    # (sem estado por chamada, sem fechar clientes compartilhados; o close() abaixo é o único)
+    
+    @cached_property
+    def mongo_repo(self) -> AnalysisMongoRepository:
+        return AnalysisMongoRepository()
+    
+    @cached_property
+    def cache_repo(self) -> AIAnalysisCacheRepository:
+        return AIAnalysisCacheRepository()
+    
+    @cached_property
+    def ai_service(self) -> AIService:
+        return AIService()
+    
+    @cached_property
+    def file_service(self) -> FileService:
+        return FileService()
+    
+    async def close(self) -> None:
+        """Fechar só as dependências já criadas"""
+        if self._processing_tasks:
+            # Dar tempo às análises em andamento; as que não terminarem ficam para a fila
+            _, pending = await asyncio.wait(self._processing_tasks, timeout=settings.WORKER_SHUTDOWN_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        for name in ("mongo_repo", "cache_repo"):
+            if name in self.__dict__:
+                await self.__dict__[name].disconnect()
+        if "file_service" in self.__dict__:
+            await self.file_service.close()
     
     async def create_analysis(self, user_id: UUID, request: AnalysisCreateRequest) -> AnalysisResponse:
         """Criar nova análise de compatibilidade"""
@@ -41,6 +86,11 @@ class AnalysisService:
             if not resume or resume.user_id != user_id:
                 raise ValueError("Resume not found or access denied")
             
+            # Com workers de análise, fica pendente na fila; a descrição avulsa da vaga não é
+            # persistida, então essas análises são processadas aqui e já nascem em 'processing'
+            # (com lease), fora do alcance da fila
+            process_inline = not self.uses_analysis_workers() or bool(request.job_description)
+            
             # Criar análise no SQL
             analysis = CompatibilityAnalysis(
                 analysis_id=uuid4(),
@@ -48,14 +98,19 @@ class AnalysisService:
                 resume_id=request.resume_id,
                 job_id=request.job_id,
                 match_score=0.0,  # Será atualizado após processamento
-                status=AnalysisStatus.PENDING,
+                status=AnalysisStatus.PROCESSING if process_inline else AnalysisStatus.PENDING,
                 analysis_type=request.analysis_type
             )
             
             created_analysis = await self.analysis_repo.create_analysis(analysis)
+            await self.statistics_service.record_analysis_created(user_id)
+            await event_bus.publish(ANALYSIS_CREATED, {
+                "user_id": user_id,
+                "analysis_id": created_analysis.analysis_id
+            })
             
             # Log da atividade
-            await self.activity_repo.log_activity({
+            await self.activity_logger.log_activity({
                 "userId": str(user_id),
                 "action": "analysis_created",
                 "resource": "analysis",
@@ -67,8 +122,8 @@ class AnalysisService:
                 }
             })
             
-            # Processar análise em background (simulado)
-            await self._process_analysis_async(created_analysis, request.job_description)
+            if process_inline:
+                await self._process_analysis_async(created_analysis, request.job_description)
             
             return AnalysisResponse(
                 analysis_id=created_analysis.analysis_id,
@@ -87,30 +142,140 @@ class AnalysisService:
             logger.error(f"Error creating analysis: {e}")
             raise
     
-    async def get_analysis(self, analysis_id: UUID, user_id: UUID) -> Optional[DetailedAnalysisResponse]:
-        """Obter análise detalhada"""
+    async def create_bulk_analyses(self, user_id: UUID, request: BulkAnalysisRequest) -> List[AnalysisResponse]:
+        """Criar análises de vários currículos para a mesma vaga (um INSERT em lote)"""
         try:
-            # Buscar análise no SQL
-            sql_result = await self.analysis_repo.execute_query(
-                """
-                SELECT AnalysisId, UserId, ResumeId, JobId, MatchScore, Status,
-                       AnalysisType, ProcessingTimeMs, CreatedAt, CompletedAt, MongoAnalysisId
-                FROM CompatibilityAnalyses 
-                WHERE AnalysisId = :analysis_id AND UserId = :user_id
-                """,
-                {"analysis_id": str(analysis_id), "user_id": str(user_id)}
-            )
+            owned = set(await self.resume_repo.get_owned_resume_ids(user_id, request.resume_ids))
+            if owned != set(request.resume_ids):
+                raise ValueError("Resume not found or access denied")
             
-            if not sql_result:
-                return None
+            analyses = AnalysisFactory.make_bulk_analysis(request, user_id)
+            created = await self.analysis_repo.create_analyses(analyses)
+            await self.statistics_service.record_analysis_created(user_id, count=len(created))
+            
+            for analysis in created:
+                await event_bus.publish(ANALYSIS_CREATED, {
+                    "user_id": user_id,
+                    "analysis_id": analysis.analysis_id
+                })
+            
+            await self.activity_logger.log_activity({
+                "userId": str(user_id),
+                "action": "bulk_analysis_created",
+                "resource": "analysis",
+                "details": {
+                    "analysis_ids": [str(a.analysis_id) for a in created],
+                    "job_id": str(request.job_id)
+                }
+            })
+            
+            # Ficam pendentes: os workers reservam da fila; sem workers, processa fora da requisição
+            if not self.uses_analysis_workers():
+                self._process_in_background(created)
+            
+            return [
+                AnalysisResponse(
+                    analysis_id=analysis.analysis_id,
+                    user_id=analysis.user_id,
+                    resume_id=analysis.resume_id,
+                    job_id=analysis.job_id,
+                    match_score=analysis.match_score,
+                    status=analysis.status,
+                    analysis_type=analysis.analysis_type,
+                    processing_time_ms=analysis.processing_time_ms,
+                    created_at=analysis.created_at,
+                    completed_at=analysis.completed_at
+                )
+                for analysis in created
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error creating bulk analyses: {e}")
+            raise
+    
+    @staticmethod
+    def uses_analysis_workers() -> bool:
+        """Análises processadas pelo pool de workers (server.py) em vez da requisição"""
+        return settings.ANALYSIS_WORKERS > 0
+    
+    def _process_in_background(self, analyses: List[CompatibilityAnalysis]) -> None:
+        """Processar as análises numa task, até ANALYSIS_WORKER_CONCURRENCY ao mesmo tempo"""
+        if self._processing_slots is None:
+            self._processing_slots = asyncio.Semaphore(settings.ANALYSIS_WORKER_CONCURRENCY)
+        
+        async def process(analysis: CompatibilityAnalysis) -> None:
+            async with self._processing_slots:
+                await self._process_analysis_async(analysis, None)
+        
+        async def process_all() -> None:
+            results = await asyncio.gather(*(process(analysis) for analysis in analyses), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error processing analysis in background: {result}")
+        
+        task = asyncio.create_task(process_all())
+        self._processing_tasks.add(task)
+        task.add_done_callback(self._processing_tasks.discard)
+    
+    async def process_pending_analyses(self, limit: int) -> int:
+        """Reservar e processar até `limit` análises pendentes (workers de análise)
+        
+        Retorna as processadas; as devolvidas à fila por backpressure da IA não contam, para o
+        worker esperar antes de reservar de novo.
+        """
+        analyses = await asyncio.to_thread(self.analysis_repo.claim_pending_analyses, limit)
+        if not analyses:
+            return 0
+        processed = await asyncio.gather(*(
+            self._process_analysis_async(analysis, requeue_on_backpressure=True) for analysis in analyses
+        ))
+        return sum(processed)
+    
+    async def get_analysis_etag(self, analysis_id: UUID, user_id: UUID,
+                                full_report: bool = False) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Obter ETag da análise a partir dos metadados SQL (sem acessar o MongoDB)"""
+        analysis_data = await self.analysis_repo.get_analysis_row(analysis_id, user_id)
+        if not analysis_data:
+            return None
+        return self.analysis_etag(analysis_data, full_report), analysis_data
+    
+    @staticmethod
+    def analysis_etag(analysis_data: Dict[str, Any], full_report: bool = False) -> str:
+        """ETag forte: o documento detalhado só muda junto com estes campos"""
+        return make_etag(
+            "analysis",
+            str(analysis_data["AnalysisId"]).lower(),
+            analysis_data["MongoAnalysisId"],
+            analysis_data["Status"],
+            analysis_data["MatchScore"],
+            analysis_data["CompletedAt"].isoformat() if analysis_data["CompletedAt"] else None,
+            # Relatório resumido e completo são representações diferentes
+            "full" if full_report else "summary"
+        )
+    
+    async def get_analysis(self, analysis_id: UUID, user_id: UUID,
+                           analysis_data: Optional[Dict[str, Any]] = None,
+                           full_report: bool = False) -> Optional[DetailedAnalysisResponse]:
+        """Obter análise detalhada
+        
+        Por padrão traz só o relatório de compatibilidade (scores, pontos fortes, recomendações),
+        com os campos das análises do currículo e da vaga em None; full_report os inclui
+        (payload comprimido).
+        """
+        try:
+            # Buscar análise no SQL (reutiliza os metadados já lidos para o ETag)
+            if analysis_data is None:
+                analysis_data = await self.analysis_repo.get_analysis_row(analysis_id, user_id)
             
-            analysis_data = sql_result[0]
+            if not analysis_data:
+                return None
             
             # Buscar detalhes no MongoDB
             detailed_analysis = None
             if analysis_data["MongoAnalysisId"]:
+                # O documento é gravado com analysisId = AnalysisId do SQL
                 detailed_analysis = await self.mongo_repo.get_detailed_analysis(
-                    analysis_data["MongoAnalysisId"]
+                    str(UUID(str(analysis_data["AnalysisId"]))), include_payload=full_report
                 )
             
             if not detailed_analysis:
@@ -151,51 +316,61 @@ class AnalysisService:
     async def get_user_analyses(self, user_id: UUID, limit: int = 50) -> List[AnalysisResponse]:
         """Obter análises do usuário"""
         try:
-            analyses = await self.analysis_repo.get_user_analyses(user_id, limit)
-            
-            return [
-                AnalysisResponse(
-                    analysis_id=analysis.analysis_id,
-                    user_id=analysis.user_id,
-                    resume_id=analysis.resume_id,
-                    job_id=analysis.job_id,
-                    match_score=analysis.match_score,
-                    status=analysis.status,
-                    analysis_type=analysis.analysis_type,
-                    processing_time_ms=analysis.processing_time_ms,
-                    created_at=analysis.created_at,
-                    completed_at=analysis.completed_at
-                )
-                for analysis in analyses
-            ]
+            page = await self.analysis_repo.get_user_analyses_page(user_id, limit, as_rows=True)
+            return AnalysisMapper.rows_to_responses(page.items, AnalysisResponse)
             
         except Exception as e:
             logger.error(f"Error getting user analyses: {e}")
             return []
     
+    async def get_user_analyses_page(self, user_id: UUID,
+                                     request: CursorPaginationRequest) -> CursorPaginatedResponse[AnalysisResponse]:
+        """Obter página de análises do usuário (cursor opaco, sem COUNT(*) por padrão)"""
+        page = await self.analysis_repo.get_user_analyses_page(
+            user_id, request.limit, request.cursor, request.include_total, as_rows=True
+        )
+        
+        return CursorPaginatedResponse[AnalysisResponse].create(
+            data=AnalysisMapper.rows_to_responses(page.items, AnalysisResponse),
+            limit=request.limit,
+            next_cursor=page.next_cursor,
+            total=page.total,
+            total_capped=page.total_capped
+        )
+    
     async def _process_analysis_async(self, analysis: CompatibilityAnalysis, 
-                                    job_description: Optional[str] = None) -> None:
-        """Processar análise de forma assíncrona"""
+                                    job_description: Optional[str] = None,
+                                    requeue_on_backpressure: bool = False) -> bool:
+        """Processar análise de forma assíncrona
+        
+        Com requeue_on_backpressure (workers), fila da IA esgotada devolve a análise para
+        'pending' e retorna False; sem ele, usa o score local como no circuito aberto.
+        """
         try:
             start_time = datetime.utcnow()
             
             # Atualizar status para processando
             await self.analysis_repo.update_analysis_status(
                 analysis.analysis_id, 
-                AnalysisStatus.PROCESSING.value
+                AnalysisStatus.PROCESSING.value,
+                user_id=analysis.user_id
             )
             
             # Obter conteúdo do currículo
             resume_content = await self._get_resume_content(analysis.resume_id)
             if not resume_content:
-                await self._handle_analysis_error(analysis.analysis_id, "Failed to extract resume content")
-                return
+                await self._handle_analysis_error(
+                    analysis.analysis_id, "Failed to extract resume content", analysis.user_id
+                )
+                return True
             
             # Obter descrição da vaga
             job_content = await self._get_job_content(analysis.job_id, job_description)
             if not job_content:
-                await self._handle_analysis_error(analysis.analysis_id, "Failed to get job description")
-                return
+                await self._handle_analysis_error(
+                    analysis.analysis_id, "Failed to get job description", analysis.user_id
+                )
+                return True
             
             # Verificar cache
             cache_key = self._generate_cache_key(resume_content, job_content)
@@ -205,10 +380,19 @@ class AnalysisService:
                 detailed_analysis = cached_result["result"]
             else:
                 # Processar com IA
-                detailed_analysis = await self._analyze_with_ai(resume_content, job_content)
+                try:
+                    detailed_analysis = await self._analyze_with_ai(resume_content, job_content)
+                except AIBackpressureError as e:
+                    if requeue_on_backpressure:
+                        # API lenta, não fora do ar: outra tentativa depois vale mais que o score local
+                        logger.info(f"AI backpressure, analysis {analysis.analysis_id} back to queue: {e}")
+                        await asyncio.to_thread(self.analysis_repo.release_claim, analysis.analysis_id)
+                        return False
+                    detailed_analysis = self._analyze_locally(resume_content, job_content)
                 
-                # Armazenar em cache
-                await self.cache_repo.cache_analysis(cache_key, detailed_analysis, ttl_hours=24)
+                # Armazenar em cache (resultado do fallback local não é cacheado)
+                if not detailed_analysis.get("degraded"):
+                    await self.cache_repo.cache_analysis(cache_key, detailed_analysis, ttl_hours=24)
             
             # Salvar análise detalhada no MongoDB
             detailed_analysis["analysisId"] = str(analysis.analysis_id)
@@ -222,32 +406,35 @@ class AnalysisService:
             processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
             
             # Atualizar análise no SQL
-            await self.analysis_repo.execute_query(
-                """
-                UPDATE CompatibilityAnalyses 
-                SET MatchScore = :match_score,
-                    Status = 'completed',
-                    ProcessingTimeMs = :processing_time,
-                    CompletedAt = GETUTCDATE(),
-                    MongoAnalysisId = :mongo_id
-                WHERE AnalysisId = :analysis_id
-                """,
-                {
-                    "analysis_id": str(analysis.analysis_id),
-                    "match_score": detailed_analysis["compatibilityReport"]["overallScore"],
-                    "processing_time": processing_time,
-                    "mongo_id": mongo_id
-                }
+            await self.analysis_repo.complete_analysis(
+                analysis.analysis_id,
+                detailed_analysis["compatibilityReport"]["overallScore"],
+                processing_time,
+                mongo_id,
+                user_id=analysis.user_id
             )
             
             # Atualizar estatísticas do currículo
             await self.resume_repo.update_resume_analysis_stats(
                 analysis.resume_id,
-                detailed_analysis["compatibilityReport"]["overallScore"]
+                detailed_analysis["compatibilityReport"]["overallScore"],
+                user_id=analysis.user_id
             )
             
+            # Atualizar estatísticas pré-calculadas do usuário
+            await self.statistics_service.record_analysis_completed(
+                analysis.user_id,
+                detailed_analysis["compatibilityReport"]["overallScore"],
+                processing_time
+            )
+            await event_bus.publish(ANALYSIS_COMPLETED, {
+                "user_id": analysis.user_id,
+                "analysis_id": analysis.analysis_id,
+                "match_score": detailed_analysis["compatibilityReport"]["overallScore"]
+            })
+            
             # Log da atividade
-            await self.activity_repo.log_activity({
+            await self.activity_logger.log_activity({
                 "userId": str(analysis.user_id),
                 "action": "analysis_completed",
                 "resource": "analysis",
@@ -259,9 +446,12 @@ class AnalysisService:
                 }
             })
             
+            return True
+            
         except Exception as e:
             logger.error(f"Error processing analysis: {e}")
-            await self._handle_analysis_error(analysis.analysis_id, str(e))
+            await self._handle_analysis_error(analysis.analysis_id, str(e), analysis.user_id)
+            return True
     
     async def _get_resume_content(self, resume_id: UUID) -> Optional[str]:
         """Obter conteúdo do currículo"""
@@ -322,16 +512,30 @@ class AnalysisService:
     async def _analyze_with_ai(self, resume_content: str, job_content: str) -> Dict[str, Any]:
         """Analisar compatibilidade usando IA"""
         try:
+            # Circuito da IA aberto: score local, sem esperar pelas chamadas recusadas
+            if self.ai_service.unavailable:
+                return self._analyze_locally(resume_content, job_content)
+            
+            # Modelo de cada etapa (extração pode ter ido ao modelo menor ou escalado ao principal)
+            models = {}
+            
             # Análise do currículo
             resume_analysis = await self.ai_service.analyze_resume(resume_content)
+            models["resume"] = resume_analysis.pop("aiModel", None)
             
             # Análise da vaga
             job_analysis = await self.ai_service.analyze_job_description(job_content)
+            models["job"] = job_analysis.pop("aiModel", None)
             
             # Análise de compatibilidade
             compatibility_report = await self.ai_service.analyze_compatibility(
                 resume_analysis, job_analysis
             )
+            models["compatibility"] = compatibility_report.pop("aiModel", None)
+            
+            # Circuito abriu no meio da análise: os padrões zerados dariam score 0
+            if any(part.get("fallback") for part in (resume_analysis, job_analysis, compatibility_report)):
+                return self._analyze_locally(resume_content, job_content)
             
             return {
                 "matchScore": compatibility_report["overallScore"],
@@ -339,27 +543,54 @@ class AnalysisService:
                 "resumeAnalysis": resume_analysis,
                 "compatibilityReport": compatibility_report,
                 "processingTime": 0,  # Será calculado externamente
-                "aiModel": settings.OPENAI_MODEL,
+                "aiModel": models["compatibility"] or "unknown",
+                "aiModels": {step: model for step, model in models.items() if model},
                 "version": "1.0"
             }
             
+        except AIBackpressureError:
+            raise
         except Exception as e:
             logger.error(f"Error analyzing with AI: {e}")
             raise
     
+    def _analyze_locally(self, resume_content: str, job_content: str) -> Dict[str, Any]:
+        """Análise degradada (IA indisponível): score por palavras-chave, sem extração estruturada"""
+        compatibility_report = self.ai_service.score_locally(resume_content, job_content)
+        
+        return {
+            "matchScore": compatibility_report["overallScore"],
+            "jobAnalysis": self.ai_service._get_default_job_analysis(),
+            "resumeAnalysis": self.ai_service._get_default_resume_analysis(),
+            "compatibilityReport": compatibility_report,
+            "processingTime": 0,
+            "aiModel": "local",
+            "version": "1.0",
+            "degraded": True
+        }
+    
     def _generate_cache_key(self, resume_content: str, job_content: str) -> str:
         """Gerar chave de cache para análise"""
         combined_content = f"{resume_content}|{job_content}"
         return hashlib.sha256(combined_content.encode()).hexdigest()
     
-    async def _handle_analysis_error(self, analysis_id: UUID, error_message: str) -> None:
+    async def _handle_analysis_error(self, analysis_id: UUID, error_message: str,
+                                     user_id: Optional[UUID] = None) -> None:
         """Tratar erro na análise"""
         try:
             await self.analysis_repo.update_analysis_status(
                 analysis_id, 
-                AnalysisStatus.FAILED.value
+                AnalysisStatus.FAILED.value,
+                user_id=user_id
             )
             
+            if user_id:
+                await self.statistics_service.record_analysis_failed(user_id)
+                await event_bus.publish(ANALYSIS_FAILED, {
+                    "user_id": user_id,
+                    "analysis_id": analysis_id
+                })
+            
             logger.error(f"Analysis {analysis_id} failed: {error_message}")
             
         except Exception as e:
@@ -369,16 +600,23 @@ class AnalysisService:
                                  sql_data: Dict[str, Any]) -> DetailedAnalysisResponse:
         """Converter dados do MongoDB para resposta da API"""
         try:
+            # Payload frio (análises da vaga e do currículo) só vem com full_report
+            job_analysis = mongo_data.get("jobAnalysis")
+            resume_analysis = mongo_data.get("resumeAnalysis")
+            
+            def resume_field(name: str) -> Optional[List[Any]]:
+                return resume_analysis.get(name, []) if resume_analysis is not None else None
+            
             return DetailedAnalysisResponse(
                 analysis_id=UUID(sql_data["AnalysisId"]),
                 match_score=mongo_data.get("matchScore", 0.0),
                 status=sql_data["Status"],
-                job_analysis=mongo_data.get("jobAnalysis", {}),
-                extracted_skills=mongo_data.get("resumeAnalysis", {}).get("extractedSkills", []),
-                experience_matches=mongo_data.get("resumeAnalysis", {}).get("experience", []),
-                education=mongo_data.get("resumeAnalysis", {}).get("education", []),
-                languages=mongo_data.get("resumeAnalysis", {}).get("languages", []),
-                certifications=mongo_data.get("resumeAnalysis", {}).get("certifications", []),
+                job_analysis=job_analysis,
+                extracted_skills=resume_field("extractedSkills"),
+                experience_matches=resume_field("experience"),
+                education=resume_field("education"),
+                languages=resume_field("languages"),
+                certifications=resume_field("certifications"),
                 compatibility_scores=mongo_data.get("compatibilityReport", {}).get("categoryScores", {}),
                 strengths=mongo_data.get("compatibilityReport", {}).get("strengths", []),
                 weaknesses=mongo_data.get("compatibilityReport", {}).get("weaknesses", []),
@@ -393,35 +631,37 @@ class AnalysisService:
             logger.error(f"Error converting mongo data to response: {e}")
             raise
     
-    async def get_analysis_statistics(self, user_id: UUID) -> Dict[str, Any]:
-        """Obter estatísticas de análises do usuário"""
+    async def get_analysis_statistics(self, user_id: UUID, include_analytics: bool = False,
+                                      since: Optional[datetime] = None) -> Dict[str, Any]:
+        """Obter estatísticas de análises do usuário
+        
+        Com include_analytics, lê as análises em modo colunar (AnalysisBatch) e acrescenta
+        percentis, distribuição de scores e tendência diária calculados com NumPy.
+        """
         try:
-            # Estatísticas do SQL
-            sql_stats = await self.analysis_repo.execute_query(
-                """
-                SELECT 
-                    COUNT(*) as total_analyses,
-                    COUNT(CASE WHEN Status = 'completed' THEN 1 END) as completed_analyses,
-                    COUNT(CASE WHEN Status = 'pending' THEN 1 END) as pending_analyses,
-                    COUNT(CASE WHEN Status = 'failed' THEN 1 END) as failed_analyses,
-                    AVG(CASE WHEN Status = 'completed' THEN MatchScore END) as average_score,
-                    MAX(CASE WHEN Status = 'completed' THEN MatchScore END) as best_score,
-                    AVG(CASE WHEN Status = 'completed' THEN ProcessingTimeMs END) as avg_processing_time
-                FROM CompatibilityAnalyses 
-                WHERE UserId = :user_id
-                """,
-                {"user_id": str(user_id)}
-            )
+            # Leitura única das estatísticas pré-calculadas
+            statistics = await self.statistics_service.get_user_statistics(user_id)
             
-            # Estatísticas do MongoDB
-            mongo_stats = await self.mongo_repo.get_analysis_statistics(str(user_id))
-            
-            return {
-                "sql_stats": sql_stats[0] if sql_stats else {},
-                "mongo_stats": mongo_stats,
-                "generated_at": datetime.utcnow()
+            result = {
+                "sql_stats": StatisticsService.analysis_stats(statistics),
+                "mongo_stats": StatisticsService.score_stats(statistics),
+                "generated_at": statistics.get("updatedAt", datetime.utcnow())
             }
             
+            if include_analytics:
+                batch = await self.analysis_repo.get_user_analyses_batch(user_id, since)
+                result["analytics"] = {
+                    "total_analyses": len(batch),
+                    "status_counts": batch.status_counts(),
+                    "average_score": batch.average_score(),
+                    "score_percentiles": batch.score_percentiles(),
+                    "processing_time_percentiles": batch.processing_time_percentiles(),
+                    "score_distribution": batch.score_distribution(),
+                    "daily_trend": batch.daily_trend()
+                }
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Error getting analysis statistics: {e}")
             return {}
@@ -0,0 +1,119 @@
+"""
+Worker de Análises
+Processo dedicado que consome a fila de análises pendentes (CompatibilityAnalyses com
+Status = 'pending'), fora dos workers web; iniciado pelo launcher (server.py). Cada reserva vale
+por ANALYSIS_CLAIM_LEASE_SECONDS: análises de um worker que morreu voltam para a fila ao vencer
+"""
+from typing import Optional, Dict, Any
+import asyncio
+import logging
+import signal
+
+from core.config import settings
+from core.container import container
+from core.process_metrics import ProcessMetricsWriter
+from data.activity_log_buffer import activity_logger
+from data.query_registry import query_registry
+from data.sql_router import dispose_engine_router, engine_router_stats, warm_up_engine_router
+from services.ai_retry import ai_executor
+from services.ai_routing import model_router
+from services.ai_transport import ai_transport
+from services.analysis_service import AnalysisService
+from services.statistics_service import StatisticsService
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisWorker:
+    """Loop de consumo: reserva um lote, processa em paralelo e volta a consultar a fila"""
+
+    def __init__(self, index: int, service: Optional[AnalysisService] = None,
+                 concurrency: int = settings.ANALYSIS_WORKER_CONCURRENCY,
+                 poll_seconds: float = settings.ANALYSIS_WORKER_POLL_SECONDS):
+        self.index = index
+        self.service = service or container.get(AnalysisService)
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self._stopping = asyncio.Event()
+        self.stats = {
+            "batches": 0,
+            "processed": 0,
+            "errors": 0
+        }
+        self.metrics_writer = ProcessMetricsWriter("analysis", self.collect_metrics)
+
+    def collect_metrics(self) -> Dict[str, Any]:
+        return {
+            "analysis_worker": dict(self.stats),
+            "activity_log": {**activity_logger.stats, "pending": activity_logger.pending},
+            "sql_queries": query_registry.stats(),
+            "sql_routing": engine_router_stats(),
+            "ai_transport": ai_transport.stats(),
+            "ai_requests": ai_executor.stats(),
+            "ai_models": model_router.stats()
+        }
+
+    def stop(self) -> None:
+        """Parar após o lote atual (as análises em andamento são concluídas)"""
+        self._stopping.set()
+
+    @property
+    def batch_size(self) -> int:
+        """Lote acompanha o limite adaptativo da IA: com a API lenta, menos análises por vez"""
+        return max(1, min(self.concurrency, int(ai_transport.limiter.limit)))
+
+    async def run_once(self) -> int:
+        processed = await self.service.process_pending_analyses(self.batch_size)
+        if processed:
+            self.stats["batches"] += 1
+            self.stats["processed"] += processed
+        return processed
+
+    async def run(self) -> None:
+        try:
+            await asyncio.to_thread(warm_up_engine_router, settings.SQL_WARM_CONNECTIONS)
+        except Exception as e:
+            logger.warning(f"SQL pool warm-up skipped: {e}")
+        activity_logger.start()
+        self.metrics_writer.start()
+        logger.info(f"Analysis worker {self.index} started")
+
+        try:
+            while not self._stopping.is_set():
+                try:
+                    processed = await self.run_once()
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.error(f"Analysis worker {self.index} error: {e}")
+                    processed = 0
+
+                # Lote cheio: provavelmente há mais na fila, consultar de novo sem esperar
+                if processed < self.batch_size:
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self.metrics_writer.stop()
+            await activity_logger.stop()
+            await container.close()
+            await ai_transport.close()
+            dispose_engine_router()
+            logger.info(f"Analysis worker {self.index} stopped: {self.stats}")
+
+
+def run_analysis_worker(index: int) -> None:
+    """Ponto de entrada do processo (SIGTERM/SIGINT encerram após o lote atual)"""
+    logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL), format=settings.LOG_FORMAT)
+
+    async def main() -> None:
+        # Só os serviços que o worker usa (o container da API registra todos no lifespan)
+        for service_type in (AnalysisService, StatisticsService):
+            container.register(service_type)
+        worker = AnalysisWorker(index)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, worker.stop)
+        await worker.run()
+
+    asyncio.run(main())
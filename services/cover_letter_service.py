@@ -0,0 +1,62 @@
+"""
+Serviço de Cartas de Apresentação
+Leitura do conteúdo das cartas (MongoDB)
+"""
+from typing import Optional, Dict, Any
+from uuid import UUID
+import logging
+
+from core.responses import make_etag
+from schemas.responses.responses import CoverLetterContentResponse
+from data.mongo_repository import CoverLetterMongoRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CoverLetterService:
+    """Serviço de cartas de apresentação"""
+    
+    def __init__(self):
+        self.mongo_repo = CoverLetterMongoRepository()
+    
+    async def close(self) -> None:
+        await self.mongo_repo.disconnect()
+    
+    async def get_cover_letter_etag(self, cover_letter_id: UUID, user_id: UUID) -> Optional[str]:
+        """Obter ETag da carta lendo só a projeção {userId, updatedAt}"""
+        version = await self.mongo_repo.get_cover_letter_version(str(cover_letter_id))
+        if not version or version.get("userId") != str(user_id):
+            return None
+        return self.cover_letter_etag(cover_letter_id, version.get("updatedAt"))
+    
+    @staticmethod
+    def cover_letter_etag(cover_letter_id: UUID, updated_at: Any) -> str:
+        """ETag forte derivado do ID e do updatedAt da carta"""
+        return make_etag(
+            "cover_letter",
+            str(cover_letter_id),
+            updated_at.isoformat() if updated_at else None
+        )
+    
+    async def get_cover_letter_content(self, cover_letter_id: UUID,
+                                       user_id: UUID) -> Optional[CoverLetterContentResponse]:
+        """Obter conteúdo da carta do usuário"""
+        document = await self.mongo_repo.get_cover_letter(str(cover_letter_id))
+        if not document or document.get("userId") != str(user_id):
+            return None
+        
+        return self._to_content_response(cover_letter_id, document)
+    
+    def _to_content_response(self, cover_letter_id: UUID,
+                             document: Dict[str, Any]) -> CoverLetterContentResponse:
+        """Converter documento MongoDB para resposta"""
+        return CoverLetterContentResponse(
+            cover_letter_id=cover_letter_id,
+            content=document.get("content") or {},
+            customizations=document.get("customizations") or {},
+            edit_history=document.get("editHistory") or [],
+            generated_by=document.get("generatedBy", "ai"),
+            ai_model=document.get("aiModel", "unknown"),
+            language=document.get("language", "pt-BR"),
+            word_count=document.get("wordCount", 0)
+        )
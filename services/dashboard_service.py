@@ -0,0 +1,324 @@
+"""
+Serviço de Dashboard
+Agrega estatísticas, atividades, análises e notificações em paralelo, com cache por usuário
+"""
+from typing import Optional, List, Dict, Any, Tuple, Awaitable
+from uuid import UUID
+from datetime import datetime, timedelta
+import asyncio
+import logging
+
+from cachetools import TTLCache
+
+from core.config import settings
+from core.container import container
+from core.events import event_bus, ANALYSIS_CREATED, ANALYSIS_COMPLETED, ANALYSIS_FAILED
+from schemas.requests.requests import DashboardStatsRequest, CursorPaginationRequest, BulkNotificationUpdateRequest
+from schemas.responses.responses import (
+    DashboardResponse, DashboardStatsResponse, RecentActivityResponse,
+    AnalysisResponse, NotificationResponse, CursorPaginatedResponse
+)
+from data.sql_repository import DashboardRepository, NotificationRepository
+from data.mongo_repository import ActivityLogMongoRepository
+from mappers import AnalysisMapper
+from services.statistics_service import StatisticsService
+
+logger = logging.getLogger(__name__)
+
+PERIOD_DAYS = {"7d": 7, "30d": 30, "90d": 90, "1y": 365, "all": None}
+
+ACTIVITY_TITLES = {
+    "user_registered": "Conta criada",
+    "user_login": "Login realizado",
+    "profile_updated": "Perfil atualizado",
+    "password_changed": "Senha alterada",
+    "analysis_created": "Análise iniciada",
+    "analysis_completed": "Análise concluída"
+}
+
+
+class DashboardCache:
+    """Cache do dashboard por usuário/período com invalidação por versão
+
+    A versão local cobre os eventos deste processo; a versão compartilhada (updatedAt das
+    estatísticas do usuário no MongoDB) cobre as escritas de outros processos, como a conclusão
+    de uma análise num worker: a entrada só vale se foi montada com a versão compartilhada atual.
+    """
+
+    def __init__(self, maxsize: int = settings.DASHBOARD_CACHE_MAX_ENTRIES,
+                 ttl: int = settings.DASHBOARD_CACHE_TTL):
+        # Entradas: (versão compartilhada, resposta)
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Invalidar um usuário = remover as entradas da versão atual e incrementá-la (montagens em
+        # andamento com a versão antiga não são gravadas). Versões expiram com o mesmo TTL; uma
+        # versão expirada volta a 0 sem risco, pois as entradas antigas já foram removidas
+        self._versions: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+
+    def _key(self, user_id: UUID, period: str, include_details: bool) -> Tuple:
+        user_key = str(user_id)
+        return (user_key, self._versions.get(user_key, 0), period, include_details)
+
+    def get(self, user_id: UUID, period: str, include_details: bool,
+            shared_version: Any = None) -> Optional[DashboardResponse]:
+        """Buscar dashboard em cache"""
+        entry = self._entries.get(self._key(user_id, period, include_details))
+        if entry is None or entry[0] != shared_version:
+            return None
+        return entry[1]
+
+    def set(self, user_id: UUID, period: str, include_details: bool, value: DashboardResponse,
+            shared_version: Any = None) -> None:
+        """Armazenar dashboard em cache"""
+        self._entries[self._key(user_id, period, include_details)] = (shared_version, value)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        """Invalidar todos os períodos do usuário"""
+        user_key = str(user_id)
+        version = self._versions.get(user_key, 0)
+        for period in PERIOD_DAYS:
+            for include_details in (False, True):
+                self._entries.pop((user_key, version, period, include_details), None)
+        self._versions[user_key] = version + 1
+
+    def on_analysis_event(self, payload: Dict[str, Any]) -> None:
+        """Handler de eventos de análise"""
+        if payload.get("user_id"):
+            self.invalidate_user(payload["user_id"])
+
+    async def get_or_build(self, user_id: UUID, period: str, include_details: bool,
+                           builder, shared_version: Any = None) -> DashboardResponse:
+        """Buscar em cache ou montar, compartilhando montagens concorrentes"""
+        cached = self.get(user_id, period, include_details, shared_version)
+        if cached is not None:
+            return cached
+
+        key = self._key(user_id, period, include_details)
+        in_flight_key = (*key, shared_version)
+        in_flight = self._in_flight.get(in_flight_key)
+        if in_flight is not None:
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # Montagem do dono foi cancelada (não esta requisição): monta de novo
+                return await self.get_or_build(user_id, period, include_details, builder, shared_version)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[in_flight_key] = future
+        try:
+            response = await builder()
+            # Respostas parciais não são cacheadas
+            if not response.missing_sections and key == self._key(user_id, period, include_details):
+                self._entries[key] = (shared_version, response)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            # Evita "exception was never retrieved" quando ninguém aguardava
+            future.exception()
+            raise
+        except BaseException:
+            # Dono cancelado (cliente desconectou, timeout): libera quem aguardava
+            future.cancel()
+            raise
+        finally:
+            self._in_flight.pop(in_flight_key, None)
+
+
+# Cache global do dashboard (compartilhado entre instâncias do serviço)
+dashboard_cache = DashboardCache()
+
+for _event in (ANALYSIS_CREATED, ANALYSIS_COMPLETED, ANALYSIS_FAILED):
+    event_bus.subscribe(_event, dashboard_cache.on_analysis_event)
+
+
+class DashboardService:
+    """Serviço de dashboard"""
+
+    def __init__(self):
+        self.dashboard_repo = DashboardRepository()
+        self.notification_repo = NotificationRepository()
+        self.activity_repo = ActivityLogMongoRepository()
+        self.statistics_service = container.get(StatisticsService)
+        self.cache = dashboard_cache
+        self.part_timeout = settings.DASHBOARD_PART_TIMEOUT
+
+    async def close(self) -> None:
+        await self.activity_repo.disconnect()
+
+    async def get_dashboard(self, user_id: UUID, request: DashboardStatsRequest) -> DashboardResponse:
+        """Obter dashboard completo (cacheado por usuário e período)
+
+        Uma leitura pontual da versão das estatísticas valida o cache contra escritas de outros
+        processos. Escrita recente (dentro de SQL_READ_YOUR_WRITES_SECONDS) leva a montagem para o
+        primário, já que a marcação de read-your-writes do processo que escreveu não chega aqui.
+        """
+        shared_version = await self.statistics_service.stats_repo.get_statistics_version(str(user_id))
+        if (isinstance(shared_version, datetime)
+                and datetime.utcnow() - shared_version < timedelta(seconds=settings.SQL_READ_YOUR_WRITES_SECONDS)):
+            self.dashboard_repo.mark_write(user_id)
+
+        return await self.cache.get_or_build(
+            user_id, request.period, request.include_details,
+            lambda: self._build_dashboard(user_id, request),
+            shared_version=shared_version
+        )
+
+    async def get_activities_page(self, user_id: UUID,
+                                  request: CursorPaginationRequest) -> CursorPaginatedResponse[RecentActivityResponse]:
+        """Histórico de atividades paginado por cursor (continuação de recent_activities)"""
+        page = await self.activity_repo.get_user_activities_page(
+            str(user_id), request.limit, request.cursor, request.include_total
+        )
+
+        return CursorPaginatedResponse[RecentActivityResponse].create(
+            data=[self._to_activity_response(activity) for activity in page.items],
+            limit=request.limit,
+            next_cursor=page.next_cursor,
+            total=page.total,
+            total_capped=page.total_capped
+        )
+
+    async def _build_dashboard(self, user_id: UUID, request: DashboardStatsRequest) -> DashboardResponse:
+        """Buscar as quatro partes em paralelo, com timeout individual"""
+        days = PERIOD_DAYS.get(request.period)
+        since = datetime.utcnow() - timedelta(days=days) if days else None
+        limit = 10 if request.include_details else 5
+
+        parts = {
+            "stats": self._get_stats(user_id, since, days or 365),
+            "recent_activities": self._get_recent_activities(user_id, limit),
+            "recent_analyses": self._get_recent_analyses(user_id, limit),
+            "notifications": self._get_notifications(user_id, limit)
+        }
+
+        results = await asyncio.gather(
+            *(self._run_part(name, coro) for name, coro in parts.items())
+        )
+        values = dict(zip(parts.keys(), results))
+        missing_sections = [name for name, value in values.items() if value is None]
+
+        return DashboardResponse(
+            stats=values["stats"] or self._empty_stats(),
+            recent_activities=values["recent_activities"] or [],
+            recent_analyses=values["recent_analyses"] or [],
+            notifications=values["notifications"] or [],
+            missing_sections=missing_sections
+        )
+
+    async def _run_part(self, name: str, coro: Awaitable) -> Optional[Any]:
+        """Executar uma parte do dashboard; timeout/erro resulta em None (resposta parcial)"""
+        try:
+            return await asyncio.wait_for(coro, timeout=self.part_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dashboard section '{name}' timed out after {self.part_timeout}s")
+        except Exception as e:
+            logger.error(f"Error getting dashboard section '{name}': {e}")
+        return None
+
+    async def _get_stats(self, user_id: UUID, since: Optional[datetime], trend_days: int) -> DashboardStatsResponse:
+        """Estatísticas do período (SQL) com tendência das estatísticas pré-calculadas"""
+        stats, distribution, statistics = await asyncio.gather(
+            self.dashboard_repo.get_dashboard_stats(user_id, since),
+            self.dashboard_repo.get_score_distribution(user_id, since),
+            self.statistics_service.get_user_statistics(user_id)
+        )
+
+        return DashboardStatsResponse(
+            saved_resumes=stats.get("SavedResumes") or 0,
+            average_match=float(stats.get("AverageMatch") or 0.0),
+            best_match=stats.get("BestMatchTitle"),
+            best_match_percentage=float(stats.get("BestMatchScore") or 0.0),
+            total_analyses=stats.get("TotalAnalyses") or 0,
+            this_month=stats.get("ThisMonth") or 0,
+            completed_analyses=stats.get("CompletedAnalyses") or 0,
+            pending_analyses=stats.get("PendingAnalyses") or 0,
+            cover_letters_generated=stats.get("CoverLettersGenerated") or 0,
+            profile_views=0,
+            analysis_trend=StatisticsService.analysis_trend(statistics, trend_days),
+            match_score_distribution=[
+                {"range": f"{row['Bucket']}-{row['Bucket'] + 10}", "count": row["Count"]}
+                for row in distribution
+            ]
+        )
+
+    async def _get_recent_activities(self, user_id: UUID, limit: int) -> List[RecentActivityResponse]:
+        """Atividades recentes (MongoDB)"""
+        activities = await self.activity_repo.get_user_activities(str(user_id), limit)
+        return [self._to_activity_response(activity) for activity in activities]
+
+    async def _get_recent_analyses(self, user_id: UUID, limit: int) -> List[AnalysisResponse]:
+        """Análises recentes (SQL)"""
+        rows = await self.dashboard_repo.get_recent_analyses(user_id, limit)
+        return AnalysisMapper.rows_to_responses(rows, AnalysisResponse)
+
+    async def _get_notifications(self, user_id: UUID, limit: int) -> List[NotificationResponse]:
+        """Notificações não expiradas (SQL)"""
+        notifications = await self.notification_repo.get_user_notifications(user_id, limit)
+
+        return [
+            NotificationResponse(
+                notification_id=notification.notification_id,
+                type=notification.type,
+                title=notification.title,
+                message=notification.message,
+                action_url=notification.action_url,
+                is_read=notification.is_read,
+                created_at=notification.created_at,
+                read_at=notification.read_at,
+                expires_at=notification.expires_at
+            )
+            for notification in notifications
+        ]
+
+    async def update_notifications(self, user_id: UUID, request: BulkNotificationUpdateRequest) -> int:
+        """Marcar notificações como lidas/não lidas (um único UPDATE)"""
+        updated = await self.notification_repo.mark_notifications(
+            user_id, request.notification_ids, request.is_read
+        )
+        if updated:
+            # As notificações fazem parte do dashboard cacheado (neste e nos demais processos)
+            self.cache.invalidate_user(user_id)
+            await self.statistics_service.stats_repo.touch_statistics(str(user_id))
+        return updated
+
+    def _to_activity_response(self, activity: Dict[str, Any]) -> RecentActivityResponse:
+        """Converter log de atividade para item do dashboard"""
+        action = activity.get("action", "unknown")
+        details = activity.get("details") or {}
+
+        description = action.replace("_", " ").capitalize()
+        if "match_score" in details:
+            description = f"Score de compatibilidade: {details['match_score']}%"
+
+        resource_id = None
+        try:
+            if activity.get("resourceId"):
+                resource_id = UUID(str(activity["resourceId"]))
+        except ValueError:
+            pass
+
+        return RecentActivityResponse(
+            activity_type=action,
+            title=ACTIVITY_TITLES.get(action, description),
+            description=description,
+            timestamp=activity.get("timestamp") or datetime.utcnow(),
+            resource_id=resource_id,
+            resource_type=activity.get("resource")
+        )
+
+    def _empty_stats(self) -> DashboardStatsResponse:
+        """Estatísticas vazias (usadas quando a seção falha)"""
+        return DashboardStatsResponse(
+            saved_resumes=0,
+            average_match=0.0,
+            best_match_percentage=0.0,
+            total_analyses=0,
+            this_month=0,
+            completed_analyses=0,
+            pending_analyses=0,
+            cover_letters_generated=0,
+            profile_views=0
+        )
@@ -0,0 +1,294 @@
+"""
+Serviço de Jobs de Exportação
+Gera exportações grandes em segundo plano como arquivos ZIP em disco local
+"""
+from typing import Optional, Dict, Any, List
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from pathlib import Path
+import asyncio
+import json
+import logging
+import zipfile
+
+from core.config import settings
+from core.container import container
+from schemas.requests.requests import DataExportRequest
+from schemas.responses.responses import ExportResponse
+from data.sql_repository import DataLakeRepository
+from services.export_service import ExportService, FILE_EXTENSIONS
+from services.file_service import FileService
+
+logger = logging.getLogger(__name__)
+
+JOB_PROCESSING = "processing"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class ExportJob:
+    """Estado de um job de exportação"""
+    export_id: UUID
+    user_id: UUID
+    request: DataExportRequest
+    status: str = JOB_PROCESSING
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    file_size: Optional[int] = None
+    error: Optional[str] = None
+    progress: Dict[str, Any] = field(default_factory=lambda: {
+        "stage": "queued",
+        "records_bytes": 0,
+        "files_total": 0,
+        "files_done": 0,
+        "files_failed": 0,
+        "bytes_written": 0
+    })
+
+    def to_manifest(self) -> Dict[str, Any]:
+        """Estado serializável (manifesto ao lado do artefato)"""
+        return {
+            "export_id": str(self.export_id),
+            "user_id": str(self.user_id),
+            "request": self.request.model_dump(mode="json"),
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "file_size": self.file_size,
+            "error": self.error,
+            "progress": self.progress
+        }
+
+    @classmethod
+    def from_manifest(cls, data: Dict[str, Any]) -> "ExportJob":
+        """Reconstruir job a partir do manifesto"""
+        return cls(
+            export_id=UUID(data["export_id"]),
+            user_id=UUID(data["user_id"]),
+            request=DataExportRequest(**data["request"]),
+            status=data["status"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            completed_at=datetime.fromisoformat(data["completed_at"]) if data.get("completed_at") else None,
+            expires_at=datetime.fromisoformat(data["expires_at"]) if data.get("expires_at") else None,
+            file_size=data.get("file_size"),
+            error=data.get("error"),
+            progress=data.get("progress") or {}
+        )
+
+
+class ExportJobManager:
+    """Executa e acompanha jobs de exportação"""
+
+    def __init__(self, storage_dir: str = settings.EXPORT_STORAGE_DIR,
+                 max_concurrent: int = settings.EXPORT_MAX_CONCURRENT_JOBS,
+                 ttl_hours: int = settings.EXPORT_ARTIFACT_TTL_HOURS):
+        self.storage_dir = Path(storage_dir)
+        self.ttl = timedelta(hours=ttl_hours)
+        self.max_concurrent = max_concurrent
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._jobs: Dict[UUID, ExportJob] = {}
+        self._tasks: Dict[UUID, asyncio.Task] = {}
+
+    def requires_job(self, request: DataExportRequest) -> bool:
+        """Exportações grandes (com arquivos ou completas) rodam em segundo plano"""
+        return request.include_files or request.export_type == "all"
+
+    def artifact_path(self, export_id: UUID) -> Path:
+        return self.storage_dir / f"{export_id}.zip"
+
+    def manifest_path(self, export_id: UUID) -> Path:
+        return self.storage_dir / f"{export_id}.json"
+
+    def download_filename(self, job: ExportJob) -> str:
+        return f"skillsync_{job.request.export_type}_{job.created_at.strftime('%Y%m%d%H%M%S')}.zip"
+
+    async def submit(self, user_id: UUID, request: DataExportRequest) -> ExportJob:
+        """Criar job e iniciar a geração em segundo plano"""
+        ExportService.validate_request(request)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        await asyncio.to_thread(self.storage_dir.mkdir, parents=True, exist_ok=True)
+        await asyncio.to_thread(self._cleanup_expired)
+
+        job = ExportJob(export_id=uuid4(), user_id=user_id, request=request)
+        self._jobs[job.export_id] = job
+        await self._save_manifest(job)
+
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job.export_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.export_id, None))
+
+        return job
+
+    async def get_job(self, export_id: UUID, user_id: UUID) -> Optional[ExportJob]:
+        """Buscar job do usuário (memória ou manifesto em disco)"""
+        job = self._jobs.get(export_id)
+
+        if job is None:
+            # Jobs de outros processos/reinícios continuam acessíveis pelo manifesto
+            manifest_path = self.manifest_path(export_id)
+            if not await asyncio.to_thread(manifest_path.exists):
+                return None
+            data = json.loads(await asyncio.to_thread(manifest_path.read_text))
+            job = ExportJob.from_manifest(data)
+
+        if job.user_id != user_id:
+            return None
+        if job.expires_at and job.expires_at < datetime.utcnow():
+            return None
+
+        return job
+
+    def to_response(self, job: ExportJob) -> ExportResponse:
+        """Converter job para resposta"""
+        download_url = None
+        if job.status == JOB_COMPLETED:
+            download_url = f"{settings.API_V1_STR}/export/jobs/{job.export_id}/download"
+
+        return ExportResponse(
+            success=job.status != JOB_FAILED,
+            export_id=job.export_id,
+            export_type=job.request.export_type,
+            format=job.request.format,
+            status=job.status,
+            download_url=download_url,
+            expires_at=job.expires_at,
+            file_size=job.file_size,
+            progress=job.progress,
+            message=job.error
+        )
+
+    async def shutdown(self) -> None:
+        """Cancelar jobs em andamento (o artefato parcial é descartado)"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: ExportJob) -> None:
+        """Executar o job respeitando o limite de concorrência"""
+        partial_path = self.artifact_path(job.export_id).with_suffix(".zip.part")
+
+        try:
+            async with self._semaphore:
+                await self._build_archive(job, partial_path)
+
+            # Renomear só ao final: o download nunca vê um ZIP incompleto
+            await asyncio.to_thread(partial_path.replace, self.artifact_path(job.export_id))
+
+            job.status = JOB_COMPLETED
+            job.completed_at = datetime.utcnow()
+            job.expires_at = job.completed_at + self.ttl
+            job.file_size = (await asyncio.to_thread(self.artifact_path(job.export_id).stat)).st_size
+            job.progress["stage"] = "completed"
+            logger.info(f"Export {job.export_id} completed ({job.file_size} bytes)")
+
+        except asyncio.CancelledError:
+            job.status = JOB_FAILED
+            job.error = "Export cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Error running export {job.export_id}: {e}")
+            job.status = JOB_FAILED
+            job.error = "Export failed"
+        finally:
+            if job.status != JOB_COMPLETED:
+                job.expires_at = datetime.utcnow() + self.ttl
+                await asyncio.to_thread(partial_path.unlink, missing_ok=True)
+            await self._save_manifest(job)
+            self._jobs.pop(job.export_id, None)
+
+    async def _build_archive(self, job: ExportJob, path: Path) -> None:
+        """Escrever o ZIP incrementalmente: dados exportados e, opcionalmente, arquivos do Data Lake"""
+        # Instância do container: os clientes dos repositórios (Motor) duram o processo todo
+        export_service = container.get(ExportService)
+        # O ZIP já comprime cada entrada; gzip interno seria redundante
+        data_request = job.request.model_copy(update={"compress": False})
+        data_entry = f"data.{FILE_EXTENSIONS[job.request.format]}"
+
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            job.progress["stage"] = "records"
+            with archive.open(data_entry, "w", force_zip64=True) as entry:
+                async for chunk in export_service.stream_export(job.user_id, data_request):
+                    await asyncio.to_thread(entry.write, chunk)
+                    job.progress["records_bytes"] += len(chunk)
+                    job.progress["bytes_written"] += len(chunk)
+
+            if job.request.include_files:
+                await self._write_files(job, archive)
+
+    async def _write_files(self, job: ExportJob, archive: zipfile.ZipFile) -> None:
+        """Copiar os arquivos do usuário para o ZIP, chunk a chunk"""
+        files = await DataLakeRepository().get_user_files(
+            job.user_id, job.request.date_from, job.request.date_to
+        )
+
+        job.progress["stage"] = "files"
+        job.progress["files_total"] = len(files)
+        failed: List[str] = []
+
+        file_service = FileService()
+        try:
+            for file_ref in files:
+                entry_name = f"files/{file_ref.file_id}_{Path(file_ref.filename).name}"
+                try:
+                    with archive.open(entry_name, "w", force_zip64=True) as entry:
+                        async for chunk in file_service.stream_file(file_ref):
+                            await asyncio.to_thread(entry.write, chunk)
+                            job.progress["bytes_written"] += len(chunk)
+                    job.progress["files_done"] += 1
+                except Exception as e:
+                    # Um arquivo indisponível não invalida a exportação inteira
+                    logger.error(f"Error exporting file {file_ref.file_id}: {e}")
+                    failed.append(str(file_ref.file_id))
+                    job.progress["files_failed"] = len(failed)
+        finally:
+            await file_service.close()
+
+        if failed:
+            await asyncio.to_thread(
+                archive.writestr, "files/FAILED.txt", "\n".join(failed) + "\n"
+            )
+
+    async def _save_manifest(self, job: ExportJob) -> None:
+        """Persistir o estado do job ao lado do artefato"""
+        manifest = json.dumps(job.to_manifest())
+        try:
+            await asyncio.to_thread(self.manifest_path(job.export_id).write_text, manifest)
+        except OSError as e:
+            logger.error(f"Error saving export manifest {job.export_id}: {e}")
+
+    def _cleanup_expired(self) -> int:
+        """Remover artefatos e manifestos expirados"""
+        removed = 0
+        now = datetime.utcnow()
+
+        for manifest_path in self.storage_dir.glob("*.json"):
+            try:
+                data = json.loads(manifest_path.read_text())
+                # Sem expires_at (job interrompido por reinício): expira pelo created_at
+                expires_at = data.get("expires_at")
+                expires = (datetime.fromisoformat(expires_at) if expires_at
+                           else datetime.fromisoformat(data["created_at"]) + self.ttl)
+                if expires >= now:
+                    continue
+
+                export_id = UUID(data["export_id"])
+                self.artifact_path(export_id).unlink(missing_ok=True)
+                self.artifact_path(export_id).with_suffix(".zip.part").unlink(missing_ok=True)
+                manifest_path.unlink(missing_ok=True)
+                removed += 1
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Error cleaning up export manifest {manifest_path.name}: {e}")
+
+        return removed
+
+
+# Instância global de jobs de exportação
+export_jobs = ExportJobManager()
@@ -0,0 +1,167 @@
+"""
+Serviço de Exportação
+Exporta dados do usuário em NDJSON/CSV por streaming, com memória constante
+"""
+from typing import List, Dict, Any, AsyncIterator, Tuple
+from uuid import UUID
+from datetime import datetime
+import csv
+import io
+import json
+import logging
+import zlib
+
+from core.config import settings
+from schemas.requests.requests import DataExportRequest
+from data.sql_repository import ResumeRepository, AnalysisRepository
+from data.mongo_repository import CoverLetterMongoRepository
+from mappers.resume_mapper import ResumeMapper
+from mappers.analysis_mapper import AnalysisMapper
+from mappers.cover_letter_mapper import CoverLetterMapper
+
+logger = logging.getLogger(__name__)
+
+EXPORT_SECTIONS = {
+    "resumes": ["resumes"],
+    "analyses": ["analyses"],
+    "cover_letters": ["cover_letters"],
+    "all": ["resumes", "analyses", "cover_letters"]
+}
+
+MEDIA_TYPES = {
+    "json": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+FILE_EXTENSIONS = {
+    "json": "ndjson",
+    "csv": "csv"
+}
+
+
+class NDJSONWriter:
+    """Serializa registros como JSON delimitado por linha"""
+
+    def __init__(self, tag_records: bool):
+        # Em exportações "all" cada linha informa a seção de origem
+        self.tag_records = tag_records
+
+    def write(self, section: str, records: List[Dict[str, Any]]) -> str:
+        lines = []
+        for record in records:
+            if self.tag_records:
+                record = {"record_type": section, **record}
+            lines.append(json.dumps(record, default=str, ensure_ascii=False))
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class CSVWriter:
+    """Serializa registros como CSV; cada seção recebe seu próprio cabeçalho"""
+
+    def __init__(self, tag_records: bool):
+        self.tag_records = tag_records
+        self._headers: Dict[str, List[str]] = {}
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def write(self, section: str, records: List[Dict[str, Any]]) -> str:
+        if not records:
+            return ""
+
+        if section not in self._headers:
+            # Cabeçalho definido pelo primeiro registro da seção
+            self._headers[section] = list(records[0].keys())
+            if len(self._headers) > 1:
+                # Linha em branco separa as seções
+                self._buffer.write("\r\n")
+            self._writer.writerow((["record_type"] if self.tag_records else []) + self._headers[section])
+
+        header = self._headers[section]
+        prefix = [section] if self.tag_records else []
+        for record in records:
+            self._writer.writerow(prefix + [record.get(column) for column in header])
+
+        output = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return output
+
+
+class ExportService:
+    """Serviço de exportação de dados"""
+
+    def __init__(self):
+        self.resume_repo = ResumeRepository()
+        self.analysis_repo = AnalysisRepository()
+        self.cover_letter_repo = CoverLetterMongoRepository()
+        self.batch_size = settings.EXPORT_BATCH_SIZE
+        self.chunk_size = settings.EXPORT_CHUNK_SIZE
+
+    async def close(self) -> None:
+        await self.cover_letter_repo.disconnect()
+
+    @staticmethod
+    def validate_request(request: DataExportRequest) -> None:
+        """Validar formato suportado pelo streaming (sem instância: não abre repositórios)"""
+        if request.format not in MEDIA_TYPES:
+            raise ValueError(f"Export format '{request.format}' is not supported")
+
+    def get_media_type(self, request: DataExportRequest) -> str:
+        """Content-Type da exportação"""
+        return "application/gzip" if request.compress else MEDIA_TYPES[request.format]
+
+    def get_filename(self, request: DataExportRequest) -> str:
+        """Nome do arquivo para Content-Disposition"""
+        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        filename = f"skillsync_{request.export_type}_{timestamp}.{FILE_EXTENSIONS[request.format]}"
+        return f"{filename}.gz" if request.compress else filename
+
+    async def stream_export(self, user_id: UUID, request: DataExportRequest) -> AsyncIterator[bytes]:
+        """Gerar a exportação em chunks de bytes (lote a lote, sem materializar o resultado)"""
+        self.validate_request(request)
+
+        tag_records = request.export_type == "all"
+        writer = NDJSONWriter(tag_records) if request.format == "json" else CSVWriter(tag_records)
+        # wbits=31: stream no formato gzip (cabeçalho + trailer)
+        compressor = zlib.compressobj(settings.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if request.compress else None
+
+        buffer = bytearray()
+        exported = 0
+
+        async for section, records in self._iter_records(user_id, request):
+            data = writer.write(section, records).encode("utf-8")
+            exported += len(records)
+            buffer += compressor.compress(data) if compressor else data
+
+            if len(buffer) >= self.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if compressor:
+            buffer += compressor.flush()
+        if buffer:
+            yield bytes(buffer)
+
+        logger.info(f"Exported {exported} {request.export_type} records for user {user_id}")
+
+    async def _iter_records(self, user_id: UUID,
+                            request: DataExportRequest) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Percorrer as seções pedidas, convertendo cada lote com os mappers de exportação"""
+        for section in EXPORT_SECTIONS[request.export_type]:
+            if section == "resumes":
+                async for resumes in self.resume_repo.stream_user_resumes(
+                    user_id, request.date_from, request.date_to, self.batch_size
+                ):
+                    yield section, [ResumeMapper.to_export(resume) for resume in resumes]
+
+            elif section == "analyses":
+                async for analyses in self.analysis_repo.stream_user_analyses(
+                    user_id, request.date_from, request.date_to, self.batch_size
+                ):
+                    yield section, [AnalysisMapper.to_export(analysis) for analysis in analyses]
+
+            elif section == "cover_letters":
+                async for documents in self.cover_letter_repo.stream_user_cover_letters(
+                    str(user_id), request.date_from, request.date_to, self.batch_size
+                ):
+                    yield section, [CoverLetterMapper.to_export(document) for document in documents]
@@ -0,0 +1,80 @@
+"""
+Serviço de Arquivos
+Acesso aos arquivos do Data Lake (Azure Blob Storage)
+"""
+from typing import TYPE_CHECKING, Optional, AsyncIterator
+from uuid import UUID
+import logging
+
+from core.config import settings
+from domain.entities.domain import DataLakeFile
+from data.sql_repository import DataLakeRepository
+
+if TYPE_CHECKING:
+    from azure.storage.blob.aio import BlobServiceClient
+
+logger = logging.getLogger(__name__)
+
+TEXT_FILE_TYPES = {".txt", "txt", "text/plain"}
+
+
+class FileService:
+    """Serviço de arquivos do Data Lake (seguro para leituras simultâneas na mesma instância)"""
+
+    def __init__(self):
+        self.file_repo = DataLakeRepository()
+        self._client: Optional["BlobServiceClient"] = None
+
+    def _get_client(self) -> "BlobServiceClient":
+        """Cliente do Blob Storage (criado sob demanda e reutilizado)"""
+        if self._client is None:
+            # SDK do Azure importado no primeiro acesso ao Blob Storage (custa ~0,3 s na importação)
+            from azure.storage.blob.aio import BlobServiceClient
+
+            self._client = BlobServiceClient.from_connection_string(settings.azure_connection_string)
+        return self._client
+
+    async def close(self) -> None:
+        """Fechar conexões com o Blob Storage (só o dono da instância, no shutdown: o cliente é
+        compartilhado pelas leituras simultâneas)"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def get_file(self, file_id: UUID) -> Optional[DataLakeFile]:
+        """Buscar referência do arquivo"""
+        return await self.file_repo.get_file_by_id(file_id)
+
+    async def stream_file(self, file_ref: DataLakeFile) -> AsyncIterator[bytes]:
+        """Ler o conteúdo do arquivo em chunks, sem carregá-lo inteiro em memória"""
+        container = file_ref.bucket_name or settings.AZURE_CONTAINER_NAME
+        blob = self._get_client().get_blob_client(container, file_ref.storage_path)
+
+        downloader = await blob.download_blob()
+        async for chunk in downloader.chunks():
+            yield chunk
+
+        await self.file_repo.record_file_access(file_ref.file_id)
+
+    async def read_file(self, file_ref: DataLakeFile) -> bytes:
+        """Ler o conteúdo completo do arquivo"""
+        content = bytearray()
+        async for chunk in self.stream_file(file_ref):
+            content += chunk
+        return bytes(content)
+
+    async def extract_text_from_file(self, file_id: Optional[UUID]) -> Optional[str]:
+        """Extrair texto do arquivo (somente arquivos de texto)"""
+        if not file_id:
+            return None
+
+        file_ref = await self.get_file(file_id)
+        if not file_ref:
+            logger.warning(f"File {file_id} not found")
+            return None
+
+        if (file_ref.file_type or "").lower() not in TEXT_FILE_TYPES and file_ref.mime_type not in TEXT_FILE_TYPES:
+            logger.warning(f"Text extraction not supported for file type {file_ref.file_type}")
+            return None
+
+        return (await self.read_file(file_ref)).decode("utf-8", errors="replace")
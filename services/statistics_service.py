@@ -0,0 +1,288 @@
+"""
+Serviço de Estatísticas
+Estatísticas pré-calculadas por usuário, atualizadas de forma incremental
+"""
+from typing import Optional, List, Dict, Any
+from uuid import UUID
+from datetime import datetime, timedelta
+import asyncio
+import logging
+
+from core.config import db_settings
+from core.container import container
+from core.events import event_bus, RESUME_CREATED, COVER_LETTER_CREATED
+from data.sql_repository import StatisticsRepository
+from data.mongo_repository import UserStatisticsMongoRepository, ActivityLogMongoRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _day(moment: datetime) -> str:
+    """Chave do bucket diário (YYYY-MM-DD)"""
+    return moment.strftime("%Y-%m-%d")
+
+
+class StatisticsService:
+    """Serviço de estatísticas pré-calculadas"""
+
+    def __init__(self):
+        self.stats_repo = UserStatisticsMongoRepository()
+        self.sql_stats_repo = StatisticsRepository()
+        self.activity_repo = ActivityLogMongoRepository()
+
+    async def close(self) -> None:
+        """Fechar os clientes do MongoDB (encerramento do container de serviços)"""
+        await self.stats_repo.disconnect()
+        await self.activity_repo.disconnect()
+
+    async def _increment(self, user_id: UUID, increments: Dict[str, Any],
+                         maximums: Optional[Dict[str, Any]] = None,
+                         minimums: Optional[Dict[str, Any]] = None) -> None:
+        """Aplicar incrementos; sem documento reconstruído, reconstrói a partir das tabelas de
+        origem (que já incluem o evento sendo contabilizado)"""
+        applied = await self.stats_repo.increment_statistics(str(user_id), increments, maximums, minimums)
+
+        if applied is None:
+            await self.rebuild_user_statistics(user_id)
+
+    async def record_resume_created(self, user_id: UUID, count: int = 1) -> None:
+        """Contabilizar currículo(s) criado(s)"""
+        await self._increment(user_id, {"totals.resumes": count})
+
+    async def record_cover_letter_created(self, user_id: UUID, count: int = 1) -> None:
+        """Contabilizar carta(s) de apresentação criada(s)"""
+        await self._increment(user_id, {"totals.coverLetters": count})
+
+    async def record_analysis_created(self, user_id: UUID, count: int = 1) -> None:
+        """Contabilizar análise(s) criada(s)"""
+        day = _day(datetime.utcnow())
+
+        await self._increment(user_id, {
+            "totals.analysesCreated": count,
+            f"daily.{day}.created": count
+        })
+
+    async def record_analysis_completed(self, user_id: UUID, match_score: float,
+                                        processing_time_ms: Optional[int] = None) -> None:
+        """Contabilizar análise concluída (contadores, médias e bucket do dia)"""
+        day = _day(datetime.utcnow())
+
+        increments = {
+            "totals.analysesCompleted": 1,
+            "scores.sum": match_score,
+            "scores.count": 1,
+            f"daily.{day}.completed": 1,
+            f"daily.{day}.scoreSum": match_score
+        }
+
+        if processing_time_ms is not None:
+            increments["processingTime.sum"] = processing_time_ms
+            increments["processingTime.count"] = 1
+
+        await self._increment(
+            user_id,
+            increments,
+            maximums={"scores.best": match_score},
+            minimums={"scores.worst": match_score}
+        )
+
+    async def record_analysis_failed(self, user_id: UUID) -> None:
+        """Contabilizar análise com falha"""
+        await self._increment(user_id, {
+            "totals.analysesFailed": 1
+        })
+
+    async def get_user_statistics(self, user_id: UUID) -> Dict[str, Any]:
+        """Obter estatísticas do usuário (reconstrói se ainda não existirem)"""
+        statistics = await self.stats_repo.get_user_statistics(str(user_id))
+
+        if not statistics:
+            statistics = await self.rebuild_user_statistics(user_id)
+
+        return statistics
+
+    async def rebuild_user_statistics(self, user_id: UUID) -> Dict[str, Any]:
+        """Recalcular estatísticas do usuário a partir das tabelas de origem"""
+        since = datetime.utcnow() - timedelta(days=db_settings.STATS_DAILY_RETENTION_DAYS)
+
+        totals = await self.sql_stats_repo.get_user_totals(user_id)
+        daily = await self.sql_stats_repo.get_user_daily_analyses(user_id, since)
+        activity_stats = await self.activity_repo.get_activity_statistics(
+            str(user_id), days=db_settings.STATS_ACTIVITY_WINDOW_DAYS
+        )
+
+        statistics = {
+            "totals": {
+                "resumes": totals.get("total_resumes") or 0,
+                "coverLetters": totals.get("total_cover_letters") or 0,
+                "analysesCreated": totals.get("total_analyses") or 0,
+                "analysesCompleted": totals.get("completed_analyses") or 0,
+                "analysesFailed": totals.get("failed_analyses") or 0
+            },
+            "scores": {
+                "sum": float(totals.get("score_sum") or 0.0),
+                "count": totals.get("completed_analyses") or 0
+            },
+            "processingTime": {
+                "sum": totals.get("processing_time_sum") or 0,
+                "count": totals.get("processing_time_count") or 0
+            },
+            "daily": daily,
+            "activity": {
+                action: {
+                    "total": item.get("totalCount", 0),
+                    "daily": {entry["date"]: entry["count"] for entry in item.get("dailyActivity", [])}
+                }
+                for action, item in activity_stats.items()
+                if action
+            },
+            "rebuiltAt": datetime.utcnow(),
+            # Os buckets vêm só das janelas de retenção; a poda seguinte fica para amanhã
+            "dailyPrunedOn": _day(datetime.utcnow())
+        }
+
+        # $max/$min só existem quando há análises concluídas
+        if totals.get("best_score") is not None:
+            statistics["scores"]["best"] = float(totals["best_score"])
+            statistics["scores"]["worst"] = float(totals["worst_score"])
+
+        await self.stats_repo.replace_user_statistics(str(user_id), statistics)
+        return statistics
+
+    async def rebuild_all_statistics(self) -> int:
+        """Job de reconstrução: recalcula as estatísticas de todos os usuários ativos"""
+        rebuilt = 0
+
+        for user_id in await self.sql_stats_repo.get_active_user_ids():
+            try:
+                await self.rebuild_user_statistics(user_id)
+                rebuilt += 1
+            except Exception as e:
+                logger.error(f"Error rebuilding statistics for user {user_id}: {e}")
+
+        logger.info(f"Rebuilt statistics for {rebuilt} users")
+        return rebuilt
+
+    # ===== Leitura no formato das respostas existentes =====
+
+    @staticmethod
+    def average_score(statistics: Dict[str, Any]) -> Optional[float]:
+        """Média corrente dos scores"""
+        scores = statistics.get("scores", {})
+        count = scores.get("count", 0)
+        return scores.get("sum", 0.0) / count if count else None
+
+    @staticmethod
+    def basic_stats(statistics: Dict[str, Any]) -> Dict[str, Any]:
+        """Totais do usuário (formato de UserService.get_user_statistics)"""
+        totals = statistics.get("totals", {})
+        return {
+            "total_resumes": totals.get("resumes", 0),
+            "total_analyses": totals.get("analysesCreated", 0),
+            "total_cover_letters": totals.get("coverLetters", 0),
+            "avg_match_score": StatisticsService.average_score(statistics)
+        }
+
+    @staticmethod
+    def analysis_stats(statistics: Dict[str, Any]) -> Dict[str, Any]:
+        """Totais de análises (formato de AnalysisService.get_analysis_statistics)"""
+        totals = statistics.get("totals", {})
+        processing_time = statistics.get("processingTime", {})
+        created = totals.get("analysesCreated", 0)
+        completed = totals.get("analysesCompleted", 0)
+        failed = totals.get("analysesFailed", 0)
+
+        return {
+            "total_analyses": created,
+            "completed_analyses": completed,
+            "pending_analyses": max(created - completed - failed, 0),
+            "failed_analyses": failed,
+            "average_score": StatisticsService.average_score(statistics),
+            "best_score": statistics.get("scores", {}).get("best"),
+            "avg_processing_time": (
+                processing_time["sum"] / processing_time["count"]
+                if processing_time.get("count") else None
+            )
+        }
+
+    @staticmethod
+    def score_stats(statistics: Dict[str, Any], days: int = 30) -> Dict[str, Any]:
+        """Resumo dos scores com distribuição diária"""
+        scores = statistics.get("scores", {})
+        return {
+            "totalAnalyses": scores.get("count", 0),
+            "averageScore": StatisticsService.average_score(statistics),
+            "maxScore": scores.get("best"),
+            "minScore": scores.get("worst"),
+            "scoreDistribution": StatisticsService.analysis_trend(statistics, days)
+        }
+
+    @staticmethod
+    def analysis_trend(statistics: Dict[str, Any], days: int = 30) -> List[Dict[str, Any]]:
+        """Tendência diária de análises a partir dos buckets"""
+        daily = statistics.get("daily", {})
+        start = _day(datetime.utcnow() - timedelta(days=days))
+
+        trend = []
+        for day in sorted(d for d in daily if d >= start):
+            bucket = daily[day]
+            completed = bucket.get("completed", 0)
+            trend.append({
+                "date": day,
+                "created": bucket.get("created", 0),
+                "completed": completed,
+                "averageScore": bucket.get("scoreSum", 0.0) / completed if completed else None
+            })
+
+        return trend
+
+    @staticmethod
+    def activity_stats(statistics: Dict[str, Any],
+                       days: int = db_settings.STATS_ACTIVITY_WINDOW_DAYS) -> Dict[str, Any]:
+        """Atividade por ação na janela (formato de get_activity_statistics)"""
+        start = _day(datetime.utcnow() - timedelta(days=days))
+        result = {}
+
+        for action, item in statistics.get("activity", {}).items():
+            daily_activity = [
+                {"date": day, "count": count}
+                for day, count in sorted(item.get("daily", {}).items())
+                if day >= start
+            ]
+            if daily_activity:
+                result[action] = {
+                    "_id": action,
+                    "totalCount": sum(entry["count"] for entry in daily_activity),
+                    "dailyActivity": daily_activity
+                }
+
+        return result
+
+
+# Contadores de currículos e cartas: quem cria publica o evento com {"user_id": ...}
+async def _on_resume_created(payload: Dict[str, Any]) -> None:
+    await container.get(StatisticsService).record_resume_created(payload["user_id"], payload.get("count", 1))
+
+
+async def _on_cover_letter_created(payload: Dict[str, Any]) -> None:
+    await container.get(StatisticsService).record_cover_letter_created(payload["user_id"], payload.get("count", 1))
+
+
+event_bus.subscribe(RESUME_CREATED, _on_resume_created)
+event_bus.subscribe(COVER_LETTER_CREATED, _on_cover_letter_created)
+
+
+if __name__ == "__main__":
+    # Job de reconstrução: python -m services.statistics_service
+    async def _rebuild():
+        service = StatisticsService()
+        await service.stats_repo.connect()
+        await service.activity_repo.connect()
+        try:
+            await service.rebuild_all_statistics()
+        finally:
+            await service.stats_repo.disconnect()
+            await service.activity_repo.disconnect()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_rebuild())
@@ -10,11 +10,16 @@ from jose import JWTError, jwt
 import logging
 
 from core.config import settings
-from domain.entities.domain import User, SubscriptionType
-from schemas.requests.requests import UserRegisterRequest, UserLoginRequest, UserUpdateRequest
+from core.container import container
+from domain.entities.domain import User, UserSkill, SubscriptionType
+from schemas.requests.requests import (
+    UserRegisterRequest, UserLoginRequest, UserUpdateRequest, BulkUserSkillsUpdateRequest
+)
 from schemas.responses.responses import UserProfileResponse, TokenResponse
-from data.sql_repository import UserRepository
-from data.mongo_repository import UserPreferencesMongoRepository, ActivityLogMongoRepository
+from data.sql_repository import UserRepository, UserSkillRepository
+from data.mongo_repository import UserPreferencesMongoRepository
+from data.activity_log_buffer import activity_logger
+from services.statistics_service import StatisticsService
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +29,15 @@ class UserService:
     
     def __init__(self):
         self.user_repo = UserRepository()
+        self.user_skill_repo = UserSkillRepository()
         self.preferences_repo = UserPreferencesMongoRepository()
-        self.activity_repo = ActivityLogMongoRepository()
+        self.activity_logger = activity_logger
+        self.statistics_service = container.get(StatisticsService)
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     
+    async def close(self) -> None:
+        await self.preferences_repo.disconnect()
+    
     def _hash_password(self, password: str) -> str:
         """Hash da senha"""
         return self.pwd_context.hash(password)
@@ -84,7 +94,7 @@ class UserService:
             await self._create_default_preferences(str(created_user.user_id))
             
             # Log da atividade
-            await self.activity_repo.log_activity({
+            await self.activity_logger.log_activity({
                 "userId": str(created_user.user_id),
                 "action": "user_registered",
                 "resource": "user",
@@ -143,7 +153,7 @@ class UserService:
             )
             
             # Log da atividade
-            await self.activity_repo.log_activity({
+            await self.activity_logger.log_activity({
                 "userId": str(user.user_id),
                 "action": "user_login",
                 "resource": "user",
@@ -210,7 +220,7 @@ class UserService:
             
             if success:
                 # Log da atividade
-                await self.activity_repo.log_activity({
+                await self.activity_logger.log_activity({
                     "userId": str(user_id),
                     "action": "profile_updated",
                     "resource": "user",
@@ -226,6 +236,38 @@ class UserService:
             logger.error(f"Error updating user profile: {e}")
             return False
     
+    async def update_user_skills(self, user_id: UUID, request: BulkUserSkillsUpdateRequest) -> int:
+        """Atualizar habilidades do usuário em lote (um MERGE, uma transação)"""
+        try:
+            user_skills = [
+                UserSkill(
+                    user_skill_id=uuid4(),
+                    user_id=user_id,
+                    skill_id=skill.skill_id,
+                    proficiency_level=skill.proficiency_level,
+                    years_of_experience=skill.years_of_experience
+                )
+                for skill in request.skills
+            ]
+            
+            affected = await self.user_skill_repo.upsert_user_skills(user_id, user_skills)
+            
+            await self.activity_logger.log_activity({
+                "userId": str(user_id),
+                "action": "skills_updated",
+                "resource": "user",
+                "resourceId": str(user_id),
+                "details": {
+                    "skill_ids": [str(skill.skill_id) for skill in request.skills]
+                }
+            })
+            
+            return affected
+            
+        except Exception as e:
+            logger.error(f"Error updating user skills: {e}")
+            raise
+    
     async def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verificar token JWT"""
         try:
@@ -316,7 +358,7 @@ class UserService:
             
             if success:
                 # Log da atividade
-                await self.activity_repo.log_activity({
+                await self.activity_logger.log_activity({
                     "userId": str(user_id),
                     "action": "password_changed",
                     "resource": "user",
@@ -381,25 +423,13 @@ class UserService:
     async def get_user_statistics(self, user_id: UUID) -> Dict[str, Any]:
         """Obter estatísticas do usuário"""
         try:
-            # Estatísticas de atividade
-            activity_stats = await self.activity_repo.get_activity_statistics(str(user_id))
-            
-            # Estatísticas básicas do SQL
-            basic_stats = await self.user_repo.execute_query(
-                """
-                SELECT 
-                    (SELECT COUNT(*) FROM Resumes WHERE UserId = :user_id) as total_resumes,
-                    (SELECT COUNT(*) FROM CompatibilityAnalyses WHERE UserId = :user_id) as total_analyses,
-                    (SELECT COUNT(*) FROM CoverLetters WHERE UserId = :user_id) as total_cover_letters,
-                    (SELECT AVG(MatchScore) FROM CompatibilityAnalyses WHERE UserId = :user_id) as avg_match_score
-                """,
-                {"user_id": str(user_id)}
-            )
+            # Leitura única das estatísticas pré-calculadas
+            statistics = await self.statistics_service.get_user_statistics(user_id)
             
             return {
-                "basic_stats": basic_stats[0] if basic_stats else {},
-                "activity_stats": activity_stats,
-                "generated_at": datetime.utcnow()
+                "basic_stats": StatisticsService.basic_stats(statistics),
+                "activity_stats": StatisticsService.activity_stats(statistics),
+                "generated_at": statistics.get("updatedAt", datetime.utcnow())
             }
             
         except Exception as e:
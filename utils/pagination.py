@@ -0,0 +1,46 @@
+"""
+Paginação por cursor (keyset)
+Tokens opacos que codificam a posição (CreatedAt, Id) do último item da página
+"""
+from typing import Optional, List, Tuple, Generic, TypeVar
+from dataclasses import dataclass, field
+from datetime import datetime
+import base64
+import binascii
+import json
+
+T = TypeVar('T')
+
+
+class InvalidCursorError(ValueError):
+    """Cursor de paginação malformado ou adulterado"""
+
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """Codificar a posição (CreatedAt, Id) em um token opaco"""
+    payload = json.dumps({"t": created_at.isoformat(), "id": str(item_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decodificar token em (CreatedAt, Id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), str(payload["id"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+@dataclass
+class CursorPage(Generic[T]):
+    """Página de resultados com cursor para a próxima página"""
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    # Total aproximado: contagem limitada a `total_cap` (None quando não solicitado)
+    total: Optional[int] = None
+    total_capped: bool = False
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None